@@ -0,0 +1,231 @@
+from kuantum.kyber.Kyber import Kyber
+from kuantum.kyber.IDCPA import IDCPA
+from kuantum.kyber.utils.byte_ops import gen_cbd_pol
+from kuantum.kyber.utils.ntt import ntt, inv_ntt, ntt_array, inv_ntt_array
+from kuantum.kyber.utils.poly import *
+from kuantum.kyber.utils.poly_vect import *
+from Crypto.Random import get_random_bytes
+from statistics import mean, stdev
+from time import perf_counter
+import argparse
+import json
+import numpy as np
+import platform
+import re
+import sys
+import time
+
+LEVELS = (('kyber512', 2), ('kyber768', 3), ('kyber1024', 4))
+
+# two-sided 95% quantiles of Student's t distribution by degrees of freedom
+T_95 = {1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365, 8: 2.306, 9: 2.262,
+        10: 2.228, 12: 2.179, 15: 2.131, 20: 2.086, 25: 2.060, 30: 2.042}
+
+
+def t_95(df):
+    """
+    95% t quantile for df degrees of freedom, rounded down to the next
+    tabulated value (conservative), 1.96 beyond the table
+    """
+    if df > 30:
+        return 1.96
+    return T_95[max(d for d in T_95 if d <= df)]
+
+
+def random_coeffs(shape, rng):
+    return rng.integers(-3328, 3329, size=shape, dtype=np.int16)
+
+
+def primitive_benchmarks():
+    """
+    return: list of (name, zero-argument callable) for the building blocks
+    """
+    rng = np.random.default_rng(0)
+    coeffs = random_coeffs(256, rng).tolist()
+    poly = Poly(random_coeffs(256, rng))
+    seed = get_random_bytes(32)
+    cases = [
+        ('ntt', lambda: ntt(coeffs[:])),
+        ('inv_ntt', lambda: inv_ntt(coeffs[:])),
+        ('ntt_array', lambda: ntt_array(poly.coeffs)),
+        ('inv_ntt_array', lambda: inv_ntt_array(poly.coeffs)),
+        ('gen_cbd_pol[eta=2]', lambda cbd_buf=list(get_random_bytes(128)): gen_cbd_pol(cbd_buf, 3)),
+        ('gen_cbd_pol[eta=3]', lambda cbd_buf=list(get_random_bytes(192)): gen_cbd_pol(cbd_buf, 2)),
+        ('poly_to_bytes', lambda: poly_to_bytes(poly)),
+        ('poly_from_bytes', lambda b=poly_to_bytes(poly): poly_from_bytes(b)),
+        ('poly_to_msg', lambda: poly_to_msg(poly)),
+        ('poly_from_msg', lambda msg=list(get_random_bytes(32)): poly_from_msg(msg)),
+    ]
+    for level, k in LEVELS:
+        idcpa = IDCPA(level)
+        vec = PolyVec(random_coeffs((k, 256), rng))
+        cases += [
+            ('gen_matrix[%s]' % level, lambda idcpa=idcpa: idcpa.gen_matrix(seed, False)),
+            ('poly_compress[%s]' % level, lambda k=k: poly_compress(poly, k)),
+            ('poly_decompress[%s]' % level, lambda k=k, b=poly_compress(poly, k): poly_decompress(b, k)),
+            ('polyvec_to_bytes[%s]' % level, lambda vec=vec: polyvec_to_bytes(vec)),
+            ('polyvec_from_bytes[%s]' % level, lambda k=k, b=polyvec_to_bytes(vec): polyvec_from_bytes(b, k)),
+            ('polyvec_compress[%s]' % level, lambda k=k, vec=vec: polyvec_compress(vec, k)),
+            ('polyvec_decompress[%s]' % level,
+             lambda k=k, b=polyvec_compress(vec, k): polyvec_decompress(b, k)),
+        ]
+    return cases
+
+
+def kem_benchmarks():
+    """
+    return: list of (name, zero-argument callable) for the end-to-end
+            operations, in list mode as Kyber is used by default
+    """
+    cases = []
+    for level, _ in LEVELS:
+        kyber = Kyber(level)
+        keys = kyber.gen_keypair()
+        ct = kyber.encrypt(keys['public_key'])['ciphertext']
+        cases += [
+            ('Kyber.gen_keypair[%s]' % level, kyber.gen_keypair),
+            ('Kyber.encrypt[%s]' % level, lambda kyber=kyber, pk=keys['public_key']: kyber.encrypt(pk)),
+            ('Kyber.decrypt[%s]' % level,
+             lambda kyber=kyber, ct=ct, sk=keys['secret_key']: kyber.decrypt(ct, sk)),
+        ]
+    return cases
+
+
+def all_benchmarks():
+    return primitive_benchmarks() + kem_benchmarks()
+
+
+def measure(fn, repeat=10, min_time=0.05):
+    """
+    Time fn: after one warm-up call, calibrate a loop count so that one
+    sample takes at least min_time seconds, then take repeat samples
+
+    arg0: zero-argument callable
+    arg1: number of samples, at least 2
+    arg2: minimum duration of one sample in seconds
+    return: dict with ops_per_sec (mean of the samples), the 95%
+            confidence interval ci_low / ci_high, the relative standard
+            deviation rsd, loops per sample and the per-sample rates
+    """
+    if repeat < 2:
+        raise ValueError('repeat must be at least 2')
+    fn()
+    loops = 1
+    while True:
+        start = perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops = max(loops * 2, int(loops * min_time / max(elapsed, 1e-9) * 1.1))
+
+    samples = []
+    for _ in range(repeat):
+        start = perf_counter()
+        for _ in range(loops):
+            fn()
+        samples.append(loops / (perf_counter() - start))
+    ops = mean(samples)
+    half_width = t_95(repeat - 1) * stdev(samples) / repeat ** 0.5
+    return {
+        'ops_per_sec': ops,
+        'ci_low': ops - half_width,
+        'ci_high': ops + half_width,
+        'rsd': stdev(samples) / ops,
+        'loops': loops,
+        'samples': samples,
+    }
+
+
+def run(pattern=None, repeat=10, min_time=0.05, log=None):
+    """
+    Run every benchmark whose name matches the regular expression pattern
+
+    return: results document with meta (environment and settings) and
+            results (name -> measure result)
+    """
+    results = {}
+    for name, fn in all_benchmarks():
+        if pattern is not None and not re.search(pattern, name):
+            continue
+        results[name] = measure(fn, repeat, min_time)
+        if log is not None:
+            log(format_result(name, results[name]))
+    return {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'platform': platform.platform(),
+            'repeat': repeat,
+            'min_time': min_time,
+        },
+        'results': results,
+    }
+
+
+def compare(results, baseline, threshold=0.1):
+    """
+    Compare a results document against a baseline one. A benchmark has
+    regressed when its ops/sec dropped by more than threshold (a
+    fraction) and the upper end of its confidence interval is below the
+    baseline's lower end, so noise alone does not fail the comparison.
+
+    return: list of dicts with name, baseline and current ops/sec,
+            relative change and regressed, for the benchmarks in both
+    """
+    rows = []
+    for name, current in results['results'].items():
+        base = baseline['results'].get(name)
+        if base is None:
+            continue
+        change = current['ops_per_sec'] / base['ops_per_sec'] - 1
+        rows.append({
+            'name': name,
+            'baseline': base['ops_per_sec'],
+            'current': current['ops_per_sec'],
+            'change': change,
+            'regressed': change < -threshold and current['ci_high'] < base['ci_low'],
+        })
+    return rows
+
+
+def format_result(name, result):
+    return '%-36s %12.1f ops/s  +/- %5.1f%%' % (
+        name, result['ops_per_sec'], 100 * (result['ci_high'] - result['ops_per_sec']) / result['ops_per_sec'])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description='Time the kuantum Kyber primitives and KEM operations.')
+    parser.add_argument('-k', '--filter', help='only run benchmarks whose name matches this regular expression')
+    parser.add_argument('--repeat', type=int, default=10, help='samples per benchmark (default 10)')
+    parser.add_argument('--min-time', type=float, default=0.05, help='minimum seconds per sample (default 0.05)')
+    parser.add_argument('-o', '--output', help='write the results as JSON to this file')
+    parser.add_argument('--baseline', help='compare against the results JSON in this file')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='relative slowdown counted as a regression (default 0.1)')
+    args = parser.parse_args(argv)
+
+    results = run(args.filter, args.repeat, args.min_time, log=print)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        rows = compare(results, baseline, args.threshold)
+        print()
+        for row in rows:
+            print('%-36s %12.1f -> %12.1f ops/s  %+6.1f%%%s' % (
+                row['name'], row['baseline'], row['current'], 100 * row['change'],
+                '  REGRESSION' if row['regressed'] else ''))
+        if any(row['regressed'] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
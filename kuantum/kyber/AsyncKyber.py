@@ -0,0 +1,196 @@
+from concurrent.futures import ThreadPoolExecutor
+from kuantum.kyber.Kyber import Kyber
+from kuantum.kyber.KyberPool import KyberPool
+from kuantum.kyber.utils.matrix_cache import MatrixCache
+import asyncio
+import os
+
+
+class AsyncKyber:
+    """
+    asyncio front-end for Kyber: gen_keypair, encrypt and decrypt are
+    coroutines whose work runs on an executor, so the event loop is never
+    blocked by it.
+
+    At most max_concurrency operations are in flight on the executor;
+    further callers wait on a semaphore, and once max_pending callers are
+    waiting new calls fail fast with asyncio.QueueFull. A slot is only
+    given back when the executor has actually finished (or dropped) the
+    work, so cancelling a caller never lets more than max_concurrency
+    operations pile up on the executor; a cancelled operation that has
+    not started yet is not run at all.
+
+    With executor='thread' the work runs on a thread pool in this
+    process and still competes with the event loop for the GIL. With
+    executor='process' it runs on a KyberPool, which keeps the loop's
+    latency flat under load. Results are bytes, as Kyber in bytes mode.
+
+    Creating a KyberPool blocks until every worker process is warm. With
+    executor='process', construct the instance before the event loop
+    runs, or use `await AsyncKyber.create(...)` inside a running loop,
+    which builds the pool on the loop's default executor.
+    """
+
+    def __init__(self, level, executor='thread', workers=None, max_concurrency=None, max_pending=None):
+        """
+        arg0: 'kyber512', 'kyber768' or 'kyber1024'
+        arg1: 'thread', 'process', or an existing ThreadPoolExecutor or
+              KyberPool (which is then not shut down by close)
+        arg2: workers of the executor created for 'thread' or 'process',
+              os.cpu_count() if omitted; for a ThreadPoolExecutor passed
+              in, its number of workers
+        arg3: maximum operations in flight, by default the number of
+              workers of the executor; required with a ThreadPoolExecutor
+              passed in unless workers is given
+        arg4: maximum callers waiting for a slot, unbounded if omitted
+        """
+        self.type = level
+        self.owns_executor = isinstance(executor, str)
+        if workers is None and self.owns_executor:
+            workers = os.cpu_count() or 1
+        if executor == 'thread':
+            executor = ThreadPoolExecutor(max_workers=workers)
+        elif executor == 'process':
+            executor = KyberPool(level, workers=workers)
+        if isinstance(executor, KyberPool):
+            if executor.type != level:
+                raise ValueError('KyberPool runs %s, not %s' % (executor.type, level))
+            self.kyber = None
+            executor_workers = executor.workers
+        elif isinstance(executor, ThreadPoolExecutor):
+            if workers is None and max_concurrency is None:
+                raise ValueError('max_concurrency or workers is required with a ThreadPoolExecutor passed in')
+            self.kyber = Kyber(level, matrix_cache=MatrixCache(), bytes_mode=True)
+            executor_workers = workers
+        else:
+            raise ValueError("executor must be 'thread', 'process', a ThreadPoolExecutor or a KyberPool")
+        self.executor = executor
+        if max_concurrency is None:
+            max_concurrency = executor_workers
+        if max_concurrency < 1:
+            raise ValueError('max_concurrency must be at least 1')
+        if max_pending is not None and max_pending < 0:
+            raise ValueError('max_pending must not be negative')
+        self.max_concurrency = max_concurrency
+        self.max_pending = max_pending
+        self.semaphore = None
+        self.in_flight = 0
+        self.pending = 0
+        self.futures = set()
+
+    @classmethod
+    async def create(cls, level, executor='thread', workers=None, max_concurrency=None, max_pending=None):
+        """
+        Create an AsyncKyber from within a running event loop. With
+        executor='process' the KyberPool and its warm-up run on the
+        loop's default executor, so the loop is not blocked meanwhile.
+        Arguments as for __init__.
+        """
+        if executor == 'process':
+            loop = asyncio.get_running_loop()
+            executor = await loop.run_in_executor(None, KyberPool, level, workers)
+            try:
+                async_kyber = cls(level, executor, max_concurrency=max_concurrency, max_pending=max_pending)
+            except BaseException:
+                executor.shutdown()
+                raise
+            async_kyber.owns_executor = True
+            return async_kyber
+        return cls(level, executor, workers, max_concurrency, max_pending)
+
+    def submit(self, operation, *args):
+        """
+        Hand one operation to the executor
+
+        return: concurrent.futures.Future
+        """
+        if self.kyber is None:
+            return getattr(self.executor, 'submit_' + operation)(*args)
+        return self.executor.submit(getattr(self.kyber, operation), *args)
+
+    async def run(self, operation, *args):
+        """
+        Wait for a free slot, run operation on the executor and return
+        its result. The slot is released by the executor future's done
+        callback, not by this coroutine.
+        """
+        loop = asyncio.get_running_loop()
+        if self.semaphore is None:
+            self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        if self.semaphore.locked():
+            if self.max_pending is not None and self.pending >= self.max_pending:
+                raise asyncio.QueueFull('%d operations waiting already' % self.pending)
+            self.pending += 1
+            try:
+                await self.semaphore.acquire()
+            finally:
+                self.pending -= 1
+        else:
+            await self.semaphore.acquire()
+
+        try:
+            future = self.submit(operation, *args)
+        except BaseException:
+            self.semaphore.release()
+            raise
+        self.in_flight += 1
+        self.futures.add(future)
+
+        def release(done):
+            self.in_flight -= 1
+            self.futures.discard(done)
+            self.semaphore.release()
+
+        def done_callback(done):
+            try:
+                loop.call_soon_threadsafe(release, done)
+            except RuntimeError:
+                # loop already closed, nobody is waiting for the slot
+                pass
+
+        future.add_done_callback(done_callback)
+        return await asyncio.wrap_future(future)
+
+    async def gen_keypair(self):
+        """
+        return: dict with public_key and secret_key
+        """
+        return await self.run('gen_keypair')
+
+    async def encrypt(self, public_key, msg=None):
+        """
+        arg0: public key
+        arg1: optional 32-byte message, random if omitted
+        return: dict with ciphertext and shared_secret
+        """
+        return await self.run('encrypt', public_key, msg)
+
+    async def decrypt(self, cipher_text, private_key):
+        """
+        arg0: ciphertext
+        arg1: secret key
+        return: shared secret
+        """
+        return await self.run('decrypt', cipher_text, private_key)
+
+    async def aclose(self):
+        """
+        Wait for the operations still running on the executor, then
+        close
+        """
+        if self.futures:
+            await asyncio.wait([asyncio.wrap_future(f) for f in list(self.futures)])
+        self.close()
+
+    def close(self):
+        """
+        Shut down the executor if it was created by this instance
+        """
+        if self.owns_executor:
+            self.executor.shutdown()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
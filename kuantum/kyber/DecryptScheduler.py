@@ -0,0 +1,209 @@
+from collections import OrderedDict
+from concurrent.futures import Future
+from threading import Condition, Thread
+from time import monotonic
+from kuantum.kyber.PreparedKeys import PreparedSecretKey
+from kuantum.kyber.utils.num_type import byte_view
+
+
+class DecryptScheduler:
+    """
+    Micro-batching front of Kyber.decrypt. Decryptions submitted from any
+    thread are grouped by secret key; a group is run as one
+    Kyber.decrypt_many batch once it holds max_batch_size ciphertexts or
+    its oldest request has waited window seconds, and every caller's
+    future gets its own shared secret.
+
+    Batches run one at a time on a dispatcher thread, so the batch size
+    adapts to the load: while one batch runs, the next fills up. Raw
+    secret keys are prepared once and kept in an LRU of key_cache_size
+    entries.
+
+    stats() reports the batch sizes and queueing delays (submit to start
+    of the batch) seen so far, for tuning window and max_batch_size.
+    """
+
+    def __init__(self, kyber, window=0.002, max_batch_size=64, key_cache_size=64):
+        """
+        arg0: Kyber instance doing the decryptions
+        arg1: seconds the oldest request of a group may wait for more
+        arg2: largest batch run at once
+        arg3: prepared secret keys kept, 0 to prepare on every batch
+        """
+        if window < 0:
+            raise ValueError('window must not be negative')
+        if max_batch_size < 1:
+            raise ValueError('max_batch_size must be at least 1')
+        if key_cache_size < 0:
+            raise ValueError('key_cache_size must not be negative')
+        self.kyber = kyber
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self.key_cache_size = key_cache_size
+        self.keys = OrderedDict()
+        self.groups = OrderedDict()
+        self.condition = Condition()
+        self.closed = False
+        self.reset_stats()
+        self.thread = Thread(target=self.dispatch, name='DecryptScheduler', daemon=True)
+        self.thread.start()
+
+    def submit(self, cipher_text, private_key):
+        """
+        Queue one decryption
+
+        arg0: ciphertext
+        arg1: secret key, or a PreparedSecretKey from prepare_secret_key
+        return: concurrent.futures.Future of the shared secret
+        """
+        cipher_text = self.kyber.input(cipher_text)
+        if len(cipher_text) != self.kyber.ciphertext_bytes:
+            raise ValueError('Ciphertext must be %d bytes long for %s' % (self.kyber.ciphertext_bytes, self.kyber.type))
+        if isinstance(private_key, PreparedSecretKey):
+            key = private_key
+        else:
+            key = bytes(byte_view(self.kyber.input(private_key)))
+        future = Future()
+        with self.condition:
+            if self.closed:
+                raise RuntimeError('cannot schedule new decryptions after close')
+            now = monotonic()
+            group = self.groups.get(key)
+            if group is None:
+                group = self.groups[key] = {'deadline': now + self.window, 'requests': []}
+            group['requests'].append((cipher_text, future, now))
+            if len(group['requests']) == 1 or len(group['requests']) >= self.max_batch_size:
+                self.condition.notify()
+        return future
+
+    def decrypt(self, cipher_text, private_key):
+        """
+        Queue one decryption and wait for its shared secret
+        """
+        return self.submit(cipher_text, private_key).result()
+
+    def next_batch(self):
+        """
+        Wait until some group is due and take up to max_batch_size
+        requests off it, oldest group first; must be called with the
+        condition held
+
+        return: (key, requests), or None once closed and drained
+        """
+        while True:
+            now = monotonic()
+            timeout = None
+            for key, group in self.groups.items():
+                requests = group['requests']
+                if self.closed or len(requests) >= self.max_batch_size or group['deadline'] <= now:
+                    batch = requests[:self.max_batch_size]
+                    del requests[:self.max_batch_size]
+                    if not requests:
+                        del self.groups[key]
+                    return key, batch
+                if timeout is None or group['deadline'] - now < timeout:
+                    timeout = group['deadline'] - now
+            if self.closed:
+                return None
+            self.condition.wait(timeout)
+
+    def dispatch(self):
+        while True:
+            with self.condition:
+                batch = self.next_batch()
+            if batch is None:
+                return
+            self.run_batch(*batch)
+
+    def prepared_key(self, key):
+        if isinstance(key, PreparedSecretKey):
+            return key
+        prepared = self.keys.get(key)
+        if prepared is None:
+            prepared = self.kyber.prepare_secret_key(key)
+            if self.key_cache_size > 0:
+                self.keys[key] = prepared
+                if len(self.keys) > self.key_cache_size:
+                    self.keys.popitem(last=False)
+        else:
+            self.keys.move_to_end(key)
+        return prepared
+
+    def run_batch(self, key, requests):
+        """
+        Decrypt one group of requests and resolve their futures; requests
+        whose future was cancelled meanwhile are dropped. If the batch
+        raises, the requests are decrypted one by one and only those
+        that fail again get the exception.
+        """
+        requests = [r for r in requests if r[1].set_running_or_notify_cancel()]
+        if not requests:
+            return
+        start = monotonic()
+        with self.condition:
+            self.batches += 1
+            self.requests += len(requests)
+            self.batch_sizes[len(requests)] = self.batch_sizes.get(len(requests), 0) + 1
+            for _, _, queued in requests:
+                delay = start - queued
+                self.total_queue_delay += delay
+                self.max_queue_delay = max(self.max_queue_delay, delay)
+        prepared = key
+        try:
+            prepared = self.prepared_key(key)
+            shared_secrets = self.kyber.decrypt_many([ct for ct, _, _ in requests], prepared)
+        except Exception:
+            # decrypt each request on its own, so one that breaks the
+            # batch fails alone and not every caller grouped with it
+            for cipher_text, future, _ in requests:
+                try:
+                    future.set_result(self.kyber.decrypt(cipher_text, prepared))
+                except Exception as e:
+                    future.set_exception(e)
+            return
+        for (_, future, _), shared_secret in zip(requests, shared_secrets):
+            future.set_result(shared_secret)
+
+    def stats(self):
+        """
+        return: dict with the number of requests and batches run, the
+                mean and largest batch size, a {batch size: count}
+                histogram and the mean and largest queueing delay in
+                seconds
+        """
+        with self.condition:
+            return {
+                'requests': self.requests,
+                'batches': self.batches,
+                'mean_batch_size': self.requests / self.batches if self.batches else 0.0,
+                'max_batch_size': max(self.batch_sizes) if self.batch_sizes else 0,
+                'batch_sizes': dict(sorted(self.batch_sizes.items())),
+                'mean_queue_delay': self.total_queue_delay / self.requests if self.requests else 0.0,
+                'max_queue_delay': self.max_queue_delay,
+            }
+
+    def reset_stats(self):
+        with self.condition:
+            self.requests = 0
+            self.batches = 0
+            self.batch_sizes = {}
+            self.total_queue_delay = 0.0
+            self.max_queue_delay = 0.0
+
+    def close(self, wait=True):
+        """
+        Stop accepting decryptions; the ones already queued still run
+
+        arg0: when True, wait until they are done
+        """
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+        if wait:
+            self.thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -1,12 +1,18 @@
 from kuantum.kyber.utils.constants import PARAMS_SYSTEM_BYTES, POLY_BYTES, PARAMS_Q, PARAMS_N
+from kuantum.kyber.utils.constants import PARAMS_ETA_1, PARAMS_ETA_2
 from kuantum.kyber.utils.constants import PARAMS_K_512, PARAMS_K_768, PARAMS_K_1024
-from kuantum.kyber.utils.num_type import uint16, int16, byte, int32
-from kuantum.kyber.utils.ntt import ntt, inv_ntt
+from kuantum.kyber.utils.ntt import ntt_array, inv_ntt_array, basemul_array
+from kuantum.kyber.utils.num_type import int16_array, long64_array, uint8_view, byte_view
+from kuantum.kyber.utils.reduce import barrett_reduce_array, montgomery_reduce_array
+from kuantum.kyber.utils.codec import compress_array, decompress_array, polyvec_to_bytes_array
 from kuantum.kyber.utils.poly import *
 from kuantum.kyber.utils.poly_vect import *
+from kuantum.kyber.utils.sampling import rej_uniform_array, sample_uniform_batch
+from kuantum.kyber.utils.trace import stage, traced
 from Crypto.Random import get_random_bytes
 from Crypto.Hash import SHA3_512, SHAKE128
 from typing import List, Dict
+import numpy as np
 
 POLYVEC_BYTES_512 = 2 * POLY_BYTES
 POLYVEC_BYTES_768 = 3 * POLY_BYTES
@@ -23,50 +29,68 @@ POLYVEC_COMPRESSED_BYTES_1024 = 352 * 4
 
 class IDCPA:
 
-    def __init__(self, level='kyber768'):
+    def __init__(self, level='kyber768', matrix_cache=None):
         self.type = level
+        self.matrix_cache = matrix_cache
+        self.eta1 = PARAMS_ETA_2
         if level == 'kyber512':
             self.k = PARAMS_K_512
+            self.eta1 = PARAMS_ETA_1
+            self.ciphertext_bytes = POLYVEC_COMPRESSED_BYTES_512 + POLY_COMPRESSED_BYTES_512
         if level == 'kyber768':
             self.k = PARAMS_K_768
+            self.ciphertext_bytes = POLYVEC_COMPRESSED_BYTES_768 + POLY_COMPRESSED_BYTES_768
         if level == 'kyber1024':
             self.k = PARAMS_K_1024
+            self.ciphertext_bytes = POLYVEC_COMPRESSED_BYTES_1024 + POLY_COMPRESSED_BYTES_1024
 
-    def gen_matrix(self, seed: List[int], transposed: bool) -> List[List[int]]:
+    def gen_matrix(self, seed: List[int], transposed: bool) -> PolyMatrix:
         """
         Deterministically generate matrix A (or the transpose of A)
         from a seed. Entries of the matrix are polynomials that look
         uniformly random. Performs rejection sampling on output of
         a XOF
 
+        When a matrix_cache is set the matrix is looked up there first
+        and the returned matrix is read-only.
+
         arg0: seed
         arg1: boolean deciding whether A or A^T is generated
         """
-        a = [[[ 0 for _ in range(POLY_BYTES)] for _ in range(self.k)] for _ in range(self.k)]
-        for i in range(self.k):
-            a[i] = [[ 0 for x in range(0, POLY_BYTES) ] for y in range(0, self.k)]
-            for j in range(self.k):
-                xof = SHAKE128.new()
-                seed_unsigned = [x & 0xff for x in seed]
-                xof.update(bytearray(seed_unsigned))
-                ij = [0, 0]
-                if transposed:
-                    ij[0] = byte(i)
-                    ij[1] = byte(j)
-                else:
-                    ij[0] = byte(j)
-                    ij[1] = byte(i)
-                xof.update(bytearray(ij))
-                buf = xof.read(672)
-                buf_signed = [byte(x) for x in buf]
-                uniform_r, uniform_i = self.idcpa_rej_uniform(buf_signed[0:504], 504, PARAMS_N)
-                a[i][j] = uniform_r
-                while uniform_i < PARAMS_N:
-                    missing, ctrn = self.idcpa_rej_uniform(buf_signed[504:672], 168, PARAMS_N - uniform_i)
-                    for k in range(uniform_i, PARAMS_N):
-                        a[i][j][k] = missing[k - uniform_i]
-                    uniform_i = uniform_i + ctrn
-        return a
+        with stage('gen_matrix'):
+            if self.matrix_cache is not None:
+                return self.matrix_cache.get_or_create(seed, transposed, self.k, self.expand_matrix)
+            return self.expand_matrix(seed, transposed)
+
+    def expand_matrix(self, seed: List[int], transposed: bool) -> PolyMatrix:
+        """
+        Uncached expansion of A (or A^T) from the seed, see gen_matrix
+
+        arg0: seed
+        arg1: boolean deciding whether A or A^T is generated
+        """
+        return PolyMatrix(self.expand_matrices([seed], transposed)[0])
+
+    def expand_matrices(self, seeds, transposed: bool) -> np.ndarray:
+        """
+        Expand the matrices of many seeds with one batched rejection
+        sampling pass over all n * k * k XOF streams
+
+        arg0: sequence of seeds
+        arg1: boolean deciding whether A or A^T is generated
+        return: int16 array of shape (n, k, k, 256)
+        """
+        xofs = []
+        for seed in seeds:
+            seed_unsigned = bytes(byte_view(seed))
+            for i in range(self.k):
+                for j in range(self.k):
+                    if transposed:
+                        xofs.append(SHAKE128.new(seed_unsigned + bytes([i, j])))
+                    else:
+                        xofs.append(SHAKE128.new(seed_unsigned + bytes([j, i])))
+        a = sample_uniform_batch(xofs)
+        return a.reshape(len(seeds), self.k, self.k, PARAMS_N)
 
     def idcpa_rej_uniform(self, buf, buf_len, req_len):
         """
@@ -76,22 +100,12 @@ class IDCPA:
          arg1: length of byte array
          arg2: requested number of 16-bit integers
         """
-        uniform_r = [0 for _ in range(POLY_BYTES)]
-        i, j = 0, 0
-
-        while i < req_len and (j + 3) <= buf_len:
-            d1 = int32((((int32 (buf[j] & 0xFF)) >> 0) | ((int32 (buf[j + 1] & 0xFF)) << 8)) & 0xFFF)
-            d2 = int32 ((((int32 (buf[j + 1] & 0xFF)) >> 4) | ((int32 (buf[j + 2] & 0xFF)) << 4)) & 0xFFF)
-            j += 3
-            if d1 < int32(PARAMS_Q):
-                uniform_r[i] = int16(d1)
-                i += 1
-            if i < req_len and d2 < int32(PARAMS_Q):
-                uniform_r[i] = int16(d2)
-                i += 1
-
-        return uniform_r, i
+        accepted = rej_uniform_array(buf[:buf_len], req_len)
+        uniform_r = [0 for _ in range(PARAMS_N)]
+        uniform_r[:len(accepted)] = accepted.tolist()
+        return uniform_r, len(accepted)
 
+    @traced('idcpa_gen_keypair')
     def idcpa_gen_keypair(self) -> Dict:
         """
         Generate public and private key for the ID-CPA scheme
@@ -102,112 +116,186 @@ class IDCPA:
         rnd = get_random_bytes(PARAMS_SYSTEM_BYTES)
 
         # hash the random bytes
-        h = SHA3_512.new()
-        h.update(rnd)
+        with stage('hash'):
+            h = SHA3_512.new()
+            h.update(rnd)
 
-        # generate seed, public seed and noiseseed
-        seed = h.digest()
+            # generate seed, public seed and noiseseed
+            seed = h.digest()
         public_seed = [seed[i] for i in range(PARAMS_SYSTEM_BYTES)]
         noiseseed = [seed[i] for i in range(PARAMS_SYSTEM_BYTES, 2 * PARAMS_SYSTEM_BYTES)]
 
-        # generate matrix A
-        A = self.gen_matrix(public_seed, False)
-        s = []  # secret
-        e = []  # noise
-        nonce = 0
+        # generate matrix A; the seed is fresh, so A is expanded without
+        # the matrix cache, which is kept for the peer keys encrypted to
+        with stage('gen_matrix'):
+            A = self.expand_matrix(public_seed, False)
+        with stage('sample_noise'):
+            noise = sample_noise_vector(noiseseed, range(2 * self.k), self.eta1)
+        s = noise[:self.k]  # secret
+        e = noise[self.k:]  # noise
 
-        for i in range(self.k):
-            s.append(get_noise_poly(noiseseed, i, self.k))
-            e.append(get_noise_poly(noiseseed, i + self.k, self.k))
+        with stage('ntt'):
+            s = polyvec_ntt(s, self.k)
+            e = polyvec_ntt(e, self.k)
+        s = polyvec_barret_reduce(s, self.k)
 
-        for i in range(self.k):
-            s[i] = ntt(s[i])
-            e[i] = ntt(e[i])
+        with stage('pointwise_mul'):
+            pk = polymatrix_pointwise_mul(A, s, self.k)
 
         for i in range(self.k):
-            s[i] = poly_barret_reduce(s[i])
-
-        pk = [0 for _ in range(self.k)]
+            pk[i] = poly_montgomery_reduce(pk[i])
 
-        for i in range(self.k):
-            pk[i] = poly_montgomery_reduce(polyvec_pointwise_mul(A[i], s, self.k))
+        pk = polyvec_add(pk, e, self.k)
+        pk = polyvec_barret_reduce(pk, self.k)
 
-        for i in range(self.k):
-            pk[i] = poly_add(pk[i], e[i])
+        with stage('encode'):
+            keys = {
+                'public_key': polyvec_to_bytes(pk) + public_seed,
+                'secret_key': polyvec_to_bytes(s)
+            }
 
-        for i in range(self.k):
-            pk[i] = poly_barret_reduce(pk[i])
+        return keys
 
-        keys = {
-            'public_key': [],
-            'secret_key': []
+    def idcpa_gen_keypairs(self, n: int) -> Dict:
+        """
+        Generate n public and private keys for the ID-CPA scheme at once:
+        all seeds are drawn in bulk, the n matrices and noise vectors are
+        expanded as (n, k, k, 256) / (n, 2k, 256) arrays and t = As + e
+        is computed for every key in one pass. Row i is what
+        idcpa_gen_keypair would produce from the i-th 32-byte seed.
+
+        arg0: number of keypairs
+        Returns: uint8 arrays public_keys (n, pk bytes) and
+                 secret_keys (n, k * 384)
+        """
+        rnd = get_random_bytes(PARAMS_SYSTEM_BYTES * n)
+        seeds = [SHA3_512.new(rnd[i:i + PARAMS_SYSTEM_BYTES]).digest()
+                 for i in range(0, PARAMS_SYSTEM_BYTES * n, PARAMS_SYSTEM_BYTES)]
+        public_seeds = [seed[:PARAMS_SYSTEM_BYTES] for seed in seeds]
+        noiseseeds = [seed[PARAMS_SYSTEM_BYTES:] for seed in seeds]
+
+        a = self.expand_matrices(public_seeds, False)
+        noise = sample_noise_batch(noiseseeds, range(2 * self.k), self.eta1)
+        s = barrett_reduce_array(ntt_array(noise[:, :self.k]))
+        e = ntt_array(noise[:, self.k:])
+
+        pk = basemul_array(a, s[:, None])
+        pk = barrett_reduce_array(int16_array(pk.sum(axis=2, dtype=np.int32)))
+        # to the normal domain as in poly_montgomery_reduce
+        pk = int16_array(montgomery_reduce_array(long64_array(pk) * 1353))
+        pk = barrett_reduce_array(pk + e)
+
+        polyvec_bytes = self.k * POLY_BYTES
+        public_keys = np.empty((n, polyvec_bytes + PARAMS_SYSTEM_BYTES), dtype=np.uint8)
+        public_keys[:, :polyvec_bytes] = polyvec_to_bytes_array(pk)
+        public_keys[:, polyvec_bytes:] = np.frombuffer(b''.join(public_seeds), dtype=np.uint8).reshape(n, -1)
+        return {
+            'public_keys': public_keys,
+            'secret_keys': polyvec_to_bytes_array(s)
         }
 
-        # Public Key
-        for i in range(self.k):
-            byte_array = poly_to_bytes(pk[i])
-            for j in range(len(byte_array)):
-                keys['public_key'].append(byte_array[j])
-
-        # append public seed
-        for i in range(len(public_seed)):
-            keys['public_key'].append(public_seed[i])
-
-        # Secret Key
-        for i in range(self.k):
-            byte_array = poly_to_bytes(s[i])
-            for j in range(len(byte_array)):
-                keys['secret_key'].append(byte_array[j])
-
-        return keys
-
-    def idcpa_enc(self, public_key: List[int], msg: List[int], coins: List[int]) -> List[int]:
+    def idcpa_unpack_public_key(self, public_key: List[int]):
         """
-        Encrypt the given message using the Kyber public-key encryption scheme
+        Split a public key into the polynomial vector t (NTT domain)
+        and the public seed of matrix A
 
         arg0: Public Key
-        arg1: Message
-        arg2: Coins
+        Returns: t, seed
         """
-        pk = []
-        k = poly_from_msg(msg)
-        for i in range(self.k):
-            start = i * POLY_BYTES
-            end = (i + 1) * POLY_BYTES
-            pk.append(poly_from_bytes(public_key[start: end]))
+        with stage('decode'):
+            pk = polyvec_from_bytes(public_key, self.k)
         if self.k == 2:
             seed = public_key[POLYVEC_BYTES_512: POLYVEC_BYTES_512 + 32]
         elif self.k == 3:
             seed = public_key[POLYVEC_BYTES_768: POLYVEC_BYTES_768 + 32]
         else:
             seed = public_key[POLYVEC_BYTES_1024: POLYVEC_BYTES_1024 + 32]
+        return pk, seed
+
+    @traced('idcpa_enc')
+    def idcpa_enc(self, public_key: List[int], msg: List[int], coins: List[int]) -> List[int]:
+        """
+        Encrypt the given message using the Kyber public-key encryption scheme
 
+        arg0: Public Key
+        arg1: Message
+        arg2: Coins
+        """
+        pk, seed = self.idcpa_unpack_public_key(public_key)
         at = self.gen_matrix(seed, True)
-        sp = []
-        ep = []
-        for i in range(self.k):
-            sp.append(get_noise_poly(coins, i, self.k))
-            ep.append(get_noise_poly(coins, i + self.k, 3))
-        epp = get_noise_poly(coins, self.k * 3, 3)
-        for i in range(self.k):
-            sp[i] = ntt(sp[i])
-        for i in range(self.k):
-            sp[i] = poly_barret_reduce(sp[i])
-        bp = []
-        for i in range(self.k):
-            bp.append(polyvec_pointwise_mul(at[i], sp, self.k))
-        v = polyvec_pointwise_mul(pk, sp, self.k)
-        bp = polyvec_invntt(bp, self.k)
-        v = inv_ntt(v)
+        return self.idcpa_enc_unpacked(pk, at, msg, coins)
+
+    @traced('idcpa_enc_unpacked')
+    def idcpa_enc_unpacked(self, pk: PolyVec, at: PolyMatrix, msg: List[int], coins: List[int]) -> List[int]:
+        """
+        Encrypt the given message with an already unpacked public key
+
+        arg0: Public key vector t (NTT domain)
+        arg1: Transpose of matrix A
+        arg2: Message
+        arg3: Coins
+        """
+        with stage('decode'):
+            k = poly_from_msg(msg)
+        with stage('sample_noise'):
+            sp = sample_noise_vector(coins, range(self.k), self.eta1)
+            errors = sample_noise_vector(coins, list(range(self.k, 2 * self.k)) + [self.k * 3], PARAMS_ETA_2)
+        ep = errors[:self.k]
+        epp = errors[self.k]
+        with stage('ntt'):
+            sp = polyvec_ntt(sp, self.k)
+        sp = polyvec_barret_reduce(sp, self.k)
+        with stage('pointwise_mul'):
+            bp = polymatrix_pointwise_mul(at, sp, self.k)
+            v = polyvec_pointwise_mul(pk, sp, self.k)
+        with stage('inv_ntt'):
+            bp = polyvec_invntt(bp, self.k)
+            v = Poly(inv_ntt_array(v))
         bp = polyvec_add(bp, ep, self.k)
         v = poly_add(v, epp)
         v = poly_add(v, k)
         bp = polyvec_barret_reduce(bp, self.k)
         v = poly_barret_reduce(v)
-        b_compressed = polyvec_compress(bp, self.k)
-        v_compressed = poly_compress(v, self.k)
+        with stage('compress'):
+            b_compressed = polyvec_compress(bp, self.k)
+            v_compressed = poly_compress(v, self.k)
         return b_compressed + v_compressed
 
+    def idcpa_enc_batch(self, pk: PolyVec, at: PolyMatrix, msgs, coins) -> np.ndarray:
+        """
+        Encrypt n messages under one unpacked public key, with the same
+        steps as idcpa_enc_unpacked run on (n, ...) stacked arrays:
+        noise for all n operations is sampled together and the
+        matrix-vector products, inverse NTTs and compression cover the
+        whole batch
+
+        arg0: Public key vector t (NTT domain)
+        arg1: Transpose of matrix A
+        arg2: n 32-byte messages, as a list of byte strings or an (n, 32) array
+        arg3: n 32-byte coins
+        return: uint8 array of shape (n, ciphertext bytes)
+        """
+        n = len(coins)
+        msgs = uint8_view(msgs).reshape(n, PARAMS_N // 8)
+        m = decompress_array(msgs, 1)
+        sp = sample_noise_batch(coins, range(self.k), self.eta1)
+        errors = sample_noise_batch(coins, list(range(self.k, 2 * self.k)) + [self.k * 3], PARAMS_ETA_2)
+
+        sp = barrett_reduce_array(ntt_array(sp))
+        bp = basemul_array(np.asarray(at)[None, :self.k, :self.k], sp[:, None])
+        bp = barrett_reduce_array(int16_array(bp.sum(axis=2, dtype=np.int32)))
+        v = basemul_array(np.asarray(pk)[None, :self.k], sp)
+        v = barrett_reduce_array(int16_array(v.sum(axis=1, dtype=np.int32)))
+        bp = inv_ntt_array(bp) + errors[:, :self.k]
+        v = inv_ntt_array(v) + errors[:, self.k] + m
+        bp = barrett_reduce_array(bp)
+        v = barrett_reduce_array(v)
+
+        b_compressed = compress_array(bp, polyvec_compress_bits(self.k)).reshape(n, -1)
+        v_compressed = compress_array(v, poly_compress_bits(self.k))
+        return np.concatenate([b_compressed, v_compressed], axis=1)
+
+    @traced('idcpa_dec')
     def idcpa_dec(self, cipher_text: List[int], private_key: List[int]) -> List[int]:
         """
         Decrypt the given cipher text using the Kyber public-key encryption scheme
@@ -215,6 +303,18 @@ class IDCPA:
         arg0: Cipher Text
         arg1: Private Key
         """
+        with stage('decode'):
+            s = polyvec_from_bytes(private_key, self.k)
+        return self.idcpa_dec_unpacked(cipher_text, s)
+
+    @traced('idcpa_dec_unpacked')
+    def idcpa_dec_unpacked(self, cipher_text: List[int], private_key: PolyVec) -> List[int]:
+        """
+        Decrypt the given cipher text with an already unpacked private key
+
+        arg0: Cipher Text
+        arg1: Private key vector s (NTT domain)
+        """
         if self.k == 2:
             bp_end_index = POLYVEC_COMPRESSED_BYTES_512
             v_end_index = bp_end_index + POLY_COMPRESSED_BYTES_512
@@ -225,13 +325,37 @@ class IDCPA:
             bp_end_index = POLYVEC_COMPRESSED_BYTES_1024
             v_end_index = bp_end_index + POLY_COMPRESSED_BYTES_1024
 
-        bp = polyvec_decompress(cipher_text[:bp_end_index], self.k)
-        v = poly_decompress(cipher_text[bp_end_index: v_end_index], self.k)
+        with stage('decompress'):
+            bp = polyvec_decompress(cipher_text[:bp_end_index], self.k)
+            v = poly_decompress(cipher_text[bp_end_index: v_end_index], self.k)
 
-        private_key_polyvec = polyvec_from_bytes(private_key, self.k)
-        bp = polyvec_ntt(bp, self.k)
-        mp = polyvec_pointwise_mul(private_key_polyvec, bp, self.k)
-        mp = inv_ntt(mp)
+        with stage('ntt'):
+            bp = polyvec_ntt(bp, self.k)
+        with stage('pointwise_mul'):
+            mp = polyvec_pointwise_mul(private_key, bp, self.k)
+        with stage('inv_ntt'):
+            mp = Poly(inv_ntt_array(mp))
         mp = poly_sub(v, mp)
         mp = poly_barret_reduce(mp)
-        return poly_to_msg(mp)
+        with stage('encode'):
+            return poly_to_msg(mp)
+
+    def idcpa_dec_batch(self, cipher_texts: np.ndarray, private_key: PolyVec) -> np.ndarray:
+        """
+        Decrypt n cipher texts under one unpacked private key, with the
+        same steps as idcpa_dec_unpacked run on (n, ...) stacked arrays
+
+        arg0: uint8 array of shape (n, ciphertext bytes)
+        arg1: Private key vector s (NTT domain)
+        return: uint8 array of shape (n, 32) with the messages
+        """
+        n = len(cipher_texts)
+        bp_end_index = self.ciphertext_bytes - PARAMS_N * poly_compress_bits(self.k) // 8
+        bp = decompress_array(cipher_texts[:, :bp_end_index].reshape(n, self.k, -1), polyvec_compress_bits(self.k))
+        v = decompress_array(cipher_texts[:, bp_end_index:], poly_compress_bits(self.k))
+
+        bp = ntt_array(bp)
+        mp = basemul_array(np.asarray(private_key)[None, :self.k], bp)
+        mp = barrett_reduce_array(int16_array(mp.sum(axis=1, dtype=np.int32)))
+        mp = barrett_reduce_array(v - inv_ntt_array(mp))
+        return compress_array(mp, 1)
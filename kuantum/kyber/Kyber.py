@@ -1,8 +1,13 @@
 from kuantum.kyber.utils.constants import PARAMS_K_512, PARAMS_K_768, PARAMS_K_1024, POLY_BYTES
-from kuantum.kyber.utils.num_type import uint16, int16, byte
+from kuantum.kyber.utils.num_type import byte, byte_view, uint8_view
 from kuantum.kyber.IDCPA import IDCPA
+from kuantum.kyber.utils.poly_vect import polyvec_from_bytes
+from kuantum.kyber.PreparedKeys import PreparedPublicKey, PreparedSecretKey
+from kuantum.kyber.utils.trace import stage, traced
+from kuantum.kyber.utils.metrics import measured
 from Crypto.Hash import SHA3_256, SHA3_512, SHAKE256
 from Crypto.Random import get_random_bytes
+import numpy as np
 
 POLY_VEC_BYTES_K512 = 2 * POLY_BYTES
 POLY_VEC_BYTES_K768 = 3 * POLY_BYTES
@@ -23,130 +28,373 @@ KYBER_SK_BYTES_1024 = POLY_VEC_BYTES_K1024 + ((POLY_VEC_BYTES_K1024 + 32) + 2 *
 
 class Kyber:
 
-    def __init__(self, level):
+    def __init__(self, level, matrix_cache=None, bytes_mode=False, metrics=None):
+        """
+        arg0: 'kyber512', 'kyber768' or 'kyber1024'
+        arg1: optional MatrixCache used by encryption and decryption
+              (not key generation, whose seeds are fresh), worthwhile
+              when the same public keys are used repeatedly; it may be
+              shared by instances of all levels
+        arg2: when True, keys, messages and ciphertexts may be any
+              buffer-protocol object (bytes, bytearray, memoryview, uint8
+              ndarray) and all outputs are bytes; by default they are
+              lists of signed bytes
+        arg3: optional MetricsRegistry recording the latency, errors and
+              implicit rejections of this instance's operations; one
+              registry can be shared by instances of all levels
+        """
         self.type = level
+        self.bytes_mode = bytes_mode
+        self.metrics = metrics
         if level == 'kyber512':
             self.k = PARAMS_K_512
+            self.public_key_bytes = IDCPA_PK_BYTES_512
+            self.idcpa_secret_key_bytes = IDCPA_SK_BYTES_512
+            self.secret_key_bytes = KYBER_SK_BYTES_512
         if level == 'kyber768':
             self.k = PARAMS_K_768
+            self.public_key_bytes = IDCPA_PK_BYTES_768
+            self.idcpa_secret_key_bytes = IDCPA_SK_BYTES_768
+            self.secret_key_bytes = KYBER_SK_BYTES_768
         if level == 'kyber1024':
             self.k = PARAMS_K_1024
-        self.idcpa = IDCPA(level)
+            self.public_key_bytes = IDCPA_PK_BYTES_1024
+            self.idcpa_secret_key_bytes = IDCPA_SK_BYTES_1024
+            self.secret_key_bytes = KYBER_SK_BYTES_1024
+        self.idcpa = IDCPA(level, matrix_cache)
+        self.ciphertext_bytes = self.idcpa.ciphertext_bytes
 
+    def input(self, x):
+        """
+        Bring a key, message or ciphertext argument into the form used
+        internally: a zero-copy memoryview in bytes mode, unchanged
+        otherwise
+        """
+        if self.bytes_mode:
+            return byte_view(x)
+        return x
+
+    def output(self, x):
+        """
+        Convert a byte string (bytes, memoryview or list of signed bytes)
+        to the form returned to callers: bytes in bytes mode, a list of
+        signed bytes otherwise
+        """
+        if self.bytes_mode:
+            return bytes(byte_view(x))
+        if isinstance(x, list):
+            return x
+        return byte_view(x).cast('b').tolist()
+
+    @measured('gen_keypair')
+    @traced('gen_keypair')
     def gen_keypair(self):
         keys = self.idcpa.idcpa_gen_keypair()
         pk = keys['public_key']
         sk = keys['secret_key']
 
-        md = SHA3_256.new()
-        md.update(bytearray([x & 0xff for x in pk]))
-        h_pk = md.digest()
-        h_pk = [byte(x) for x in h_pk]
+        with stage('hash'):
+            h_pk = SHA3_256.new(byte_view(pk)).digest()
         z = get_random_bytes(32)
-        z = [byte(x) for x in z]
 
-        kyber_keys = {
+        if self.bytes_mode:
+            pk = bytes(byte_view(pk))
+            return {
+                'public_key': pk,
+                'secret_key': bytes(byte_view(sk)) + pk + h_pk + z
+            }
+        return {
             'public_key': pk,
-            'secret_key': sk[:] + pk[:] + h_pk[:] + z[:]
+            'secret_key': sk[:] + pk[:] + self.output(h_pk) + self.output(z)
+        }
+
+    @measured('gen_keypairs')
+    def gen_keypairs(self, n, batch_size=1024):
+        """
+        Generate n keypairs in bulk, batch_size at a time (see
+        IDCPA.idcpa_gen_keypairs), into two contiguous uint8 buffers
+        with one key per row, ready to be written to disk as they are.
+        Rows can be passed to encrypt/decrypt in bytes mode, or via
+        .view(np.int8).tolist() in list mode.
+
+        arg0: number of keypairs
+        arg1: keypairs expanded per pass, bounding the working memory
+        return: dict with public_keys (n, public key bytes) and
+                secret_keys (n, secret key bytes)
+        """
+        if batch_size < 1:
+            raise ValueError('batch_size must be at least 1')
+        pk_end = self.idcpa_secret_key_bytes + self.public_key_bytes
+        public_keys = np.empty((n, self.public_key_bytes), dtype=np.uint8)
+        secret_keys = np.empty((n, self.secret_key_bytes), dtype=np.uint8)
+        for start in range(0, n, batch_size):
+            end = min(start + batch_size, n)
+            keys = self.idcpa.idcpa_gen_keypairs(end - start)
+            public_keys[start:end] = keys['public_keys']
+            secret_keys[start:end, :self.idcpa_secret_key_bytes] = keys['secret_keys']
+            secret_keys[start:end, self.idcpa_secret_key_bytes:pk_end] = keys['public_keys']
+            h_pk = b''.join([SHA3_256.new(pk.tobytes()).digest() for pk in keys['public_keys']])
+            secret_keys[start:end, pk_end:pk_end + 32] = np.frombuffer(h_pk, dtype=np.uint8).reshape(-1, 32)
+            z = get_random_bytes(32 * (end - start))
+            secret_keys[start:end, pk_end + 32:] = np.frombuffer(z, dtype=np.uint8).reshape(-1, 32)
+        return {
+            'public_keys': public_keys,
+            'secret_keys': secret_keys
         }
 
-        return kyber_keys
+    def prepare_public_key(self, public_key):
+        """
+        Do all public-key dependent encryption work once: decode t,
+        extract the seed, hash the key and expand A^T. The result can be
+        passed to encrypt in place of public_key any number of times.
+
+        arg0: public key
+        return: PreparedPublicKey
+        """
+        public_key = self.input(public_key)
+        if len(public_key) != self.public_key_bytes:
+            raise ValueError('Public key must be %d bytes long for %s' % (self.public_key_bytes, self.type))
+        t, seed = self.idcpa.idcpa_unpack_public_key(public_key)
+        at = self.idcpa.gen_matrix(seed, True)
+        h_pk = SHA3_256.new(byte_view(public_key)).digest()
+        return PreparedPublicKey(self.type, bytes(byte_view(public_key)), t, bytes(byte_view(seed)), h_pk, at)
 
+    @measured('encrypt')
+    @traced('encrypt')
     def encrypt(self, public_key, msg=None):
-        if msg is not None and len(msg) != 32:
-            raise ValueError('Message must be 32 bytes long')
+        """
+        arg0: public key, or a PreparedPublicKey from prepare_public_key
+        arg1: optional 32-byte message, random if omitted
+        """
+        prepared = isinstance(public_key, PreparedPublicKey)
+        if prepared and public_key.level != self.type:
+            raise ValueError('Public key was prepared for %s, not %s' % (public_key.level, self.type))
         if msg is None:
             msg = get_random_bytes(32)
+        msg = self.input(msg)
+        if len(msg) != 32:
+            raise ValueError('Message must be 32 bytes long')
 
-        # hash msg with SHA3-256
-        md = SHA3_256.new()
-        md.update(bytearray([x & 0xff for x in msg]))
-        h_msg = md.digest()
-        h_msg = [byte(x) for x in h_msg]
-
-        # hash public key with SHA3-256
-        md = SHA3_256.new()
-        md.update(bytearray([x & 0xff for x in public_key]))
-        h_pk = md.digest()
-        h_pk = [byte(x) for x in h_pk]
+        with stage('hash'):
+            # hash msg with SHA3-256
+            h_msg = SHA3_256.new(byte_view(msg)).digest()
 
-        # hash h_msg and h_pk with SHA3-512
-        md512 = SHA3_512.new()
-        md512.update(bytearray([x & 0xff for x in h_msg + h_pk]))
-        h_msg_pk = md512.digest()
-        h_msg_pk = [byte(x) for x in h_msg_pk]
+            # hash public key with SHA3-256
+            if prepared:
+                h_pk = public_key.h_pk
+            else:
+                public_key = self.input(public_key)
+                h_pk = SHA3_256.new(byte_view(public_key)).digest()
 
+            # hash h_msg and h_pk with SHA3-512
+            h_msg_pk = SHA3_512.new(h_msg + h_pk).digest()
         kr1 = h_msg_pk[:32]
-        kr2 = [h_msg_pk[i + 32] for i in range(0, len(h_msg_pk) - 32)]
+        kr2 = h_msg_pk[32:]
 
         # generate ciphertext
-        ct = self.idcpa.idcpa_enc(public_key, h_msg, kr2)
+        if prepared:
+            ct = self.idcpa.idcpa_enc_unpacked(public_key.t, public_key.at, h_msg, kr2)
+        else:
+            ct = self.idcpa.idcpa_enc(public_key, h_msg, kr2)
 
-        # hash cypher text with SHA-256
-        md = SHA3_256.new()
-        md.update(bytearray([x & 0xff for x in ct]))
-        h_ct = md.digest()
-        h_ct = [byte(x) for x in h_ct]
+        with stage('kdf'):
+            # hash cypher text with SHA-256
+            h_ct = SHA3_256.new(byte_view(ct)).digest()
 
-        # hash kr1 and h_ct with SHAKE-256
-        md_shake = SHAKE256.new()
-        md_shake.update(bytearray([x & 0xff for x in kr1 + h_ct]))
-        shared_secret = md_shake.read(32)
-        shared_secret = [byte(x) for x in shared_secret]
+            # hash kr1 and h_ct with SHAKE-256
+            shared_secret = SHAKE256.new(kr1 + h_ct).read(32)
 
         return {
-            'ciphertext': ct,
-            'shared_secret': shared_secret
+            'ciphertext': self.output(ct),
+            'shared_secret': self.output(shared_secret)
         }
 
-    def decrypt(self, cipher_text, private_key):
-        idcpa_private_key = None
-        idcpa_public_key = None
-        if self.k == 2:
-            idcpa_private_key = private_key[0: IDCPA_SK_BYTES_512]
-            idcpa_public_key = private_key[IDCPA_SK_BYTES_512:IDCPA_SK_BYTES_512 + IDCPA_PK_BYTES_512]
-            h = private_key[KYBER_SK_BYTES_512 - 2 * 32:KYBER_SK_BYTES_512 - 32]
-            z = private_key[KYBER_SK_BYTES_512 - 32:]
-
-        if self.k == 3:
-            idcpa_private_key = private_key[0: IDCPA_SK_BYTES_768]
-            idcpa_public_key = private_key[IDCPA_SK_BYTES_768:IDCPA_SK_BYTES_768 + IDCPA_PK_BYTES_768]
-            h = private_key[KYBER_SK_BYTES_768 - 2 * 32:KYBER_SK_BYTES_768 - 32]
-            z = private_key[KYBER_SK_BYTES_768 - 32:]
-
-        if self.k == 4:
-            idcpa_private_key = private_key[0: IDCPA_SK_BYTES_1024]
-            idcpa_public_key = private_key[IDCPA_SK_BYTES_1024:IDCPA_SK_BYTES_1024 + IDCPA_PK_BYTES_1024]
-            h = private_key[KYBER_SK_BYTES_1024 - 2 * 32:KYBER_SK_BYTES_1024 - 32]
-            z = private_key[KYBER_SK_BYTES_1024 - 32:]
+    def encrypt_many(self, public_key, n):
+        """
+        n encapsulations to one public key with random messages, see
+        encrypt_batch
 
-        # idcpa decrypt
-        msg = self.idcpa.idcpa_dec(cipher_text, idcpa_private_key)
+        arg0: public key, or a PreparedPublicKey from prepare_public_key
+        arg1: number of encapsulations
+        return: list of n dicts with ciphertext and shared_secret
+        """
+        return self.encrypt_batch(public_key, [get_random_bytes(32) for _ in range(n)])
+
+    @measured('encrypt_batch')
+    def encrypt_batch(self, public_key, msgs):
+        """
+        Encapsulate every message to one public key. The key is decoded
+        and A^T expanded once, and the IND-CPA encryptions run as one
+        batch (IDCPA.idcpa_enc_batch). Result i equals
+        encrypt(public_key, msgs[i]).
+
+        arg0: public key, or a PreparedPublicKey from prepare_public_key
+        arg1: sequence of 32-byte messages
+        return: list of dicts with ciphertext and shared_secret
+        """
+        if not isinstance(public_key, PreparedPublicKey):
+            public_key = self.prepare_public_key(public_key)
+        elif public_key.level != self.type:
+            raise ValueError('Public key was prepared for %s, not %s' % (public_key.level, self.type))
+        msgs = [byte_view(self.input(msg)) for msg in msgs]
+        if any(len(msg) != 32 for msg in msgs):
+            raise ValueError('Message must be 32 bytes long')
+        if not msgs:
+            return []
+
+        # hash every msg with SHA3-256 and, together with H(pk), with SHA3-512
+        h_msgs = [SHA3_256.new(msg).digest() for msg in msgs]
+        h_msg_pks = [SHA3_512.new(h_msg + public_key.h_pk).digest() for h_msg in h_msgs]
+
+        # generate all ciphertexts
+        cts = self.idcpa.idcpa_enc_batch(public_key.t, public_key.at, h_msgs, [kr[32:] for kr in h_msg_pks])
+
+        results = []
+        for ct, h_msg_pk in zip(cts, h_msg_pks):
+            ct = ct.tobytes()
+            h_ct = SHA3_256.new(ct).digest()
+            shared_secret = SHAKE256.new(h_msg_pk[:32] + h_ct).read(32)
+            results.append({
+                'ciphertext': self.output(ct),
+                'shared_secret': self.output(shared_secret)
+            })
+        return results
+
+    def split_secret_key(self, private_key):
+        """
+        Split a secret key into its IND-CPA secret key, embedded public
+        key, H(pk) and rejection value z. Slicing a memoryview (as in
+        bytes mode) gives views rather than copies.
+
+        arg0: secret key
+        """
+        sk_end = self.idcpa_secret_key_bytes
+        pk_end = sk_end + self.public_key_bytes
+        idcpa_private_key = private_key[0: sk_end]
+        idcpa_public_key = private_key[sk_end: pk_end]
+        h = private_key[self.secret_key_bytes - 2 * 32: self.secret_key_bytes - 32]
+        z = private_key[self.secret_key_bytes - 32:]
+        return idcpa_private_key, idcpa_public_key, h, z
+
+    def prepare_secret_key(self, private_key):
+        """
+        Do all secret-key dependent decryption work once: decode s and
+        prepare the embedded public key for the re-encryption check.
+        The result can be passed to decrypt in place of private_key any
+        number of times.
+
+        arg0: secret key
+        return: PreparedSecretKey
+        """
+        private_key = self.input(private_key)
+        if len(private_key) != self.secret_key_bytes:
+            raise ValueError('Secret key must be %d bytes long for %s' % (self.secret_key_bytes, self.type))
+        idcpa_private_key, idcpa_public_key, h, z = self.split_secret_key(private_key)
+        s = polyvec_from_bytes(idcpa_private_key, self.k)
+        return PreparedSecretKey(self.type, s, self.prepare_public_key(idcpa_public_key),
+                                 bytes(byte_view(h)), bytes(byte_view(z)))
+
+    @measured('decrypt')
+    @traced('decrypt')
+    def decrypt(self, cipher_text, private_key):
+        """
+        arg0: ciphertext
+        arg1: secret key, or a PreparedSecretKey from prepare_secret_key
+        """
+        cipher_text = byte_view(self.input(cipher_text))
+        prepared = isinstance(private_key, PreparedSecretKey)
+        if prepared:
+            if private_key.level != self.type:
+                raise ValueError('Secret key was prepared for %s, not %s' % (private_key.level, self.type))
+            h = private_key.h
+            z = private_key.z
+            # idcpa decrypt
+            msg = self.idcpa.idcpa_dec_unpacked(cipher_text, private_key.s)
+        else:
+            idcpa_private_key, idcpa_public_key, h, z = self.split_secret_key(self.input(private_key))
+            # idcpa decrypt
+            msg = self.idcpa.idcpa_dec(cipher_text, idcpa_private_key)
 
         # hash msg + pk_h with SHA3-512
-        md = SHA3_512.new()
-        md.update(bytearray([x & 0xff for x in msg + h]))
-        h_msg_pk = md.digest()
-        h_msg_pk = [byte(x) for x in h_msg_pk]
+        with stage('hash'):
+            md = SHA3_512.new(byte_view(msg))
+            md.update(byte_view(h))
+            h_msg_pk = md.digest()
         k = h_msg_pk[:32]
         r = h_msg_pk[-32:]
 
         # idcpa encrypt
-        ct = self.idcpa.idcpa_enc(idcpa_public_key, msg, r)
+        if prepared:
+            ct = self.idcpa.idcpa_enc_unpacked(private_key.public_key.t, private_key.public_key.at, msg, r)
+        else:
+            ct = self.idcpa.idcpa_enc(idcpa_public_key, msg, r)
 
-        # hash ct with SHA3-256
-        md = SHA3_256.new()
-        md.update(bytearray([x & 0xff for x in cipher_text]))
-        h_ct = md.digest()
-        h_ct = [byte(x) for x in h_ct]
+        with stage('compare'):
+            if byte_view(ct) == cipher_text:
+                temp_buf = k
+            else:
+                temp_buf = byte_view(z)
+                if self.metrics is not None:
+                    self.metrics.implicit_rejection(self.type)
 
-        if ct == cipher_text:
-            temp_buf = k + h_ct
-        else:
-            temp_buf = z[:] + h_ct
+        with stage('kdf'):
+            # hash ct with SHA3-256
+            h_ct = SHA3_256.new(cipher_text).digest()
+
+            # hash temp_buf with SHAKE-256
+            md_shake = SHAKE256.new(temp_buf)
+            md_shake.update(h_ct)
+            return self.output(md_shake.read(32))
+
+    @measured('decrypt_many')
+    def decrypt_many(self, cipher_texts, private_key):
+        """
+        Decapsulate many ciphertexts under one secret key. Decryption,
+        re-encryption and the ciphertext comparison run on stacked arrays
+        (IDCPA.idcpa_dec_batch / idcpa_enc_batch), and the implicit
+        rejection picks K or z per row with a masked select rather than
+        a branch. Result i equals decrypt(cipher_texts[i], private_key).
+
+        arg0: list of ciphertexts, or a 2-D uint8 array with one per row
+        arg1: secret key, or a PreparedSecretKey from prepare_secret_key
+        return: list of shared secrets, in input order
+        """
+        if not isinstance(private_key, PreparedSecretKey):
+            private_key = self.prepare_secret_key(private_key)
+        elif private_key.level != self.type:
+            raise ValueError('Secret key was prepared for %s, not %s' % (private_key.level, self.type))
+        if len(cipher_texts) == 0:
+            return []
+        if isinstance(cipher_texts, (list, tuple)) and self.bytes_mode:
+            cipher_texts = [byte_view(ct) for ct in cipher_texts]
+        cipher_texts = uint8_view(cipher_texts)
+        if cipher_texts.ndim != 2 or cipher_texts.shape[1] != self.ciphertext_bytes:
+            raise ValueError('Ciphertexts must be %d bytes long for %s' % (self.ciphertext_bytes, self.type))
+
+        # idcpa decrypt
+        msgs = self.idcpa.idcpa_dec_batch(cipher_texts, private_key.s)
+
+        # hash msg + pk_h with SHA3-512
+        h_msg_pks = [SHA3_512.new(msg.tobytes() + private_key.h).digest() for msg in msgs]
+
+        # idcpa encrypt
+        cts = self.idcpa.idcpa_enc_batch(private_key.public_key.t, private_key.public_key.at, msgs,
+                                         [kr[32:] for kr in h_msg_pks])
+
+        # per row 0xff if the re-encryption differs, 0x00 if it matches,
+        # computed over every byte of every row
+        fail = np.bitwise_or.reduce(cts ^ cipher_texts, axis=1) != 0
+        mask = (np.uint8(0) - fail.astype(np.uint8))[:, None]
+        k = np.frombuffer(b''.join([kr[:32] for kr in h_msg_pks]), dtype=np.uint8).reshape(-1, 32)
+        z = np.frombuffer(private_key.z, dtype=np.uint8)
+        keys = k ^ (mask & (k ^ z))
+        if self.metrics is not None:
+            self.metrics.implicit_rejection(self.type, int(np.count_nonzero(fail)))
 
-        # hash temp_buf with SHAKE-256
-        md_shake = SHAKE256.new()
-        md_shake.update(bytearray([x & 0xff for x in temp_buf]))
-        shared_secret = md_shake.read(32)
-        return [byte(x) for x in shared_secret]
+        shared_secrets = []
+        for key, ct in zip(keys, cipher_texts):
+            # hash key + h_ct with SHAKE-256
+            md_shake = SHAKE256.new(key.tobytes())
+            md_shake.update(SHA3_256.new(ct.tobytes()).digest())
+            shared_secrets.append(self.output(md_shake.read(32)))
+        return shared_secrets
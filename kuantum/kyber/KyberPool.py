@@ -0,0 +1,247 @@
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from kuantum.kyber.Kyber import Kyber
+from kuantum.kyber.utils.matrix_cache import MatrixCache
+from kuantum.kyber.utils.num_type import byte_view
+import numpy as np
+import os
+
+# state of a pool worker process, set up once by init_worker
+worker_kyber = None
+worker_keys = None
+worker_key_cache_size = 0
+
+
+def init_worker(level, key_cache_size):
+    """
+    Pool initializer: create the worker's Kyber instance (bytes mode,
+    with a matrix cache) and run one keygen/encaps/decaps round through
+    the single and batched paths, so that imports, lookup tables and
+    numpy dispatch are all warm before the first real call
+    """
+    global worker_kyber, worker_keys, worker_key_cache_size
+    worker_kyber = Kyber(level, matrix_cache=MatrixCache(max_entries=max(key_cache_size, 1)), bytes_mode=True)
+    worker_keys = OrderedDict()
+    worker_key_cache_size = key_cache_size
+    keys = worker_kyber.gen_keypairs(2)
+    pk = keys['public_keys'][0].tobytes()
+    sk = keys['secret_keys'][0].tobytes()
+    enc = worker_kyber.encrypt_batch(pk, [bytes(32), bytes(32)])
+    worker_kyber.decrypt_many([enc[0]['ciphertext'], enc[1]['ciphertext']], sk)
+    worker_kyber.decrypt(worker_kyber.encrypt(pk)['ciphertext'], sk)
+
+
+def worker_prepared_key(key, prepare):
+    """
+    Return the prepared form of a raw key from the worker's LRU cache,
+    preparing and storing it on a miss
+    """
+    prepared = worker_keys.get(key)
+    if prepared is None:
+        prepared = prepare(key)
+        if worker_key_cache_size > 0:
+            worker_keys[key] = prepared
+            if len(worker_keys) > worker_key_cache_size:
+                worker_keys.popitem(last=False)
+    else:
+        worker_keys.move_to_end(key)
+    return prepared
+
+
+def worker_ready():
+    return os.getpid()
+
+
+def worker_gen_keypair():
+    return worker_kyber.gen_keypair()
+
+
+def worker_gen_keypairs(n):
+    keys = worker_kyber.gen_keypairs(n)
+    return keys['public_keys'].tobytes(), keys['secret_keys'].tobytes()
+
+
+def worker_encrypt(public_key, msg):
+    return worker_kyber.encrypt(worker_prepared_key(public_key, worker_kyber.prepare_public_key), msg)
+
+
+def worker_encrypt_batch(public_key, msgs):
+    results = worker_kyber.encrypt_batch(worker_prepared_key(public_key, worker_kyber.prepare_public_key),
+                                         [msgs[i:i + 32] for i in range(0, len(msgs), 32)])
+    return b''.join([r['ciphertext'] for r in results]), b''.join([r['shared_secret'] for r in results])
+
+
+def worker_decrypt(cipher_text, private_key):
+    return worker_kyber.decrypt(cipher_text, worker_prepared_key(private_key, worker_kyber.prepare_secret_key))
+
+
+def worker_decrypt_many(cipher_texts, private_key):
+    cipher_texts = np.frombuffer(cipher_texts, dtype=np.uint8).reshape(-1, worker_kyber.ciphertext_bytes)
+    prepared = worker_prepared_key(private_key, worker_kyber.prepare_secret_key)
+    return b''.join(worker_kyber.decrypt_many(cipher_texts, prepared))
+
+
+class KyberPool:
+    """
+    Runs Kyber operations on a pool of worker processes, each with its
+    own warm Kyber instance, to use more than one core. Every argument
+    and result crosses the process boundary as bytes; batches go as one
+    joined byte string per chunk. Workers keep an LRU cache of prepared
+    keys, so repeated calls with the same key skip the key decoding and
+    matrix expansion.
+
+    Keys, messages and ciphertexts may be any buffer-protocol object or
+    list of signed bytes; results are always bytes (as Kyber in bytes
+    mode). Use as a context manager or call shutdown when done.
+    """
+
+    def __init__(self, level, workers=None, key_cache_size=64, mp_context=None):
+        """
+        arg0: 'kyber512', 'kyber768' or 'kyber1024'
+        arg1: number of worker processes, os.cpu_count() if omitted
+        arg2: prepared keys each worker keeps, 0 to disable the cache
+        arg3: optional multiprocessing context, e.g. get_context('spawn')
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError('workers must be at least 1')
+        if key_cache_size < 0:
+            raise ValueError('key_cache_size must not be negative')
+        self.type = level
+        self.workers = workers
+        self.kyber = Kyber(level, bytes_mode=True)
+        self.executor = ProcessPoolExecutor(max_workers=workers, mp_context=mp_context,
+                                            initializer=init_worker, initargs=(level, key_cache_size))
+        self.warm()
+
+    def warm(self):
+        """
+        Start the worker processes and wait until they are initialised
+
+        return: list of worker process ids that answered
+        """
+        futures = [self.executor.submit(worker_ready) for _ in range(self.workers)]
+        return [f.result() for f in futures]
+
+    def chunks(self, n, chunk_size):
+        """
+        Split range(n) into (start, end) chunks of chunk_size, by default
+        about four chunks per worker so uneven chunks still balance
+        """
+        if chunk_size is None:
+            chunk_size = max(1, -(-n // (4 * self.workers)))
+        if chunk_size < 1:
+            raise ValueError('chunk_size must be at least 1')
+        return [(start, min(start + chunk_size, n)) for start in range(0, n, chunk_size)]
+
+    def submit_gen_keypair(self):
+        """
+        return: future of a dict with public_key and secret_key
+        """
+        return self.executor.submit(worker_gen_keypair)
+
+    def submit_encrypt(self, public_key, msg=None):
+        """
+        arg0: public key
+        arg1: optional 32-byte message, random if omitted
+        return: future of a dict with ciphertext and shared_secret
+        """
+        if msg is not None:
+            msg = bytes(byte_view(msg))
+        return self.executor.submit(worker_encrypt, bytes(byte_view(public_key)), msg)
+
+    def submit_decrypt(self, cipher_text, private_key):
+        """
+        arg0: ciphertext
+        arg1: secret key
+        return: future of the shared secret
+        """
+        return self.executor.submit(worker_decrypt, bytes(byte_view(cipher_text)), bytes(byte_view(private_key)))
+
+    def gen_keypairs(self, n, chunk_size=None):
+        """
+        Generate n keypairs, chunk_size per worker call (see
+        Kyber.gen_keypairs)
+
+        arg0: number of keypairs
+        arg1: keypairs per worker call
+        return: dict with public_keys (n, public key bytes) and
+                secret_keys (n, secret key bytes) uint8 arrays
+        """
+        public_keys = np.empty((n, self.kyber.public_key_bytes), dtype=np.uint8)
+        secret_keys = np.empty((n, self.kyber.secret_key_bytes), dtype=np.uint8)
+        chunks = self.chunks(n, chunk_size)
+        futures = [self.executor.submit(worker_gen_keypairs, end - start) for start, end in chunks]
+        for (start, end), future in zip(chunks, futures):
+            pks, sks = future.result()
+            public_keys[start:end] = np.frombuffer(pks, dtype=np.uint8).reshape(end - start, -1)
+            secret_keys[start:end] = np.frombuffer(sks, dtype=np.uint8).reshape(end - start, -1)
+        return {
+            'public_keys': public_keys,
+            'secret_keys': secret_keys
+        }
+
+    def encrypt_batch(self, public_key, msgs, chunk_size=None):
+        """
+        Encapsulate every message to one public key, chunk_size messages
+        per worker call (see Kyber.encrypt_batch). Result i equals
+        Kyber.encrypt(public_key, msgs[i]).
+
+        arg0: public key
+        arg1: sequence of 32-byte messages
+        arg2: messages per worker call
+        return: list of dicts with ciphertext and shared_secret
+        """
+        public_key = bytes(byte_view(public_key))
+        msgs = [bytes(byte_view(msg)) for msg in msgs]
+        if any(len(msg) != 32 for msg in msgs):
+            raise ValueError('Message must be 32 bytes long')
+        chunks = self.chunks(len(msgs), chunk_size)
+        futures = [self.executor.submit(worker_encrypt_batch, public_key, b''.join(msgs[start:end]))
+                   for start, end in chunks]
+        ct_bytes = self.kyber.ciphertext_bytes
+        results = []
+        for future in futures:
+            cts, shared_secrets = future.result()
+            for i in range(len(shared_secrets) // 32):
+                results.append({
+                    'ciphertext': cts[i * ct_bytes:(i + 1) * ct_bytes],
+                    'shared_secret': shared_secrets[i * 32:(i + 1) * 32]
+                })
+        return results
+
+    def decrypt_many(self, cipher_texts, private_key, chunk_size=None):
+        """
+        Decapsulate many ciphertexts under one secret key, chunk_size
+        ciphertexts per worker call (see Kyber.decrypt_many). Result i
+        equals Kyber.decrypt(cipher_texts[i], private_key).
+
+        arg0: list of ciphertexts, or a 2-D uint8 array with one per row
+        arg1: secret key
+        arg2: ciphertexts per worker call
+        return: list of shared secrets, in input order
+        """
+        private_key = bytes(byte_view(private_key))
+        if isinstance(cipher_texts, np.ndarray):
+            cipher_texts = list(cipher_texts)
+        cipher_texts = [bytes(byte_view(ct)) for ct in cipher_texts]
+        if any(len(ct) != self.kyber.ciphertext_bytes for ct in cipher_texts):
+            raise ValueError('Ciphertexts must be %d bytes long for %s' % (self.kyber.ciphertext_bytes, self.type))
+        chunks = self.chunks(len(cipher_texts), chunk_size)
+        futures = [self.executor.submit(worker_decrypt_many, b''.join(cipher_texts[start:end]), private_key)
+                   for start, end in chunks]
+        shared_secrets = []
+        for future in futures:
+            keys = future.result()
+            shared_secrets.extend([keys[i:i + 32] for i in range(0, len(keys), 32)])
+        return shared_secrets
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
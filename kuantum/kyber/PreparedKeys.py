@@ -0,0 +1,56 @@
+from kuantum.kyber.utils.poly_vect import PolyVec, PolyMatrix
+
+
+class PreparedKey:
+    """
+    Base of the prepared key types: attributes are set once in __init__
+    through set_fields and cannot be changed afterwards
+    """
+    __slots__ = ()
+
+    def set_fields(self, **fields):
+        for name, value in fields.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('%s is immutable' % type(self).__name__)
+
+    def __delattr__(self, name):
+        raise AttributeError('%s is immutable' % type(self).__name__)
+
+    def __repr__(self):
+        return '%s(level=%r)' % (type(self).__name__, self.level)
+
+
+class PreparedPublicKey(PreparedKey):
+    """
+    Public key with all key-dependent encryption work done once:
+    decoded vector t (NTT domain), public seed, H(pk) and the expanded
+    transpose of matrix A. Create with Kyber.prepare_public_key and pass
+    it to Kyber.encrypt in place of the raw key.
+
+    Instances are immutable, and so are their polynomial buffers.
+    """
+    __slots__ = ('level', 'public_key', 't', 'seed', 'h_pk', 'at')
+
+    def __init__(self, level: str, public_key: bytes, t: PolyVec, seed: bytes, h_pk: bytes, at: PolyMatrix):
+        t.coeffs.setflags(write=False)
+        at.coeffs.setflags(write=False)
+        self.set_fields(level=level, public_key=bytes(public_key), t=t, seed=bytes(seed), h_pk=bytes(h_pk), at=at)
+
+
+class PreparedSecretKey(PreparedKey):
+    """
+    Secret key with all key-dependent decryption work done once:
+    decoded vector s (NTT domain), the embedded public key prepared for
+    the re-encryption check (including A^T), H(pk) and the rejection
+    value z. Create with Kyber.prepare_secret_key and pass it to
+    Kyber.decrypt in place of the raw key.
+
+    Instances are immutable, and so are their polynomial buffers.
+    """
+    __slots__ = ('level', 's', 'public_key', 'h', 'z')
+
+    def __init__(self, level: str, s: PolyVec, public_key: PreparedPublicKey, h: bytes, z: bytes):
+        s.coeffs.setflags(write=False)
+        self.set_fields(level=level, s=s, public_key=public_key, h=bytes(h), z=bytes(z))
@@ -1,5 +1,5 @@
 from kuantum.kyber.utils.num_type import int16, int32, uint32
-from kuantum.kyber.utils.constants import PARAMS_N, PARAMS_ETA_1, PARAMS_ETA_2, POLY_BYTES
+from kuantum.kyber.utils.constants import PARAMS_N, PARAMS_ETA_1, PARAMS_ETA_2
 
 
 def load24_bit(x):
@@ -39,7 +39,7 @@ def gen_cbd_pol(buff, k):
 
     return: array with coefficients
     """
-    r = [0 for _ in range(0, POLY_BYTES)]
+    r = [0 for _ in range(0, PARAMS_N)]
     if k == 2:
         for i in range(0, PARAMS_N // 4):
             t = load24_bit(buff[3 * i:])
@@ -0,0 +1,148 @@
+from kuantum.kyber.utils.constants import PARAMS_N, PARAMS_Q, POLY_BYTES
+from kuantum.kyber.utils.num_type import uint8_view, int16_array
+from kuantum.kyber.utils.reduce import csubq_array
+from kuantum.kyber.utils.compression import COMPRESS_BITS, COMPRESS_TABLES, DECOMPRESS_TABLES
+import numpy as np
+
+__all__ = [
+    "poly_to_bytes_array",
+    "poly_from_bytes_array",
+    "polyvec_to_bytes_array",
+    "polyvec_from_bytes_array",
+    "pack_bits_array",
+    "unpack_bits_array",
+    "compress_array",
+    "decompress_array",
+]
+
+# bit weights 1, 2, 4, ... used to split d-bit values into bits and back
+BIT_WEIGHTS = {d: (1 << np.arange(d, dtype=np.int32)) for d in COMPRESS_BITS}
+
+# array copies of the compression lookup tables
+COMPRESS_TABLE_ARRAYS = {d: np.array(COMPRESS_TABLES[d], dtype=np.int32) for d in COMPRESS_BITS}
+DECOMPRESS_TABLE_ARRAYS = {d: np.array(DECOMPRESS_TABLES[d], dtype=np.int16) for d in COMPRESS_BITS}
+
+
+def poly_to_bytes_array(a):
+    """
+    Serialize polynomials to 12-bit packed bytes after the conditional
+    subtraction of q, two coefficients per three bytes. Works on any
+    number of leading dimensions, so a whole batch of keys is packed in
+    one call. Byte-exact with the scalar poly_to_bytes for every int16
+    input.
+
+    arg0: int16 array of shape (..., 256)
+    return: uint8 array of shape (..., 384)
+    """
+    t = csubq_array(a).view(np.uint16)
+    t = t.reshape(t.shape[:-1] + (PARAMS_N // 2, 2))
+    t0 = t[..., 0]
+    t1 = t[..., 1]
+    out = np.empty(t.shape[:-2] + (POLY_BYTES,), dtype=np.uint8)
+    r = out.reshape(t.shape[:-1] + (3,))
+    r[..., 0] = t0
+    r[..., 1] = (t0 >> 8) | (t1 << 4)
+    r[..., 2] = t1 >> 4
+    return out
+
+
+def poly_from_bytes_array(b):
+    """
+    Deserialize 12-bit packed polynomials; inverse of poly_to_bytes_array
+    for coefficients in [0, q)
+
+    arg0: byte buffer or array of shape (..., 384)
+    return: int16 array of shape (..., 256)
+    """
+    b = uint8_view(b)
+    if b.shape[-1] != POLY_BYTES:
+        raise ValueError('packed polynomials must be %d bytes, got %d' % (POLY_BYTES, b.shape[-1]))
+    b = b.reshape(b.shape[:-1] + (PARAMS_N // 2, 3)).astype(np.int16)
+    out = np.empty(b.shape[:-2] + (PARAMS_N,), dtype=np.int16)
+    r = out.reshape(b.shape[:-1] + (2,))
+    r[..., 0] = b[..., 0] | ((b[..., 1] & 0xF) << 8)
+    r[..., 1] = (b[..., 1] >> 4) | (b[..., 2] << 4)
+    return out
+
+
+def polyvec_to_bytes_array(a):
+    """
+    Serialize vectors of polynomials, see poly_to_bytes_array
+
+    arg0: int16 array of shape (..., k, 256)
+    return: uint8 array of shape (..., k * 384)
+    """
+    r = poly_to_bytes_array(a)
+    return r.reshape(r.shape[:-2] + (-1,))
+
+
+def polyvec_from_bytes_array(b, k):
+    """
+    Deserialize vectors of k polynomials, e.g. the first k * 384 bytes of
+    each row of a (n, public key bytes) keystore array
+
+    arg0: byte buffer or array of shape (..., k * 384)
+    arg1: number of polynomials per vector
+    return: int16 array of shape (..., k, 256)
+    """
+    b = uint8_view(b)
+    if b.shape[-1] != k * POLY_BYTES:
+        raise ValueError('packed vectors of %d polynomials must be %d bytes, got %d'
+                         % (k, k * POLY_BYTES, b.shape[-1]))
+    return poly_from_bytes_array(b.reshape(b.shape[:-1] + (k, POLY_BYTES)))
+
+
+def pack_bits_array(t, d):
+    """
+    Pack d-bit values into a little-endian bit stream, value i taking
+    bits [d * i, d * (i + 1)): the byte layout of every Kyber encoding
+    (messages d=1, v d=4/5, u d=10/11)
+
+    arg0: integer array of shape (..., 256) with values below 2^d
+    arg1: bits per value
+    return: uint8 array of shape (..., 32 * d)
+    """
+    bits = (np.asarray(t, dtype=np.int32)[..., None] & BIT_WEIGHTS[d]) != 0
+    return np.packbits(bits.reshape(bits.shape[:-2] + (-1,)), axis=-1, bitorder='little')
+
+
+def unpack_bits_array(b, d):
+    """
+    Inverse of pack_bits_array
+
+    arg0: byte buffer or array of shape (..., 32 * d)
+    arg1: bits per value
+    return: int32 array of shape (..., 256)
+    """
+    b = uint8_view(b)
+    if b.shape[-1] != PARAMS_N * d // 8:
+        raise ValueError('%d-bit packed polynomials must be %d bytes, got %d' % (d, PARAMS_N * d // 8, b.shape[-1]))
+    bits = np.unpackbits(b, axis=-1, bitorder='little').reshape(b.shape[:-1] + (PARAMS_N, d))
+    return bits.dot(BIT_WEIGHTS[d]).astype(np.int32)
+
+
+def compress_array(a, d):
+    """
+    Compress coefficients to d bits, round(2^d / q * x) mod 2^d, and
+    pack them. Compression is a lookup in COMPRESS_TABLES, indexed by
+    x mod q, so any int16 coefficient is accepted, unreduced and
+    negative ones included, and gives the same result as its
+    representative in [0, q).
+
+    arg0: int16 array of shape (..., 256)
+    arg1: bits per coefficient: 1 (message), 4, 5, 10 or 11
+    return: uint8 array of shape (..., 32 * d)
+    """
+    return pack_bits_array(COMPRESS_TABLE_ARRAYS[d][np.mod(int16_array(a), np.int16(PARAMS_Q))], d)
+
+
+def decompress_array(b, d):
+    """
+    Unpack d-bit values and decompress them to round(q / 2^d * t);
+    approximate inverse of compress_array
+
+    arg0: byte buffer or array of shape (..., 32 * d)
+    arg1: bits per coefficient: 1 (message), 4, 5, 10 or 11
+    return: int16 array of shape (..., 256)
+    """
+    return DECOMPRESS_TABLE_ARRAYS[d][unpack_bits_array(b, d)]
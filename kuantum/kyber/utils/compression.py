@@ -0,0 +1,68 @@
+from kuantum.kyber.utils.constants import PARAMS_Q
+
+# Lossy coefficient compression Compress_d(x) = round(2^d / q * x) mod 2^d
+# and Decompress_d(t) = round(q / 2^d * t), without divisions and without
+# NumPy. Decompression has at most 2^11 distinct inputs, compression q, so
+# both are plain lookup tables built once at import.
+
+# bits per coefficient used by Kyber: messages, v (4/5) and u (10/11)
+COMPRESS_BITS = (1, 4, 5, 10, 11)
+
+# floor(n / q) == (n * COMPRESS_MUL) >> COMPRESS_SHIFT for every
+# n = (x << d) + q // 2 with x in [0, q) and d in COMPRESS_BITS; the
+# tests check this exhaustively against integer division
+COMPRESS_MUL = 161271
+COMPRESS_SHIFT = 29
+
+
+def compress_coefficient(x: int, d: int) -> int:
+    """
+    Compress one coefficient with a multiply-and-shift reciprocal of q
+
+    arg0: coefficient in [0, q)
+    arg1: bits per coefficient
+    return: d-bit integer
+    """
+    return ((((x << d) + PARAMS_Q // 2) * COMPRESS_MUL) >> COMPRESS_SHIFT) & ((1 << d) - 1)
+
+
+def decompress_coefficient(t: int, d: int) -> int:
+    """
+    Decompress one d-bit value; approximate inverse of compress_coefficient
+
+    arg0: d-bit integer
+    arg1: bits per coefficient
+    return: coefficient in [0, q)
+    """
+    return (t * PARAMS_Q + (1 << (d - 1))) >> d
+
+
+# COMPRESS_TABLES[d][x] == compress_coefficient(x, d) for x in [0, q)
+COMPRESS_TABLES = {d: [compress_coefficient(x, d) for x in range(PARAMS_Q)] for d in COMPRESS_BITS}
+
+# DECOMPRESS_TABLES[d][t] == decompress_coefficient(t, d) for t in [0, 2^d)
+DECOMPRESS_TABLES = {d: [decompress_coefficient(t, d) for t in range(1 << d)] for d in COMPRESS_BITS}
+
+
+def compress_list(coeffs, d):
+    """
+    Compress a sequence of coefficients in [0, q) by table lookup
+
+    arg0: coefficients
+    arg1: bits per coefficient
+    return: list of d-bit integers
+    """
+    table = COMPRESS_TABLES[d]
+    return [table[x] for x in coeffs]
+
+
+def decompress_list(values, d):
+    """
+    Decompress a sequence of d-bit values by table lookup
+
+    arg0: d-bit integers
+    arg1: bits per coefficient
+    return: list of coefficients
+    """
+    table = DECOMPRESS_TABLES[d]
+    return [table[t] for t in values]
@@ -45,3 +45,10 @@ PARAMS_ETA_1 = 3
 PARAMS_ETA_2 = 2
 
 PARAMS_SYSTEM_BYTES = 32
+
+# SHAKE-128 rate, the number of bytes squeezed per block
+XOF_BLOCK_BYTES = 168
+
+# blocks squeezed up front when sampling a uniform polynomial; enough
+# for 256 coefficients with overwhelming probability
+GEN_MATRIX_NBLOCKS = 3
@@ -0,0 +1,102 @@
+from collections import OrderedDict
+from threading import Lock
+
+
+class MatrixCache:
+    """
+    LRU cache of expanded public matrices, keyed by the 32-byte public seed,
+    the transposed flag and the dimension k, so one cache can be shared by
+    instances of different levels. Entries are evicted least recently used
+    first once either max_entries or max_bytes (if given) is exceeded.
+
+    Cached matrices are made read-only, so an in-place polynomial operation
+    on them raises instead of corrupting later lookups.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=None):
+        if max_entries < 1:
+            raise ValueError('max_entries must be at least 1')
+        if max_bytes is not None and max_bytes < 0:
+            raise ValueError('max_bytes must not be negative')
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.entries = OrderedDict()
+        self.lock = Lock()
+
+    @staticmethod
+    def key(seed, transposed, k):
+        return bytes([x & 0xff for x in seed]), bool(transposed), int(k)
+
+    def get(self, seed, transposed, k):
+        """
+        Return the cached k x k matrix for (seed, transposed), or None
+
+        arg0: public seed
+        arg1: boolean deciding whether A or A^T is looked up
+        arg2: dimension k of the matrix (2, 3 or 4)
+        """
+        key = self.key(seed, transposed, k)
+        with self.lock:
+            matrix = self.entries.get(key)
+            if matrix is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return matrix
+
+    def put(self, seed, transposed, matrix):
+        """
+        Freeze matrix and store it under (seed, transposed) and its
+        dimension
+
+        arg0: public seed
+        arg1: boolean deciding whether matrix is A or A^T
+        arg2: PolyMatrix
+        """
+        matrix.coeffs.setflags(write=False)
+        key = self.key(seed, transposed, matrix.coeffs.shape[0])
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.nbytes -= old.coeffs.nbytes
+            self.entries[key] = matrix
+            self.nbytes += matrix.coeffs.nbytes
+            while self.entries and (len(self.entries) > self.max_entries or
+                                    (self.max_bytes is not None and self.nbytes > self.max_bytes)):
+                _, evicted = self.entries.popitem(last=False)
+                self.nbytes -= evicted.coeffs.nbytes
+                self.evictions += 1
+        return matrix
+
+    def get_or_create(self, seed, transposed, k, create):
+        """
+        Return the cached k x k matrix for (seed, transposed), expanding
+        and storing it with create(seed, transposed) on a miss
+        """
+        matrix = self.get(seed, transposed, k)
+        if matrix is None:
+            matrix = self.put(seed, transposed, create(seed, transposed))
+        return matrix
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        with self.lock:
+            return {
+                'entries': len(self.entries),
+                'bytes': self.nbytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+    def __len__(self):
+        return len(self.entries)
@@ -0,0 +1,199 @@
+from bisect import bisect_left
+from functools import wraps
+from threading import Lock
+from time import perf_counter
+import os
+
+# upper bounds in seconds of the latency buckets: 10 us doubling up to
+# about 5 s, plus the implicit +Inf bucket
+LATENCY_BUCKETS = tuple(1e-5 * 2 ** i for i in range(20))
+
+PREFIX = 'kuantum_kyber_'
+
+
+class MetricsRegistry:
+    """
+    Operation metrics of one or more Kyber instances: a log-bucketed
+    latency histogram per (operation, level) and counters of completed
+    operations, failed operations (errors) and implicit rejections
+    (decryptions whose re-encryption did not match the ciphertext).
+
+    Each update takes one uncontended lock for a few list / dict
+    increments. render() gives the Prometheus text exposition format,
+    export() writes it to a file or hands it to a callback.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        """
+        arg0: increasing upper bounds of the latency buckets, in seconds
+        """
+        if list(buckets) != sorted(set(buckets)) or not buckets:
+            raise ValueError('buckets must be strictly increasing')
+        self.buckets = tuple(buckets)
+        self.lock = Lock()
+        self.histograms = {}
+        self.operations = {}
+        self.errors = {}
+        self.implicit_rejections = {}
+
+    def observe(self, operation, level, seconds):
+        """
+        Record one completed operation and its latency
+
+        arg0: operation name, e.g. 'decrypt'
+        arg1: level, e.g. 'kyber768'
+        arg2: latency in seconds
+        """
+        key = (operation, level)
+        i = bisect_left(self.buckets, seconds)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            histogram[0][i] += 1
+            histogram[1] += seconds
+            self.operations[key] = self.operations.get(key, 0) + 1
+
+    def error(self, operation, level):
+        """
+        Record one operation that raised
+        """
+        key = (operation, level)
+        with self.lock:
+            self.errors[key] = self.errors.get(key, 0) + 1
+
+    def implicit_rejection(self, level, n=1):
+        """
+        Record n decryptions that returned the implicit rejection key
+        """
+        with self.lock:
+            self.implicit_rejections[level] = self.implicit_rejections.get(level, 0) + n
+
+    def quantile(self, operation, level, q):
+        """
+        Estimate a latency quantile from the histogram, interpolating
+        linearly inside the bucket it falls in (as Prometheus'
+        histogram_quantile does)
+
+        arg0: operation name
+        arg1: level
+        arg2: quantile in [0, 1], e.g. 0.99
+        return: seconds, or None without observations
+        """
+        with self.lock:
+            histogram = self.histograms.get((operation, level))
+            counts = list(histogram[0]) if histogram is not None else None
+        if not counts or sum(counts) == 0:
+            return None
+        rank = q * sum(counts)
+        seen = 0
+        for i, n in enumerate(counts):
+            if n and seen + n >= rank:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - seen) / n
+            seen += n
+        return self.buckets[-1]
+
+    def snapshot(self):
+        """
+        return: plain dict copy of all metrics; histogram counts are per
+                bucket (not cumulative), the last one being +Inf
+        """
+        with self.lock:
+            return {
+                'buckets': list(self.buckets),
+                'histograms': {'%s/%s' % key: {'counts': list(h[0]), 'sum': h[1]}
+                               for key, h in self.histograms.items()},
+                'operations': {'%s/%s' % key: n for key, n in self.operations.items()},
+                'errors': {'%s/%s' % key: n for key, n in self.errors.items()},
+                'implicit_rejections': dict(self.implicit_rejections),
+            }
+
+    def reset(self):
+        with self.lock:
+            self.histograms.clear()
+            self.operations.clear()
+            self.errors.clear()
+            self.implicit_rejections.clear()
+
+    def render(self):
+        """
+        return: all metrics in the Prometheus text exposition format
+        """
+        with self.lock:
+            histograms = sorted((key, list(h[0]), h[1]) for key, h in self.histograms.items())
+            operations = sorted(self.operations.items())
+            errors = sorted(self.errors.items())
+            implicit_rejections = sorted(self.implicit_rejections.items())
+
+        name = PREFIX + 'operation_seconds'
+        lines = ['# HELP %s Latency of completed Kyber operations.' % name,
+                 '# TYPE %s histogram' % name]
+        for (operation, level), counts, total in histograms:
+            labels = 'operation="%s",level="%s"' % (operation, level)
+            cumulative = 0
+            for bound, n in zip(self.buckets + (None,), counts):
+                cumulative += n
+                le = '+Inf' if bound is None else repr(bound)
+                lines.append('%s_bucket{%s,le="%s"} %d' % (name, labels, le, cumulative))
+            lines.append('%s_sum{%s} %r' % (name, labels, total))
+            lines.append('%s_count{%s} %d' % (name, labels, cumulative))
+
+        for metric, help_text, values in (
+                ('operations_total', 'Completed Kyber operations.', operations),
+                ('errors_total', 'Kyber operations that raised an exception.', errors)):
+            lines.append('# HELP %s%s %s' % (PREFIX, metric, help_text))
+            lines.append('# TYPE %s%s counter' % (PREFIX, metric))
+            for (operation, level), n in values:
+                lines.append('%s%s{operation="%s",level="%s"} %d' % (PREFIX, metric, operation, level, n))
+
+        lines.append('# HELP %simplicit_rejections_total Decryptions answered with the implicit rejection key.'
+                     % PREFIX)
+        lines.append('# TYPE %simplicit_rejections_total counter' % PREFIX)
+        for level, n in implicit_rejections:
+            lines.append('%simplicit_rejections_total{level="%s"} %d' % (PREFIX, level, n))
+        return '\n'.join(lines) + '\n'
+
+    def export(self, target):
+        """
+        Export render() to target: a callable is called with the text,
+        anything else is taken as a file path and replaced atomically
+        (written to a temporary file first), as expected by the node
+        exporter's textfile collector
+
+        arg0: file path or callable
+        """
+        text = self.render()
+        if callable(target):
+            target(text)
+            return
+        tmp = '%s.%d.tmp' % (target, os.getpid())
+        with open(tmp, 'w') as f:
+            f.write(text)
+        os.replace(tmp, target)
+
+
+def measured(name):
+    """
+    Decorator recording a Kyber method as operation name in the
+    instance's metrics registry (self.metrics), if it has one: the
+    latency of each completed call, or an error if it raised
+    """
+    def decorate(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            metrics = self.metrics
+            if metrics is None:
+                return method(self, *args, **kwargs)
+            start = perf_counter()
+            try:
+                result = method(self, *args, **kwargs)
+            except Exception:
+                metrics.error(name, self.type)
+                raise
+            metrics.observe(name, self.type, perf_counter() - start)
+            return result
+        return wrapper
+    return decorate
@@ -1,9 +1,29 @@
 from kuantum.kyber.utils.num_type import  int16, int32
 from kuantum.kyber.utils.reduce import montgomery_reduce, barrett_reduce
-from kuantum.kyber.utils.constants import NTT_ZETAS, NTT_ZETAS_INV
+from kuantum.kyber.utils.constants import NTT_ZETAS, NTT_ZETAS_INV, PARAMS_N, PARAMS_Q, PARAMS_Q_INV
 import numpy as np
 
 
+# twiddles of the array engine, as (zeta, zeta * q^-1 mod 2^16) column vectors;
+# the layer with half-length l has 128 / l groups sharing one zeta each
+def layer_twiddles(zetas):
+    z = np.array(zetas, dtype=np.int32).reshape(-1, 1)
+    return z, (z * PARAMS_Q_INV).astype(np.int16)
+
+
+NTT_LAYERS = [(l,) + layer_twiddles(NTT_ZETAS[128 // l: 256 // l]) for l in (128, 64, 32, 16, 8, 4, 2)]
+INV_NTT_LAYERS = [(l,) + layer_twiddles(NTT_ZETAS_INV[128 - 256 // l: 128 - 128 // l]) for l in (2, 4, 8, 16, 32, 64, 128)]
+INV_NTT_FACTOR = tuple(x.reshape(-1) for x in layer_twiddles(NTT_ZETAS_INV[127:]))
+
+Q_INT16 = np.array([PARAMS_Q], dtype=np.int16)
+Q_INT32 = np.array([PARAMS_Q], dtype=np.int32)
+BARRETT_V = np.array([((1 << 26) + PARAMS_Q // 2) // PARAMS_Q], dtype=np.int32)
+Q_INV_INT32 = np.array([PARAMS_Q_INV], dtype=np.int32)
+
+# zeta (first pair) and -zeta (second pair) of every group of 4 coefficients
+BASEMUL_ZETAS = np.array([[z, -z] for z in NTT_ZETAS[64:]], dtype=np.int32)
+
+
 def ntt(r):
     """
     Inplace number-theoretic transform (NTT) in Rq.
@@ -65,6 +85,85 @@ def inv_ntt(r):
     return r
 
 
+def as_coefficient_stack(r):
+    """
+    Copy polynomial coefficients into a C-contiguous int16 array,
+    checking that the last axis holds exactly PARAMS_N coefficients
+
+    arg0: list or ndarray of shape (..., 256)
+    return: int16 ndarray
+    """
+    r = np.array(r, dtype=np.int16, order='C')
+    if r.ndim == 0 or r.shape[-1] != PARAMS_N:
+        raise ValueError('Polynomial must have exactly %d coefficients' % PARAMS_N)
+    return r
+
+
+def fqmul_array(a, zeta, zeta_qinv):
+    """
+    Montgomery multiplication of an int16 array by twiddles,
+    montgomery_reduce(zeta * a) element-wise
+
+    arg0: int16 array
+    arg1: int32 twiddles
+    arg2: int16 twiddles multiplied by q^-1
+    return: int32 array
+    """
+    t = a * zeta
+    t -= (a * zeta_qinv) * Q_INT32
+    t >>= 16
+    return t
+
+
+def ntt_array(r):
+    """
+    Array version of ntt, every layer is computed as one whole-array
+    butterfly. Output is bit-identical to ntt.
+
+    Accepts a single polynomial of shape (256,) or a stack of shape
+    (m, 256) (any number of leading axes); every row is transformed in
+    the same pass, so interpreter overhead is paid per layer, not per
+    polynomial.
+
+    arg0: 16-bit integers (list or ndarray) of shape (..., 256), left unmodified
+    return: bit-inverse int16 ndarray of the same shape
+    """
+    r = as_coefficient_stack(r)
+    for l, zeta, zeta_qinv in NTT_LAYERS:
+        v = r.reshape(r.shape[:-1] + (-1, 2, l))
+        lo = v[..., 0, :]
+        hi = v[..., 1, :]
+        t = fqmul_array(hi, zeta, zeta_qinv)
+        hi[...] = lo - t
+        lo[...] = lo + t
+    return r
+
+
+def inv_ntt_array(r):
+    """
+    Array version of inv_ntt, including the multiplication by the
+    Montgomery factor 2^16. Output is bit-identical to inv_ntt.
+    Like ntt_array, a (m, 256) stack is transformed row-wise in one pass.
+
+    arg0: bit-inverse 16-bit integers (list or ndarray) of shape (..., 256), left unmodified
+    return: standard order int16 ndarray of the same shape
+    """
+    r = as_coefficient_stack(r)
+    for l, zeta, zeta_qinv in INV_NTT_LAYERS:
+        v = r.reshape(r.shape[:-1] + (-1, 2, l))
+        lo = v[..., 0, :]
+        hi = v[..., 1, :]
+        d = lo - hi
+        s = lo + hi
+        # barrett reduction of the int16 sums
+        t = s * BARRETT_V
+        t >>= 26
+        lo[...] = s - t.astype(np.int16) * Q_INT16
+        hi[...] = fqmul_array(d, zeta, zeta_qinv)
+    r[...] = fqmul_array(r, *INV_NTT_FACTOR)
+    return r
+
+
 def base_multiplier(a0, a1, b0, b1, zeta):
     """
     Multiplication of polynomials in Zq[X]/(X^2-zeta)
@@ -82,3 +181,41 @@ def base_multiplier(a0, a1, b0, b1, zeta):
     r[1] = montgomery_reduce(a0 * b1)
     r[1] = int16(r[1] + montgomery_reduce(a1 * b0))
     return r
+
+
+def montgomery_reduce_int32(a):
+    """
+    montgomery_reduce of an int32 array of products of two int16 values
+
+    arg0: int32 array
+    return: int32 array
+    """
+    u = (a * Q_INV_INT32).astype(np.int16)
+    a = a - u * Q_INT32
+    a >>= 16
+    return a
+
+
+def basemul_array(a, b):
+    """
+    Array version of poly_base_mul: base_multiplier applied to every
+    pair of coefficients, bit-identical to the scalar version.
+    Shapes (..., 256) broadcast against each other, so a whole matrix
+    can be multiplied by a vector in one call.
+
+    arg0: first factor(s) in NTT domain
+    arg1: second factor(s) in NTT domain
+    return: int16 ndarray of shape (..., 256)
+    """
+    a = np.asarray(a).astype(np.int32)
+    b = np.asarray(b).astype(np.int32)
+    shape = np.broadcast_shapes(a.shape, b.shape)
+    a = a.reshape(a.shape[:-1] + (-1, 2, 2))
+    b = b.reshape(b.shape[:-1] + (-1, 2, 2))
+    a0, a1 = a[..., 0], a[..., 1]
+    b0, b1 = b[..., 0], b[..., 1]
+    r = np.empty(shape[:-1] + (PARAMS_N // 4, 2, 2), dtype=np.int16)
+    r[..., 0] = montgomery_reduce_int32(montgomery_reduce_int32(a1 * b1) * BASEMUL_ZETAS) \
+        + montgomery_reduce_int32(a0 * b0)
+    r[..., 1] = montgomery_reduce_int32(a0 * b1) + montgomery_reduce_int32(a1 * b0)
+    return r.reshape(shape)
@@ -40,3 +40,46 @@ def uint16(x):
 # Convert a number to a unsigned 32-bit representation
 def uint32(x):
     return np.uint32(x)
+
+
+# Array counterparts of the helpers above; each takes a list or ndarray of
+# integers and wraps every element exactly like the scalar version would
+def byte_array(x):
+    return np.asarray(x).astype(np.int8)
+
+
+def int16_array(x):
+    return np.asarray(x).astype(np.int16)
+
+
+def int32_array(x):
+    return np.asarray(x).astype(np.int32)
+
+
+def long64_array(x):
+    return np.asarray(x).astype(np.int64)
+
+
+# View a byte string as a flat memoryview of unsigned bytes. Buffer-protocol
+# objects (bytes, bytearray, memoryview, int8/uint8 ndarray) are not copied;
+# lists and tuples of signed or unsigned byte values are converted
+def byte_view(x):
+    if isinstance(x, (list, tuple)):
+        return memoryview(bytes([b & 0xff for b in x]))
+    view = memoryview(x)
+    if view.itemsize != 1:
+        raise TypeError('expected a byte buffer, got %d-byte items' % view.itemsize)
+    return view.cast('B')
+
+
+# View a byte buffer (bytes-like object, uint8 ndarray or list of signed or
+# unsigned byte values) as a uint8 array; a list of equally long bytes-like
+# buffers gives a 2-D array with one row per buffer
+def uint8_view(buf):
+    if isinstance(buf, (bytes, bytearray, memoryview)):
+        return np.frombuffer(buf, dtype=np.uint8)
+    if isinstance(buf, (list, tuple)) and len(buf) and isinstance(buf[0], (bytes, bytearray, memoryview)):
+        return np.stack([np.frombuffer(b, dtype=np.uint8) for b in buf])
+    if isinstance(buf, np.ndarray) and buf.dtype == np.uint8:
+        return buf
+    return byte_array(buf).view(np.uint8)
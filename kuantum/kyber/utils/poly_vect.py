@@ -1,8 +1,14 @@
 from kuantum.kyber.utils.constants import POLY_BYTES, PARAMS_N, PARAMS_Q
-from kuantum.kyber.utils.num_type import uint16, uint32, int16, byte, long64
-from kuantum.kyber.utils.poly import poly_barret_reduce, poly_from_bytes, poly_conditional_sub_q, poly_add, \
+from kuantum.kyber.utils.num_type import uint16, uint32, int16, byte, long64, int16_array, uint8_view, byte_view
+from kuantum.kyber.utils.poly import Poly, poly_barret_reduce, poly_from_bytes, poly_conditional_sub_q, poly_add, \
     poly_base_mul
-from kuantum.kyber.utils.ntt import inv_ntt, ntt
+from kuantum.kyber.utils.reduce import barrett_reduce_array
+from kuantum.kyber.utils.ntt import ntt_array, inv_ntt_array, basemul_array
+from kuantum.kyber.utils.sampling import cbd_array
+from kuantum.kyber.utils.trace import count
+from kuantum.kyber.utils.codec import polyvec_to_bytes_array, polyvec_from_bytes_array, compress_array, \
+    decompress_array
+from Crypto.Hash import SHAKE256
 from typing import List
 import numpy as np
 
@@ -11,138 +17,246 @@ POLYVEC_COMPRESSED_BYTES_768 = 960
 POLYVEC_COMPRESSED_BYTES_1024 = 1408
 
 
+def wrap_coeffs(a):
+    """
+    Wrap an int16 coefficient array without copying it: (256,) as a Poly,
+    (k, 256) as a PolyVec and (k, k, 256) as a PolyMatrix
+
+    arg0: int16 ndarray
+    """
+    if a.ndim == 1:
+        return Poly(a)
+    if a.ndim == 2:
+        return PolyVec(a)
+    return PolyMatrix(a)
+
+
+class PolyVec:
+    """
+    Vector of k polynomials stored in one contiguous (k, 256) int16 buffer.
+    Indexing returns views: an int gives a Poly, a slice gives a PolyVec.
+
+    Lists of polynomials and other arrays are copied; an int16 ndarray
+    is wrapped as is.
+    """
+    __slots__ = ('coeffs',)
+    ndim = 2
+
+    def __init__(self, coeffs):
+        if not (isinstance(coeffs, np.ndarray) and coeffs.dtype == np.int16):
+            coeffs = int16_array([np.asarray(p) for p in coeffs])
+        if coeffs.ndim != self.ndim or coeffs.shape[-1] != PARAMS_N:
+            raise ValueError('%s cannot hold coefficients of shape %s' % (type(self).__name__, coeffs.shape))
+        self.coeffs = coeffs
+
+    @classmethod
+    def zeros(cls, k):
+        return cls(np.zeros((k,) * (cls.ndim - 1) + (PARAMS_N,), dtype=np.int16))
+
+    @property
+    def k(self):
+        return self.coeffs.shape[0]
+
+    def __len__(self):
+        return self.coeffs.shape[0]
+
+    def __getitem__(self, i):
+        return wrap_coeffs(self.coeffs[i])
+
+    def __setitem__(self, i, value):
+        self.coeffs[i] = int16_array(value)
+
+    def __iter__(self):
+        return (wrap_coeffs(row) for row in self.coeffs)
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None:
+            return self.coeffs
+        return self.coeffs.astype(dtype)
+
+    def __buffer__(self, flags):
+        return memoryview(self.coeffs)
+
+    def __eq__(self, other):
+        other = np.asarray(other)
+        return other.shape == self.coeffs.shape and bool(np.array_equal(self.coeffs, other))
+
+    __hash__ = None
+
+    def __repr__(self):
+        return '%s(%s)' % (type(self).__name__, self.coeffs.tolist())
+
+    def tolist(self):
+        return self.coeffs.tolist()
+
+    def copy(self):
+        return type(self)(self.coeffs.copy())
+
+
+class PolyMatrix(PolyVec):
+    """
+    Matrix of polynomials, k x k for the public matrix A, stored in one
+    contiguous (k, k, 256) int16 buffer. m[i] is a PolyVec view of row i,
+    m[i, j] a Poly view.
+    """
+    __slots__ = ()
+    ndim = 3
+
+    def __init__(self, coeffs):
+        if not (isinstance(coeffs, np.ndarray) and coeffs.dtype == np.int16):
+            coeffs = int16_array([[np.asarray(p) for p in row] for row in coeffs])
+        super().__init__(coeffs)
+
+
+def as_polyvec(a):
+    """
+    Return a as a PolyVec, converting lists of polynomials and arrays
+
+    arg0: polynomial vector
+    """
+    if isinstance(a, PolyVec):
+        return a
+    return PolyVec(a)
+
+
 def polyvec_from_bytes(a, k):
-    r = [[0 for _ in range(0, POLY_BYTES)] for _ in range(0, k)]
-    for i in range(k):
-        start = i * POLY_BYTES
-        end = (i + 1) * POLY_BYTES
-        r[i] = poly_from_bytes(a[start:end])
-    return r
+    return PolyVec(polyvec_from_bytes_array(uint8_view(a)[:k * POLY_BYTES], k))
 
 
 def polyvec_to_bytes(a):
-    pass
+    """
+    Serialize every polynomial of a vector, 384 bytes each
 
+    arg0: polynomial vector
+    return: list of signed bytes
+    """
+    return polyvec_to_bytes_array(np.asarray(a)).view(np.int8).tolist()
 
-def polyvec_compress(a, k):
-    rr = 0
-    if k == 2:
-        r = [0 for _ in range(POLYVEC_COMPRESSED_BYTES_512)]
-    elif k == 3:
-        r = [0 for _ in range(POLYVEC_COMPRESSED_BYTES_768)]
-    else:
-        r = [0 for _ in range(POLYVEC_COMPRESSED_BYTES_1024)]
 
+def polyvec_compress_bits(k):
+    """
+    Bits per coefficient of the compressed vector u: 10 for Kyber 512
+    and Kyber 768, 11 for Kyber 1024
+
+    arg0: value of PARAM_K
+    """
     if k == 2 or k == 3:
-        t = [0 for x in range(4)]
-        for i in range(k):
-            for j in range(PARAMS_N // 4):
-                for k in range(4):
-                    t[k] = uint16((((uint32(a[i][4 * j + k]) << 10) + uint32(PARAMS_Q // 2)) // uint32(PARAMS_Q)) & 0x3ff)
-                r[rr + 0] = byte(t[0] >> 0)
-                r[rr + 1] = byte((t[0] >> 8) | (t[1] << 2))
-                r[rr + 2] = byte((t[1] >> 6) | (t[2] << 4))
-                r[rr + 3] = byte((t[2] >> 4) | (t[3] << 6))
-                r[rr + 4] = byte((t[3] >> 2))
-                rr = rr + 5
-    else:
-        t = [0 for x in range(8)]
-        for i in range(k):
-            for j in range(PARAMS_N // 8):
-                for k in range(8):
-                    t[k] = uint16((((uint32(a[i][8 * j + k]) << 11) + uint32(PARAMS_Q / 2)) / uint32(PARAMS_Q)) & 0x7ff)
-                    r[rr + 0] = byte((t[0] >> 0))
-                    r[rr + 1] = byte((t[0] >> 8) | (t[1] << 3))
-                    r[rr + 2] = byte((t[1] >> 5) | (t[2] << 6))
-                    r[rr + 3] = byte((t[2] >> 2))
-                    r[rr + 4] = byte((t[2] >> 10) | (t[3] << 1))
-                    r[rr + 5] = byte((t[3] >> 7) | (t[4] << 4))
-                    r[rr + 6] = byte((t[4] >> 4) | (t[5] << 7))
-                    r[rr + 7] = byte((t[5] >> 1))
-                    r[rr + 8] = byte((t[5] >> 9) | (t[6] << 2))
-                    r[rr + 9] = byte((t[6] >> 6) | (t[7] << 5))
-                    r[rr + 10] = byte((t[7] >> 3))
-                    rr = rr + 11
-    return r
+        return 10
+    return 11
+
+
+def polyvec_compress(a, k):
+    a = int16_array(np.asarray(a))[:k, :PARAMS_N]
+    return compress_array(a, polyvec_compress_bits(k)).view(np.int8).reshape(-1).tolist()
 
 
 def polyvec_decompress(a, k):
-    r = [[0 for x in range(0, POLY_BYTES)] for y in range(0, k)]
-    aa = 0
-    t = []
-    if k == 2 or k == 3:
-        t = [0 for x in range(4)]
-        for i in range(k):
-            for j in range(PARAMS_N // 4):
-                t[0] = ((a[aa + 0] & 0xFF) >> 0) | ((a[aa + 1] & 0xFF) << 8)
-                t[1] = ((a[aa + 1] & 0xFF) >> 2) | ((a[aa + 2] & 0xFF) << 6)
-                t[2] = ((a[aa + 2] & 0xFF) >> 4) | ((a[aa + 3] & 0xFF) << 4)
-                t[3] = ((a[aa + 3] & 0xFF) >> 6) | ((a[aa + 4] & 0xFF) << 2)
-                aa = aa + 5
-                for k in range(4):
-                    r[i][4 * j + k] = int16 (( (t[k] & 0x3FF) *  (PARAMS_Q) + 512) >> 10)
-    else:
-        t = [0 for x in range(4)]
-        for i in range(k):
-            for j in range(PARAMS_N // 8):
-                t[0] = (((a[aa + 0] & 0xff) >> 0) | ((a[aa + 1] & 0xff) << 8))
-                t[1] = (((a[aa + 1] & 0xff) >> 3) | ((a[aa + 2] & 0xff) << 5))
-                t[2] = (((a[aa + 2] & 0xff) >> 6) | ((a[aa + 3] & 0xff) << 2) | ((a[aa + 4] & 0xff) << 10))
-                t[3] = (((a[aa + 4] & 0xff) >> 1) | ((a[aa + 5] & 0xff) << 7))
-                t[4] = (((a[aa + 5] & 0xff) >> 4) | ((a[aa + 6] & 0xff) << 4))
-                t[5] = (((a[aa + 6] & 0xff) >> 7) | ((a[aa + 7] & 0xff) << 1) | ((a[aa + 8] & 0xff) << 9))
-                t[6] = (((a[aa + 8] & 0xff) >> 2) | ((a[aa + 9] & 0xff) << 6))
-                t[7] = (((a[aa + 9] & 0xff) >> 5) | ((a[aa + 10] & 0xff) << 3))
-                aa = aa + 11
-                for k in range(8):
-                    r[i][8 * j + k] = int16((long64(t[k] & 0x7FF) * long64 (PARAMS_Q) + 1024) >> 11)
-    return r
+    d = polyvec_compress_bits(k)
+    b = uint8_view(a)[:k * PARAMS_N * d // 8].reshape(k, -1)
+    return PolyVec(decompress_array(b, d))
 
 
-def polyvec_pointwise_mul(a: List[int], b: List[int], k: int):
+def polyvec_pointwise_mul(a: PolyVec, b: PolyVec, k: int) -> Poly:
     """
     Point-wise multiplies elements of the given polynomial-vectors ,
     accumulates the results , and then multiplies by 2^-16
     """
-    r = poly_base_mul(a[0], b[0])
-    for i in range(1, k):
-        t = poly_base_mul(a[i], b[i])
-        r = poly_add(r, t)
-    return poly_barret_reduce(r)
+    r = basemul_array(np.asarray(a)[:k], np.asarray(b)[:k])
+    r = int16_array(r.sum(axis=0, dtype=np.int32))
+    return Poly(barrett_reduce_array(r))
+
+
+def polymatrix_pointwise_mul(a: PolyMatrix, b: PolyVec, k: int) -> PolyVec:
+    """
+    Matrix-vector product in NTT domain: entry i of the result is
+    polyvec_pointwise_mul(a[i], b, k), all rows computed in one pass
+    """
+    r = basemul_array(np.asarray(a)[:k, :k], np.asarray(b)[:k])
+    r = int16_array(r.sum(axis=1, dtype=np.int32))
+    return PolyVec(barrett_reduce_array(r))
 
 
 def polyvec_csubq(a, k):
+    a = as_polyvec(a)
     for i in range(k):
-        a[i] = poly_conditional_sub_q(a[i])
+        poly_conditional_sub_q(a[i])
     return a
 
 
 def polyvec_ntt(a, k):
-    for i in range(k):
-        a[i] = ntt(a[i])
+    a = as_polyvec(a)
+    a.coeffs[:k] = ntt_array(a.coeffs[:k])
     return a
 
 
 def polyvec_invntt(a, k):
-    for i in range(k):
-        a[i] = inv_ntt(a[i])
+    a = as_polyvec(a)
+    a.coeffs[:k] = inv_ntt_array(a.coeffs[:k])
     return a
 
 
 def polyvec_barret_reduce(r, k):
-    for i in range(k):
-        r[i] = poly_barret_reduce(r[i])
+    r = as_polyvec(r)
+    r.coeffs[:k] = barrett_reduce_array(r.coeffs[:k])
     return r
 
 
-def polyvec_add(a: List[List[int]], b: List[List[int]], k: int):
-    for i in range(k):
-        a[i] = poly_add(a[i], b[i])
-    return a
+def polyvec_add(a: PolyVec, b: PolyVec, k: int) -> PolyVec:
+    return PolyVec(np.asarray(a)[:k] + np.asarray(b)[:k])
+
+
+def sample_noise_vector(seed, nonces, eta, out=None) -> PolyVec:
+    """
+    Sample one CBD noise polynomial per nonce, polynomial i being
+    CBD_eta(SHAKE256(seed || nonces[i])). The seed is converted to bytes
+    once and all PRF outputs are decoded in a single cbd_array call.
+
+    arg0: 32-byte seed (bytes or list of signed/unsigned byte values)
+    arg1: sequence of nonces
+    arg2: eta, PARAMS_ETA_1 or PARAMS_ETA_2
+    arg3: optional int16 (len(nonces), 256) buffer to fill, e.g. a slice
+          of a larger block shared by a batch of operations
+    return: PolyVec of len(nonces) polynomials, backed by out if given
+    """
+    noise = sample_noise_batch([seed], nonces, eta)[0]
+    if out is None:
+        return PolyVec(noise)
+    out = as_polyvec(out)
+    out.coeffs[...] = noise
+    return out
+
+
+def sample_noise_batch(seeds, nonces, eta) -> np.ndarray:
+    """
+    sample_noise_vector for a batch of operations: the noise of every
+    (seed, nonce) pair is decoded in a single cbd_array call
+
+    arg0: sequence of 32-byte seeds
+    arg1: sequence of nonces, shared by all seeds
+    arg2: eta, PARAMS_ETA_1 or PARAMS_ETA_2
+    return: int16 array of shape (len(seeds), len(nonces), 256)
+    """
+    nbytes = PARAMS_N * eta // 4
+    nonces = [bytes([nonce]) for nonce in nonces]
+    count('prf_bytes', nbytes * len(nonces) * len(seeds))
+    buf = []
+    for seed in seeds:
+        seed = bytes(byte_view(seed))
+        buf += [SHAKE256.new(seed + nonce).read(nbytes) for nonce in nonces]
+    noise = cbd_array(np.frombuffer(b''.join(buf), dtype=np.uint8).reshape(-1, nbytes), eta)
+    return noise.reshape(len(seeds), len(nonces), PARAMS_N)
 
 
 __all__ = [
+    "PolyVec",
+    "PolyMatrix",
+    "as_polyvec",
+    "polymatrix_pointwise_mul",
+    "sample_noise_vector",
+    "sample_noise_batch",
     "polyvec_from_bytes",
+    "polyvec_to_bytes",
+    "polyvec_compress_bits",
     "polyvec_compress",
     "polyvec_decompress",
     "polyvec_pointwise_mul",
@@ -0,0 +1,207 @@
+from kuantum.kyber.utils.num_type import byte_view
+from kuantum.kyber.utils import trace
+import gc
+import os
+import sys
+import tracemalloc
+
+# source files allocations are attributed to: everything in kuantum.kyber
+KYBER_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# allocations of the profiler itself, left out of every report
+PROFILER_FILTERS = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+
+# stage_allocations also leaves out the records of the tracer it samples with
+SAMPLER_FILTERS = PROFILER_FILTERS + [tracemalloc.Filter(False, trace.__file__)]
+
+
+def kyber_lines(snapshot_diff, top):
+    """
+    Keep the source lines of kuantum.kyber from a lineno snapshot diff,
+    largest absolute size difference first
+
+    return: list of dicts with file (relative to kuantum/kyber), line,
+            size and count (net bytes and blocks still allocated)
+    """
+    lines = []
+    for stat in snapshot_diff:
+        frame = stat.traceback[0]
+        if not frame.filename.startswith(KYBER_ROOT) or stat.count_diff == 0:
+            continue
+        lines.append({
+            'file': os.path.relpath(frame.filename, KYBER_ROOT),
+            'line': frame.lineno,
+            'size': stat.size_diff,
+            'count': stat.count_diff,
+        })
+    lines.sort(key=lambda line: -abs(line['size']))
+    return lines[:top]
+
+
+class AllocationSampler:
+    """
+    Tracer sample hook taking a tracemalloc snapshot at every stage
+    boundary. Per source line, the blocks and bytes it gained between
+    two consecutive snapshots are added up as allocated by it.
+    """
+
+    def __init__(self):
+        self.snapshot = tracemalloc.take_snapshot().filter_traces(SAMPLER_FILTERS)
+        self.allocated = {}
+
+    def __call__(self):
+        snapshot = tracemalloc.take_snapshot().filter_traces(SAMPLER_FILTERS)
+        for stat in snapshot.compare_to(self.snapshot, 'lineno'):
+            if stat.count_diff > 0:
+                frame = stat.traceback[0]
+                entry = self.allocated.setdefault((frame.filename, frame.lineno), [0, 0])
+                entry[0] += max(stat.size_diff, 0)
+                entry[1] += stat.count_diff
+        self.snapshot = snapshot
+
+
+def stage_allocations(fn, *args, top=10, **kwargs):
+    """
+    Run fn(*args, **kwargs) once under tracemalloc and count its
+    allocations per source line, sampling at every stage boundary of the
+    Kyber / IDCPA operations it runs (see trace.Tracer) and once at the
+    end. A block counts as allocated when it is alive at the sample after
+    its allocation, so temporaries that outlive a stage are counted even
+    if they are freed before fn returns. Objects created and freed
+    between two boundaries are not seen, which makes the figures a lower
+    bound.
+
+    arg0: callable to profile
+    return: (result of fn, report dict) with allocated_bytes and
+            allocated_blocks over all source lines, and lines: the top
+            kuantum.kyber source lines by allocated bytes, as dicts with
+            file (relative to kuantum/kyber), line, size and count
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        gc.collect()
+        sampler = AllocationSampler()
+        with trace.Tracer(sample=sampler):
+            result = fn(*args, **kwargs)
+        sampler()
+    finally:
+        if started:
+            tracemalloc.stop()
+    lines = [{'file': os.path.relpath(filename, KYBER_ROOT), 'line': lineno, 'size': size, 'count': count}
+             for (filename, lineno), (size, count) in sampler.allocated.items() if filename.startswith(KYBER_ROOT)]
+    lines.sort(key=lambda line: -line['size'])
+    return result, {
+        'allocated_bytes': sum(size for size, _ in sampler.allocated.values()),
+        'allocated_blocks': sum(count for _, count in sampler.allocated.values()),
+        'lines': lines[:top],
+    }
+
+
+def profile_allocations(fn, *args, top=10, **kwargs):
+    """
+    Run fn(*args, **kwargs) once under tracemalloc and report its memory
+    behaviour. tracemalloc is started (and stopped again) if it is not
+    running already.
+
+    The report holds
+        peak_bytes:     highest traced memory during the call above the
+                        level before it, short-lived objects included
+        live_bytes_after, live_blocks_after:
+                        net memory and blocks the call left alive once
+                        its cyclic garbage is collected (its result
+                        included); not a count of the allocations made
+        gc_collections: garbage collections per generation triggered
+                        during the call; a generation 0 collection runs
+                        every gc threshold (700 by default) net container
+                        allocations, so this tracks object churn
+        cyclic_garbage: objects left in reference cycles by the call,
+                        which only the garbage collector can free
+        lines:          the top kuantum.kyber source lines by the size
+                        of what they left alive, see kyber_lines
+
+    tracemalloc only sees blocks that are alive, so objects created and
+    freed within the call show up in peak_bytes and gc_collections but
+    not in the live-after figures; stage_allocations counts them per
+    source line.
+
+    arg0: callable to profile
+    return: (result of fn, report dict)
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        gc.collect()
+        before = tracemalloc.take_snapshot()
+        collections = [s['collections'] for s in gc.get_stats()]
+        start_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        result = fn(*args, **kwargs)
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+        collections = [s['collections'] - c for s, c in zip(gc.get_stats(), collections)]
+        cyclic_garbage = gc.collect()
+        after = tracemalloc.take_snapshot()
+    finally:
+        if started:
+            tracemalloc.stop()
+    diff = after.filter_traces(PROFILER_FILTERS).compare_to(before.filter_traces(PROFILER_FILTERS), 'lineno')
+    return result, {
+        'peak_bytes': peak_bytes - start_bytes,
+        'live_bytes_after': sum(stat.size_diff for stat in diff),
+        'live_blocks_after': sum(stat.count_diff for stat in diff),
+        'gc_collections': collections,
+        'cyclic_garbage': cyclic_garbage,
+        'lines': kyber_lines(diff, top),
+    }
+
+
+def profile_operations(kyber, top=10):
+    """
+    Profile one gen_keypair, encrypt and decrypt of a Kyber instance,
+    each after a warm-up call so one-time imports and tables are not
+    counted. Each operation is run twice, once for profile_allocations
+    and once for stage_allocations, whose report is added as
+    'allocations'.
+
+    arg0: Kyber instance
+    return: dict operation -> report of profile_allocations
+    """
+    keys = kyber.gen_keypair()
+    ct = kyber.encrypt(keys['public_key'])['ciphertext']
+    kyber.decrypt(ct, keys['secret_key'])
+    msg = byte_view(bytes(32))
+    reports = {}
+    for operation, fn, args in (('gen_keypair', kyber.gen_keypair, ()),
+                                ('encrypt', kyber.encrypt, (keys['public_key'], msg)),
+                                ('decrypt', kyber.decrypt, (ct, keys['secret_key']))):
+        reports[operation] = profile_allocations(fn, *args, top=top)[1]
+        reports[operation]['allocations'] = stage_allocations(fn, *args, top=top)[1]
+    return reports
+
+
+def format_report(operation, report):
+    lines = ['%s: peak %d bytes, left alive %d bytes in %d blocks, gc collections %s, cyclic garbage %d' % (
+        operation, report['peak_bytes'], report['live_bytes_after'], report['live_blocks_after'],
+        '/'.join(str(c) for c in report['gc_collections']), report['cyclic_garbage'])]
+    allocations = report.get('allocations')
+    if allocations is not None:
+        lines.append('  allocated %d bytes in %d blocks, by line:' % (
+            allocations['allocated_bytes'], allocations['allocated_blocks']))
+        for line in allocations['lines']:
+            lines.append('    %s:%d  %d bytes in %d blocks' % (line['file'], line['line'], line['size'], line['count']))
+    lines.append('  left alive, by line:')
+    for line in report['lines']:
+        lines.append('    %s:%d  %+d bytes in %+d blocks' % (line['file'], line['line'], line['size'], line['count']))
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    from kuantum.kyber.Kyber import Kyber
+    for level in sys.argv[1:] or ['kyber512', 'kyber768', 'kyber1024']:
+        for bytes_mode in (False, True):
+            print('%s, %s mode' % (level, 'bytes' if bytes_mode else 'list'))
+            for operation, report in profile_operations(Kyber(level, bytes_mode=bytes_mode)).items():
+                print(format_report(operation, report))
+            print()
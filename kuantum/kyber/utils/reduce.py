@@ -1,5 +1,6 @@
-from kuantum.kyber.utils.num_type import int16, int32, uint32
+from kuantum.kyber.utils.num_type import int16, int32, uint32, int16_array, int32_array, long64_array
 from kuantum.kyber.utils.constants import PARAMS_Q_INV, PARAMS_Q
+import numpy as np
 
 
 def montgomery_reduce(a: int) -> int:
@@ -29,3 +30,44 @@ def barrett_reduce(a: int) -> int:
     t = int16((v * a) >> 26)
     t = int16(t * PARAMS_Q)
     return int16(a - t)
+
+
+def montgomery_reduce_array(a: np.ndarray) -> np.ndarray:
+    """
+    array counterpart of montgomery_reduce, applied element-wise
+
+    arg0: array of 32-bit integers to be reduced
+    return: int32 array congruent to a * R^-1 mod q
+    """
+    a = long64_array(a)
+    u = int16_array(a * PARAMS_Q_INV)
+    t = a - long64_array(u) * PARAMS_Q
+    t >>= 16
+    return int32_array(t)
+
+
+def barrett_reduce_array(a: np.ndarray) -> np.ndarray:
+    """
+    array counterpart of barrett_reduce, applied element-wise
+
+    arg0: array of integers to be reduced
+    return: int16 array congruent to a mod q
+    """
+    a = long64_array(a)
+    v = ((1 << 26) + PARAMS_Q // 2) // PARAMS_Q
+    t = int16_array((v * a) >> 26)
+    t = int16_array(long64_array(t) * PARAMS_Q)
+    return int16_array(a - t)
+
+
+def csubq_array(a: np.ndarray) -> np.ndarray:
+    """
+    array counterpart of the conditional subtraction of q: maps [0, 2q) to
+    [0, q) and leaves negative values as they are
+
+    arg0: int16 array
+    return: new int16 array
+    """
+    a = int16_array(a) - np.int16(PARAMS_Q)
+    a += (a >> 15) & np.int16(PARAMS_Q)
+    return a
@@ -0,0 +1,148 @@
+import numpy as np
+from kuantum.kyber.utils.constants import PARAMS_N, PARAMS_Q, XOF_BLOCK_BYTES, GEN_MATRIX_NBLOCKS
+from kuantum.kyber.utils.constants import PARAMS_ETA_1, PARAMS_ETA_2
+from kuantum.kyber.utils.num_type import uint8_view
+from kuantum.kyber.utils.trace import count
+
+__all__ = ["uniform_candidates", "rej_uniform_array", "fill_uniform", "sample_uniform", "sample_uniform_batch",
+           "cbd_array"]
+
+
+def uniform_candidates(b):
+    """
+    Decode every 3-byte group of the last axis into two 12-bit
+    candidates, in stream order; trailing bytes that do not form a full
+    group are ignored
+
+    arg0: uint8 array of shape (..., nbytes)
+    return: int16 array of shape (..., 2 * (nbytes // 3))
+    """
+    groups = b.shape[-1] // 3
+    b = b[..., :3 * groups].reshape(b.shape[:-1] + (groups, 3)).astype(np.int16)
+    d = np.empty(b.shape[:-2] + (2 * groups,), dtype=np.int16)
+    pairs = d.reshape(b.shape[:-1] + (2,))
+    pairs[..., 0] = b[..., 0] | ((b[..., 1] & 0xF) << 8)
+    pairs[..., 1] = (b[..., 1] >> 4) | (b[..., 2] << 4)
+    return d
+
+
+def rej_uniform_array(buf, req_len):
+    """
+    Decode every 3-byte group of buf into two 12-bit candidates and keep
+    those below q, in stream order. Trailing bytes that do not form a
+    full group are ignored.
+
+    arg0: byte buffer
+    arg1: maximum number of coefficients to return
+    return: int16 ndarray of at most req_len coefficients
+    """
+    d = uniform_candidates(uint8_view(buf).reshape(-1))
+    return d[d < PARAMS_Q][:req_len]
+
+
+def fill_uniform(xof, r, filled):
+    """
+    Complete a partially sampled uniform polynomial by squeezing one
+    fresh rate block at a time; each block counts as one rejection
+    sampling retry when traced
+
+    arg0: XOF the first filled coefficients were sampled from
+    arg1: int16 array to complete
+    arg2: number of coefficients already in r
+    return: r
+    """
+    n = len(r)
+    while filled < n:
+        count('xof_bytes', XOF_BLOCK_BYTES)
+        count('rejection_retries')
+        accepted = rej_uniform_array(xof.read(XOF_BLOCK_BYTES), n - filled)
+        r[filled:filled + len(accepted)] = accepted
+        filled += len(accepted)
+    return r
+
+
+def sample_uniform(xof, n=PARAMS_N):
+    """
+    Rejection sample n uniform coefficients mod q from an XOF. The XOF
+    is squeezed GEN_MATRIX_NBLOCKS rate blocks up front and then one
+    block at a time until n coefficients are accepted; every squeezed
+    byte is consumed exactly once.
+
+    arg0: XOF object with a read(length) method, already absorbed
+    arg1: number of coefficients
+    return: int16 ndarray of shape (n,)
+    """
+    r = np.empty(n, dtype=np.int16)
+    count('xof_bytes', GEN_MATRIX_NBLOCKS * XOF_BLOCK_BYTES)
+    accepted = rej_uniform_array(xof.read(GEN_MATRIX_NBLOCKS * XOF_BLOCK_BYTES), n)
+    r[:len(accepted)] = accepted
+    return fill_uniform(xof, r, len(accepted))
+
+
+def sample_uniform_batch(xofs, n=PARAMS_N):
+    """
+    sample_uniform for many XOFs: the first GEN_MATRIX_NBLOCKS blocks of
+    every XOF are decoded and filtered in one pass, and only the rare
+    streams that fall short squeeze more blocks. Row i equals
+    sample_uniform(xofs[i], n).
+
+    arg0: sequence of absorbed XOF objects
+    arg1: number of coefficients per XOF
+    return: int16 ndarray of shape (len(xofs), n)
+    """
+    nbytes = GEN_MATRIX_NBLOCKS * XOF_BLOCK_BYTES
+    count('xof_bytes', nbytes * len(xofs))
+    b = np.frombuffer(b''.join([xof.read(nbytes) for xof in xofs]), dtype=np.uint8).reshape(len(xofs), nbytes)
+    d = uniform_candidates(b)
+    accepted = d < PARAMS_Q
+    position = np.cumsum(accepted, axis=1)
+    complete = position[:, -1] >= n
+    r = np.empty((len(xofs), n), dtype=np.int16)
+    r[complete] = d[complete][(accepted & (position <= n))[complete]].reshape(-1, n)
+    for i in np.flatnonzero(~complete):
+        r[i, :position[i, -1]] = d[i][accepted[i]]
+        fill_uniform(xofs[i], r[i], position[i, -1])
+    return r
+
+
+# a - b for every 2*eta-bit chunk, a and b being the popcounts of its low
+# and high eta bits
+CBD_TABLES = {
+    eta: np.array([bin(v & ((1 << eta) - 1)).count('1') - bin(v >> eta).count('1') for v in range(1 << (2 * eta))],
+                  dtype=np.int16)
+    for eta in (PARAMS_ETA_1, PARAMS_ETA_2)
+}
+
+
+def cbd_array(buf, eta):
+    """
+    Sample polynomials with coefficients from the centered binomial
+    distribution with parameter eta. Coefficient i is a - b, where a and
+    b count the set bits among bits [2*eta*i, 2*eta*i + eta) and
+    [2*eta*i + eta, 2*eta*(i + 1)) of the little-endian bit stream; each
+    2*eta-bit chunk is looked up in CBD_TABLES.
+    Gives the same coefficients as byte_ops.gen_cbd_pol.
+
+    arg0: PRF output of at least 64 * eta bytes, or a 2-D stack with
+          one PRF output per row
+    arg1: eta, PARAMS_ETA_1 (3) or PARAMS_ETA_2 (2)
+    return: int16 ndarray of shape (256,) or (rows, 256)
+    """
+    if eta not in (PARAMS_ETA_1, PARAMS_ETA_2):
+        raise ValueError('eta must be %d or %d' % (PARAMS_ETA_2, PARAMS_ETA_1))
+    b = uint8_view(buf)
+    nbytes = PARAMS_N * 2 * eta // 8
+    if b.shape[-1] < nbytes:
+        raise ValueError('CBD with eta=%d needs %d bytes per polynomial' % (eta, nbytes))
+    b = b[..., :nbytes]
+    if eta == 2:
+        # one byte holds two 4-bit chunks
+        chunks = np.empty(b.shape[:-1] + (PARAMS_N // 2, 2), dtype=np.uint8)
+        chunks[..., 0] = b & 0xF
+        chunks[..., 1] = b >> 4
+    else:
+        # three bytes hold four 6-bit chunks
+        t = b.reshape(b.shape[:-1] + (PARAMS_N // 4, 3)).astype(np.int32)
+        t = t[..., 0] | (t[..., 1] << 8) | (t[..., 2] << 16)
+        chunks = (t[..., None] >> np.arange(0, 24, 6, dtype=np.int32)) & 0x3F
+    return CBD_TABLES[eta][chunks.reshape(b.shape[:-1] + (PARAMS_N,))]
@@ -0,0 +1,191 @@
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter
+
+# (tracer, record of the operation being traced or None) of the running
+# context, None while tracing is off
+current = ContextVar('kuantum_trace', default=None)
+
+# counters every record starts with
+COUNTERS = ('xof_bytes', 'prf_bytes', 'rejection_retries')
+
+
+class NoTrace:
+    """
+    Shared do-nothing context manager returned by stage and operation
+    while nothing is traced
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+NO_TRACE = NoTrace()
+
+
+class Stage:
+    """
+    Adds its wall time and one call to record['stages'][name], and calls
+    the tracer's sample hook on entry and exit
+    """
+    __slots__ = ('tracer', 'record', 'name', 'start')
+
+    def __init__(self, tracer, record, name):
+        self.tracer = tracer
+        self.record = record
+        self.name = name
+
+    def __enter__(self):
+        if self.tracer.sample is not None:
+            self.tracer.sample()
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        elapsed = perf_counter() - self.start
+        if self.tracer.sample is not None:
+            self.tracer.sample()
+        stages = self.record['stages']
+        stage = stages.get(self.name)
+        if stage is None:
+            stage = stages[self.name] = {'calls': 0, 'time': 0.0}
+        stage['calls'] += 1
+        stage['time'] += elapsed
+        return False
+
+
+class Operation:
+    """
+    Opens a new record for one top-level operation and hands it to the
+    tracer when done
+    """
+    __slots__ = ('tracer', 'record', 'token', 'start')
+
+    def __init__(self, tracer, name, level):
+        self.tracer = tracer
+        self.record = {'operation': name, 'level': level, 'time': 0.0, 'error': None, 'stages': {},
+                       'counters': dict.fromkeys(COUNTERS, 0)}
+
+    def __enter__(self):
+        self.token = current.set((self.tracer, self.record))
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.record['time'] = perf_counter() - self.start
+        if exc_type is not None:
+            self.record['error'] = exc_type.__name__
+        current.reset(self.token)
+        self.tracer.finish(self.record)
+        return False
+
+
+def stage(name):
+    """
+    Context manager timing one internal stage of the operation being
+    traced; a shared no-op while nothing is traced
+
+    arg0: stage name, e.g. 'gen_matrix' or 'ntt'
+    """
+    state = current.get()
+    if state is None or state[1] is None:
+        return NO_TRACE
+    return Stage(state[0], state[1], name)
+
+
+def operation(name, level):
+    """
+    Context manager tracing one operation. Inside another traced
+    operation it is timed as a stage of that one instead, so each
+    top-level call gives exactly one record.
+
+    arg0: operation name, e.g. 'decrypt'
+    arg1: level, e.g. 'kyber768'
+    """
+    state = current.get()
+    if state is None:
+        return NO_TRACE
+    if state[1] is not None:
+        return Stage(state[0], state[1], name)
+    return Operation(state[0], name, level)
+
+
+def traced(name):
+    """
+    Decorator tracing a method of IDCPA or Kyber as operation name, at
+    the level of the instance (self.type)
+    """
+    def decorate(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if current.get() is None:
+                return method(self, *args, **kwargs)
+            with operation(name, self.type):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def count(name, n=1):
+    """
+    Add n to counter name of the operation being traced, e.g. bytes
+    squeezed from an XOF
+
+    arg0: counter name
+    arg1: amount
+    """
+    state = current.get()
+    if state is not None and state[1] is not None:
+        counters = state[1]['counters']
+        counters[name] = counters.get(name, 0) + n
+
+
+class Tracer:
+    """
+    Records the internal stages of every Kyber / IDCPA operation run in
+    its with block (in this thread or asyncio task): per stage the call
+    count and wall time in seconds, plus counters: SHAKE128 bytes
+    squeezed for matrix A (xof_bytes), SHAKE256 noise bytes (prf_bytes)
+    and rejection-sampling retries, i.e. extra XOF blocks squeezed
+    (rejection_retries). Each finished top-level operation becomes one
+    plain dict,
+
+        {'operation': 'decrypt', 'level': 'kyber768', 'time': ...,
+         'error': None, 'stages': {'ntt': {'calls': 2, 'time': ...}, ...},
+         'counters': {'xof_bytes': 5040, ...}}
+
+    appended to operations and passed to hook, if given. Stage times
+    are inclusive, so nested stages overlap their parent.
+
+    While no Tracer is active, the instrumentation only costs a context
+    variable lookup per stage.
+    """
+
+    def __init__(self, hook=None, sample=None):
+        """
+        arg0: optional callable receiving each finished operation's dict
+        arg1: optional callable without arguments, called on entry and
+              exit of every stage (before and after its timing), e.g. to
+              sample memory; see profiling.profile_allocations
+        """
+        self.hook = hook
+        self.sample = sample
+        self.operations = []
+        self.token = None
+
+    def finish(self, record):
+        self.operations.append(record)
+        if self.hook is not None:
+            self.hook(record)
+
+    def __enter__(self):
+        self.token = current.set((self, None))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        current.reset(self.token)
+        return False
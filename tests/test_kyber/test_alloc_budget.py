@@ -0,0 +1,68 @@
+from kuantum.kyber.Kyber import Kyber
+from kuantum.kyber.utils.profiling import profile_allocations, profile_operations, stage_allocations
+from kuantum.kyber.utils.trace import operation, stage
+
+# Memory budgets per operation, linear in k as (base, per_k): the vectors
+# and matrix rows an operation holds grow with k, the fixed part covers
+# hash objects and Python overhead. The pairs are rounded fits to the
+# figures measured with Python 3.11.7, NumPy 1.26.4 and pycryptodome 4.0.0
+# (ctypes backend), and budget() allows 1.5x them, so a change that makes
+# an operation go well beyond what it needs today fails here.
+# Peak memory, in int16 polynomials of 256 * 2 bytes
+PEAK_POLYS = (80, 72)
+# tracemalloc blocks allocated, counted by stage_allocations
+ALLOCATED_BLOCKS = {'gen_keypair': (400, 300), 'encrypt': (450, 150), 'decrypt': (500, 160)}
+# tracemalloc blocks still alive after the call; in list mode the outputs
+# are lists of Python ints
+LIVE_BLOCKS_AFTER_LIST_MODE = {'gen_keypair': (0, 370), 'encrypt': (0, 200), 'decrypt': (60, 0)}
+LIVE_BLOCKS_AFTER_BYTES_MODE = (50, 0)
+# reference cycles left behind per operation, all from pycryptodome's
+# ctypes backend creating array types per hash object
+CYCLIC_GARBAGE = 100
+
+
+def budget(base_per_k, k, unit=1):
+    return int(1.5 * (base_per_k[0] + base_per_k[1] * k) * unit)
+
+
+for level, k in (('kyber512', 2), ('kyber768', 3), ('kyber1024', 4)):
+    for bytes_mode in (False, True):
+        for name, report in profile_operations(Kyber(level, bytes_mode=bytes_mode)).items():
+            assert(0 < report['peak_bytes'] <= budget(PEAK_POLYS, k, 256 * 2))
+            assert(0 < report['allocations']['allocated_blocks'] <= budget(ALLOCATED_BLOCKS[name], k))
+            if bytes_mode:
+                assert(report['live_blocks_after'] <= budget(LIVE_BLOCKS_AFTER_BYTES_MODE, k))
+            else:
+                assert(report['live_blocks_after'] <= budget(LIVE_BLOCKS_AFTER_LIST_MODE[name], k))
+            assert(report['cyclic_garbage'] <= CYCLIC_GARBAGE)
+            assert(sum(report['gc_collections']) <= 1)
+
+# the report attributes memory left alive to source lines in kuantum.kyber
+result, report = profile_allocations(lambda: [bytearray(1000) for _ in range(10)])
+assert(len(result) == 10 and report['live_blocks_after'] >= 10 and report['live_bytes_after'] >= 10000)
+assert(report['lines'] == [])
+kyber = Kyber('kyber768')
+_, report = profile_allocations(kyber.gen_keypair, top=3)
+assert(len(report['lines']) == 3)
+assert(all(not line['file'].startswith('..') and line['line'] > 0 for line in report['lines']))
+sizes = [abs(line['size']) for line in report['lines']]
+assert(sizes == sorted(sizes, reverse=True))
+
+
+# a temporary that outlives a stage is counted as allocated by
+# stage_allocations, though it is gone before the call returns
+def temporary():
+    with operation('temporary', 'kyber512'):
+        with stage('work'):
+            buf = bytearray(100000)
+        del buf
+
+
+_, report = profile_allocations(temporary)
+assert(report['live_bytes_after'] < 100000)
+_, report = stage_allocations(temporary)
+assert(report['allocated_bytes'] >= 100000 and report['allocated_blocks'] >= 1)
+_, report = stage_allocations(kyber.encrypt, kyber.gen_keypair()['public_key'], top=5)
+sizes = [line['size'] for line in report['lines']]
+assert(len(sizes) == 5 and sizes == sorted(sizes, reverse=True))
+assert(sum(line['count'] for line in report['lines']) <= report['allocated_blocks'])
@@ -0,0 +1,83 @@
+from kuantum.kyber.AsyncKyber import AsyncKyber
+from kuantum.kyber.Kyber import Kyber
+from kuantum.kyber.KyberPool import KyberPool
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+
+kyber = Kyber('kyber512', bytes_mode=True)
+
+
+async def round_trip(async_kyber):
+    keys = await async_kyber.gen_keypair()
+    enc = await async_kyber.encrypt(keys['public_key'])
+    assert(kyber.decrypt(enc['ciphertext'], keys['secret_key']) == enc['shared_secret'])
+    assert(await async_kyber.decrypt(enc['ciphertext'], keys['secret_key']) == enc['shared_secret'])
+    return keys
+
+
+async def limits():
+    async with AsyncKyber('kyber512', workers=2, max_concurrency=2, max_pending=3) as async_kyber:
+        keys = await round_trip(async_kyber)
+        ct = kyber.encrypt(keys['public_key'])['ciphertext']
+
+        # two operations run, three wait, the sixth caller is refused
+        tasks = [asyncio.create_task(async_kyber.decrypt(ct, keys['secret_key'])) for _ in range(6)]
+        await asyncio.sleep(0)
+        assert(async_kyber.in_flight == 2 and async_kyber.pending == 3)
+        try:
+            await tasks[5]
+            assert(False)
+        except asyncio.QueueFull:
+            pass
+
+        # a cancelled waiter never runs; a cancelled running operation
+        # keeps its slot until the executor is done with it
+        tasks[0].cancel()
+        tasks[4].cancel()
+        results = await asyncio.gather(*tasks[:5], return_exceptions=True)
+        assert(isinstance(results[0], asyncio.CancelledError) and isinstance(results[4], asyncio.CancelledError))
+        assert(results[1:4] == [kyber.decrypt(ct, keys['secret_key'])] * 3)
+        await asyncio.sleep(0.05)
+        assert(async_kyber.in_flight == 0 and async_kyber.pending == 0)
+
+
+async def processes():
+    # create builds the pool off the loop: other coroutines keep running
+    ticks = []
+
+    async def ticker():
+        while True:
+            ticks.append(1)
+            await asyncio.sleep(0)
+
+    ticking = asyncio.create_task(ticker())
+    async_kyber = await AsyncKyber.create('kyber512', executor='process', workers=1)
+    ticking.cancel()
+    assert(len(ticks) > 1)
+    async with async_kyber:
+        assert(async_kyber.max_concurrency == 1 and async_kyber.owns_executor)
+        await round_trip(async_kyber)
+
+
+asyncio.run(limits())
+asyncio.run(processes())
+
+# the default concurrency is the size of a KyberPool passed in; a
+# ThreadPoolExecutor passed in needs its size or max_concurrency given
+with ThreadPoolExecutor(max_workers=3) as threads:
+    assert(AsyncKyber('kyber512', executor=threads, workers=3).max_concurrency == 3)
+    assert(AsyncKyber('kyber512', executor=threads, max_concurrency=2).max_concurrency == 2)
+    try:
+        AsyncKyber('kyber512', executor=threads)
+        assert(False)
+    except ValueError:
+        pass
+with KyberPool('kyber512', workers=1) as pool:
+    async_kyber = AsyncKyber('kyber512', executor=pool, max_pending=0)
+    assert(async_kyber.max_concurrency == 1 and not async_kyber.owns_executor)
+
+try:
+    AsyncKyber('kyber512', executor=object())
+    assert(False)
+except ValueError:
+    pass
@@ -0,0 +1,25 @@
+from benchmarks.suite import measure, compare, t_95, all_benchmarks
+
+# every primitive named in the suite is present for all three levels
+names = [name for name, _ in all_benchmarks()]
+assert(len(names) == len(set(names)))
+for level in ('kyber512', 'kyber768', 'kyber1024'):
+    for op in ('gen_keypair', 'encrypt', 'decrypt'):
+        assert('Kyber.%s[%s]' % (op, level) in names)
+    assert('gen_matrix[%s]' % level in names)
+
+assert(t_95(1) == 12.706 and t_95(11) == 2.228 and t_95(100) == 1.96)
+
+result = measure(lambda: sum(range(100)), repeat=3, min_time=0.001)
+assert(result['ci_low'] <= result['ops_per_sec'] <= result['ci_high'] and len(result['samples']) == 3)
+
+
+def document(ops, half_width):
+    return {'results': {'op': {'ops_per_sec': ops, 'ci_low': ops - half_width, 'ci_high': ops + half_width}}}
+
+
+# a regression needs both the threshold and non-overlapping intervals
+assert(compare(document(80, 1), document(100, 1), threshold=0.1)[0]['regressed'])
+assert(not compare(document(95, 1), document(100, 1), threshold=0.1)[0]['regressed'])
+assert(not compare(document(80, 15), document(100, 15), threshold=0.1)[0]['regressed'])
+assert(compare(document(80, 1), {'results': {}}) == [])
@@ -0,0 +1,131 @@
+import numpy as np
+from kuantum.kyber.utils.codec import poly_to_bytes_array, poly_from_bytes_array, polyvec_to_bytes_array, \
+    polyvec_from_bytes_array
+from kuantum.kyber.utils.poly import poly_to_bytes, poly_from_bytes
+from kuantum.kyber.utils.poly_vect import PolyVec, polyvec_to_bytes, polyvec_from_bytes
+from kuantum.kyber.utils.num_type import byte, int16
+
+
+def reference_poly_to_bytes(a):
+    # the original scalar serialization, including its conditional subtraction of q
+    a = [int16(x - 3329) for x in a]
+    a = [int16(x + ((x >> 15) & 3329)) for x in a]
+    r = [0 for _ in range(384)]
+    for i in range(128):
+        t0 = a[2 * i] & 0xffff
+        t1 = a[2 * i + 1] & 0xffff
+        r[3 * i + 0] = byte(t0 >> 0)
+        r[3 * i + 1] = byte(t0 >> 8) | byte(t1 << 4)
+        r[3 * i + 2] = byte(t1 >> 4)
+    return r
+
+
+rng = np.random.RandomState(13)
+
+# byte-exact with the scalar code over the whole int16 range
+for coeffs in (rng.randint(0, 3329, 256), rng.randint(0, 2 * 3329, 256), rng.randint(-32768, 32768, 256)):
+    coeffs = coeffs.astype(np.int16)
+    assert(poly_to_bytes(coeffs) == reference_poly_to_bytes(coeffs.tolist()))
+    assert(poly_to_bytes_array(coeffs).view(np.int8).tolist() == reference_poly_to_bytes(coeffs.tolist()))
+
+# round trips: coefficients in [0, 2q) come back reduced, and every
+# encoding of coefficients below q decodes and re-encodes to itself
+batch = rng.randint(0, 2 * 3329, (50, 3, 256)).astype(np.int16)
+packed = polyvec_to_bytes_array(batch)
+assert(packed.shape == (50, 3 * 384) and packed.dtype == np.uint8)
+assert(np.array_equal(polyvec_from_bytes_array(packed, 3), batch % 3329))
+assert(np.array_equal(polyvec_to_bytes_array(polyvec_from_bytes_array(packed, 3)), packed))
+assert(np.array_equal(poly_from_bytes_array(packed.tobytes()[:384]), batch[0, 0] % 3329))
+
+# batch rows equal the per-vector list API
+vec = PolyVec(batch[7])
+assert(polyvec_to_bytes(vec) == packed[7].view(np.int8).tolist())
+assert(polyvec_from_bytes(polyvec_to_bytes(vec), 3) == batch[7] % 3329)
+assert(polyvec_from_bytes(bytes(packed[7]), 3) == batch[7] % 3329)
+assert(poly_from_bytes(poly_to_bytes(batch[7, 1])) == batch[7, 1] % 3329)
+
+for bad in (bytes(383), bytes(385)):
+    try:
+        poly_from_bytes_array(bad)
+        assert(False)
+    except ValueError:
+        pass
+try:
+    polyvec_from_bytes_array(np.zeros((4, 2 * 384), dtype=np.uint8), 3)
+    assert(False)
+except ValueError:
+    pass
+
+# compression codec against a scalar transcription of the reference byte
+# layouts, for every d used by the three levels
+from kuantum.kyber.utils.codec import compress_array, decompress_array, pack_bits_array, unpack_bits_array
+from kuantum.kyber.utils.poly import Poly, poly_add, poly_compress, poly_decompress, poly_to_msg, poly_from_msg
+from kuantum.kyber.utils.poly_vect import polyvec_compress, polyvec_decompress
+
+
+def reference_compress(a, d):
+    t = [(((x % 3329) << d) + 1664) // 3329 & ((1 << d) - 1) for x in a]
+    r = []
+    if d == 1:
+        for i in range(32):
+            r.append(sum(t[8 * i + j] << j for j in range(8)))
+    elif d == 4:
+        for i in range(128):
+            r.append(t[2 * i] | (t[2 * i + 1] << 4))
+    elif d == 5:
+        for i in range(32):
+            t8 = t[8 * i:8 * i + 8]
+            r += [t8[0] | (t8[1] << 5), (t8[1] >> 3) | (t8[2] << 2) | (t8[3] << 7), (t8[3] >> 1) | (t8[4] << 4),
+                  (t8[4] >> 4) | (t8[5] << 1) | (t8[6] << 6), (t8[6] >> 2) | (t8[7] << 3)]
+    elif d == 10:
+        for i in range(64):
+            t4 = t[4 * i:4 * i + 4]
+            r += [t4[0], (t4[0] >> 8) | (t4[1] << 2), (t4[1] >> 6) | (t4[2] << 4), (t4[2] >> 4) | (t4[3] << 6),
+                  t4[3] >> 2]
+    else:
+        for i in range(32):
+            t8 = t[8 * i:8 * i + 8]
+            r += [t8[0], (t8[0] >> 8) | (t8[1] << 3), (t8[1] >> 5) | (t8[2] << 6), t8[2] >> 2,
+                  (t8[2] >> 10) | (t8[3] << 1), (t8[3] >> 7) | (t8[4] << 4), (t8[4] >> 4) | (t8[5] << 7), t8[5] >> 1,
+                  (t8[5] >> 9) | (t8[6] << 2), (t8[6] >> 6) | (t8[7] << 5), t8[7] >> 3]
+    return [byte(x) for x in r]
+
+
+for d in (1, 4, 5, 10, 11):
+    coeffs = rng.randint(0, 3330, (3, 256)).astype(np.int16)
+    packed = compress_array(coeffs, d)
+    assert(packed.shape == (3, 32 * d))
+    for row in range(3):
+        assert(packed[row].view(np.int8).tolist() == reference_compress(coeffs[row].tolist(), d))
+    # every d-bit value survives decompression and compression
+    for chunk in (np.arange(256 * 8) % (1 << d)).reshape(8, 256):
+        assert(np.array_equal(unpack_bits_array(pack_bits_array(chunk, d), d), chunk))
+        assert(np.array_equal(compress_array(decompress_array(pack_bits_array(chunk, d), d), d),
+                              pack_bits_array(chunk, d)))
+    # decompression error stays within q / 2^(d+1), rounded up
+    error = (decompress_array(packed, d).astype(np.int32) - coeffs) % 3329
+    error = np.minimum(error, 3329 - error)
+    assert(error.max() <= (3329 + (1 << (d + 1)) - 1) >> (d + 1))
+
+# unreduced and negative coefficients compress as their representative
+# mod q, over the whole int16 range
+for d in (1, 4, 5, 10, 11):
+    for coeffs in (rng.randint(-32768, 32768, (2, 256)), rng.randint(-2 * 3329, 0, (2, 256)),
+                   rng.randint(3329, 32768, (2, 256))):
+        coeffs = coeffs.astype(np.int16)
+        packed = compress_array(coeffs, d)
+        assert(np.array_equal(packed, compress_array(coeffs % 3329, d)))
+        for row in range(2):
+            assert(packed[row].view(np.int8).tolist() == reference_compress(coeffs[row].tolist(), d))
+v = poly_add(Poly(np.full(256, -3000, np.int16)), Poly(np.full(256, -3000, np.int16)))
+assert(poly_compress(v, 3) == reference_compress([-6000] * 256, 4))
+
+for k, d_u, d_v in ((2, 10, 4), (3, 10, 4), (4, 11, 5)):
+    u = rng.randint(0, 3329, (k, 256)).astype(np.int16)
+    v = rng.randint(0, 3329, 256).astype(np.int16)
+    assert(polyvec_compress(PolyVec(u), k) == sum([reference_compress(row, d_u) for row in u.tolist()], []))
+    assert(len(polyvec_compress(PolyVec(u), k)) == k * 32 * d_u)
+    assert(polyvec_decompress(polyvec_compress(PolyVec(u), k), k) == decompress_array(compress_array(u, d_u), d_u))
+    assert(poly_compress(v, k) == reference_compress(v.tolist(), d_v))
+    assert(poly_decompress(poly_compress(v, k), k) == decompress_array(compress_array(v, d_v), d_v))
+    assert(poly_to_msg(poly_from_msg(poly_to_msg(v))) == poly_to_msg(v) == reference_compress(v.tolist(), 1))
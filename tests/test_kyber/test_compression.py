@@ -0,0 +1,21 @@
+from kuantum.kyber.utils.compression import COMPRESS_BITS, COMPRESS_MUL, COMPRESS_SHIFT, COMPRESS_TABLES, \
+    DECOMPRESS_TABLES, compress_coefficient, decompress_coefficient, compress_list, decompress_list
+
+q = 3329
+
+assert(COMPRESS_BITS == (1, 4, 5, 10, 11))
+for d in COMPRESS_BITS:
+    # the multiply-and-shift reciprocal is exact over the whole domain
+    for x in range(q):
+        n = (x << d) + q // 2
+        assert((n * COMPRESS_MUL) >> COMPRESS_SHIFT == n // q)
+        assert(compress_coefficient(x, d) == (n // q) & ((1 << d) - 1))
+    assert(COMPRESS_TABLES[d] == [((x << d) + q // 2) // q % (1 << d) for x in range(q)])
+    assert(DECOMPRESS_TABLES[d] == [(t * q + (1 << (d - 1))) >> d for t in range(1 << d)])
+    assert(len(DECOMPRESS_TABLES[d]) == 1 << d)
+    # Compress_d(Decompress_d(t)) == t
+    assert(compress_list(decompress_list(range(1 << d), d), d) == list(range(1 << d)))
+    assert(all(decompress_coefficient(t, d) == DECOMPRESS_TABLES[d][t] for t in range(1 << d)))
+
+assert(compress_list([0, 1664, 1665, 3328], 1) == [0, 1, 1, 0])
+assert(decompress_list([0, 1], 1) == [0, 1665])
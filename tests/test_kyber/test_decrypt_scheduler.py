@@ -0,0 +1,75 @@
+from kuantum.kyber.Kyber import Kyber
+from kuantum.kyber.DecryptScheduler import DecryptScheduler
+from concurrent.futures import ThreadPoolExecutor
+
+for bytes_mode in (True, False):
+    kyber = Kyber('kyber512', bytes_mode=bytes_mode)
+    keys1 = kyber.gen_keypair()
+    keys2 = kyber.gen_keypair()
+    cts1 = [kyber.encrypt(keys1['public_key'])['ciphertext'] for _ in range(9)]
+    cts2 = [kyber.encrypt(keys2['public_key'])['ciphertext'] for _ in range(3)]
+    cts1[5] = cts2[0]
+    expected1 = [kyber.decrypt(ct, keys1['secret_key']) for ct in cts1]
+    expected2 = [kyber.decrypt(ct, keys2['secret_key']) for ct in cts2]
+
+    # requests for the same key are batched, never beyond max_batch_size,
+    # and every caller gets its own result
+    with DecryptScheduler(kyber, window=0.05, max_batch_size=4) as scheduler:
+        futures1 = [scheduler.submit(ct, keys1['secret_key']) for ct in cts1]
+        futures2 = [scheduler.submit(ct, kyber.prepare_secret_key(keys2['secret_key'])) for ct in cts2]
+        assert([f.result() for f in futures1] == expected1)
+        assert([f.result() for f in futures2] == expected2)
+        stats = scheduler.stats()
+        assert(stats['requests'] == 12 and stats['max_batch_size'] <= 4)
+        assert(sum(size * count for size, count in stats['batch_sizes'].items()) == 12)
+        assert(stats['batches'] >= 4 and stats['mean_queue_delay'] <= stats['max_queue_delay'])
+
+        # blocking calls from many threads
+        with ThreadPoolExecutor(4) as threads:
+            assert(list(threads.map(lambda ct: scheduler.decrypt(ct, keys1['secret_key']), cts1)) == expected1)
+
+        scheduler.reset_stats()
+        assert(scheduler.stats()['requests'] == 0)
+
+    # close runs what is still queued; cancelled requests are dropped
+    scheduler = DecryptScheduler(kyber, window=60)
+    futures = [scheduler.submit(ct, keys2['secret_key']) for ct in cts2]
+    assert(futures[1].cancel())
+    scheduler.close()
+    assert(futures[0].result() == expected2[0] and futures[2].result() == expected2[2])
+    assert(scheduler.stats()['requests'] == 2)
+    try:
+        scheduler.submit(cts2[0], keys2['secret_key'])
+        assert(False)
+    except RuntimeError:
+        pass
+
+# a bad key fails every request of its batch, a bad ciphertext fails at submit
+kyber = Kyber('kyber512', bytes_mode=True)
+with DecryptScheduler(kyber, window=0) as scheduler:
+    try:
+        scheduler.submit(bytes(kyber.ciphertext_bytes), bytes(10)).result()
+        assert(False)
+    except ValueError:
+        pass
+    try:
+        scheduler.submit(bytes(10), bytes(kyber.secret_key_bytes))
+        assert(False)
+    except ValueError:
+        pass
+
+# a request that breaks the batch only fails itself: the batch falls back
+# to one decrypt per request, which also serves the bytes ciphertext
+# mixed into a list-mode batch
+kyber = Kyber('kyber512')
+keys = kyber.gen_keypair()
+cts = [kyber.encrypt(keys['public_key'])['ciphertext'] for _ in range(3)]
+expected = [kyber.decrypt(ct, keys['secret_key']) for ct in cts]
+with DecryptScheduler(kyber, window=0.05) as scheduler:
+    good = [scheduler.submit(cts[0], keys['secret_key']),
+            scheduler.submit(bytes(x & 0xff for x in cts[1]), keys['secret_key'])]
+    bad = scheduler.submit([None] * kyber.ciphertext_bytes, keys['secret_key'])
+    good.append(scheduler.submit(cts[2], keys['secret_key']))
+    assert([f.result() for f in good] == expected)
+    assert(isinstance(bad.exception(), TypeError))
+    assert(scheduler.stats()['batches'] == 1)
@@ -14,8 +14,8 @@ uniform_random_byte_l_in2 = 256
 uniform_random_r_out2 = [3323, 1799, 2245, 2693, 1697, 184, 1066, 1373, 1205, 922, 884, 3314, 3079, 3185, 3221, 2593, 1915, 2769, 1837, 3035, 953, 2556, 2342, 437, 1476, 920, 1891, 3157, 2808, 2900, 2540, 24, 375, 701, 3034, 57, 1620, 2394, 1119, 828, 1602, 595, 1713, 1806, 282, 1381, 3053, 3010, 1268, 2916, 2896, 2725, 3130, 3310, 776, 1552, 927, 3264, 396, 2031, 2466, 197, 1506, 2535, 592, 2586, 1969, 1577, 1965, 2636, 2396, 261, 3050, 1390, 3108, 1399, 2167, 1363, 3300, 2491, 1499, 3042, 811, 228, 1184, 2577, 3045, 1138, 1214, 1099, 585, 2622, 1578, 2384, 2543, 700, 2651, 1546, 1829, 268, 2069, 214, 774, 1818, 1196, 1892, 2917, 3238, 2199, 3102, 819, 2906, 1214, 2718, 1101, 648, 134, 2004, 3262, 2697, 1898, 1390, 2081, 517, 272, 1548, 487, 640, 1639, 2466, 1778, 188, 2835, 3225, 2512, 2147, 798, 1901, 1833, 2071, 1030, 1636, 3112, 588, 2357, 1714, 1982, 1059, 2520, 2455, 112, 738, 1759, 3199, 1673, 1762, 1457, 2289, 1607, 1514, 1037, 1056, 152, 2274, 2473, 1948, 2608, 1995, 240, 1269, 454, 278, 2673, 3293, 447, 1972, 857, 3061, 630, 1951, 2862, 2671, 3061, 624, 3213, 428, 3224, 2184, 3285, 2025, 3130, 998, 1236, 673, 950, 2552, 2106, 2352, 2744, 1499, 2981, 1077, 893, 2467, 3125, 88, 1778, 2127, 3258, 173, 1305, 1248, 379, 2043, 2803, 2685, 1792, 756, 2769, 134, 1840, 1802, 2905, 2036, 322, 851, 605, 2045, 983, 494, 2633, 65, 1472, 549, 1337, 3126, 3299, 2710, 521, 167, 3052, 657, 1817, 1051, 53, 255, 44, 2364, 2843, 1139, 949, 3178, 335, 1883, 984, 1394, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
 uniform_random_i_out2 = 256
 
-assert(idcpa.idcpa_rej_uniform(uniform_random_byte_buf_in1, uniform_random_byte_bufl_in1, uniform_random_byte_l_in1) == (uniform_random_r_out1, uniform_random_i_out1))
-assert(idcpa.idcpa_rej_uniform(uniform_random_byte_buf_in2, uniform_random_byte_bufl_in2, uniform_random_byte_l_in2) == (uniform_random_r_out2, uniform_random_i_out2))
+assert(idcpa.idcpa_rej_uniform(uniform_random_byte_buf_in1, uniform_random_byte_bufl_in1, uniform_random_byte_l_in1) == (uniform_random_r_out1[:256], uniform_random_i_out1))
+assert(idcpa.idcpa_rej_uniform(uniform_random_byte_buf_in2, uniform_random_byte_bufl_in2, uniform_random_byte_l_in2) == (uniform_random_r_out2[:256], uniform_random_i_out2))
 
 
 generate_matrix_in1 = [101, -22, -3, 70, 95, -58, 74, 12, 95, -113, 63, -112, 3, 72, -108, 21, -119, -99, 89, -91, 67, -40, 32, -116, 84, -93, 22, 101, 41, -75, 57, 34]
@@ -40,5 +40,17 @@ generate_matrix_out2 = [
 [2893, 3217, 2709, 1500, 2365, 1017, 1493, 2822, 2941, 1211, 717, 192, 289, 1463, 1629, 2017, 2628, 3074, 2713, 348, 532, 958, 1076, 1287, 963, 1300, 1106, 3302, 1484, 1133, 240, 1879, 1385, 556, 642, 1342, 2684, 189, 3184, 1615, 3259, 1237, 1362, 1548, 579, 472, 429, 1066, 2974, 2374, 726, 2861, 3199, 1347, 2481, 227, 2046, 3130, 2765, 3318, 35, 2322, 1513, 757, 2820, 1885, 1833, 237, 900, 1176, 1576, 303, 2186, 2545, 2548, 2529, 299, 2514, 1859, 2393, 2017, 1030, 122, 1073, 2778, 590, 1978, 886, 1893, 2838, 1793, 1858, 2478, 925, 1567, 745, 629, 958, 2279, 2945, 2859, 1495, 2190, 2038, 1032, 2689, 3321, 2182, 2746, 1623, 1517, 1827, 1329, 1, 2470, 3179, 292, 313, 244, 970, 2545, 1701, 1910, 1052, 1600, 1138, 3251, 3218, 1223, 2143, 1598, 3238, 3154, 278, 1358, 2010, 2009, 2231, 422, 3213, 70, 1125, 750, 153, 524, 1732, 1478, 503, 2435, 1298, 1707, 1374, 416, 2370, 1212, 933, 2638, 968, 2593, 1564, 2817, 2602, 2065, 89, 1311, 1847, 1116, 219, 3098, 389, 2512, 3186, 366, 2728, 1865, 1035, 853, 703, 749, 662, 3095, 1711, 2563, 338, 21, 476, 317, 3039, 821, 206, 2217, 2261, 329, 1962, 2569, 1478, 1774, 926, 209, 934, 2771, 2781, 3303, 960, 2369, 609, 360, 610, 803, 3229, 3058, 2237, 1250, 1535, 881, 3156, 1553, 2528, 1526, 1485, 2086, 386, 2508, 1317, 2461, 2831, 1751, 1753, 1874, 1436, 1937, 882, 1258, 1675, 3230, 1420, 3262, 519, 1823, 1679, 1728, 2518, 2153, 2460, 1579, 1390, 3173, 1619, 316, 1780, 343, 1831, 2544, 376, 889, 1103, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
 ]]
 
-assert(idcpa.gen_matrix(generate_matrix_in1, generate_matrix_in1_transposed) == generate_matrix_out1)
-assert(idcpa.gen_matrix(generate_matrix_in2, generate_matrix_in2_transposed) == generate_matrix_out2)
+assert(idcpa.gen_matrix(generate_matrix_in1, generate_matrix_in1_transposed) == [[p[:256] for p in row] for row in generate_matrix_out1])
+assert(idcpa.gen_matrix(generate_matrix_in2, generate_matrix_in2_transposed) == [[p[:256] for p in row] for row in generate_matrix_out2])
+
+# expand_matrix goes through the batched sampler and still equals one
+# sample_uniform call per (i, j) stream, at every level and orientation
+from kuantum.kyber.utils.sampling import sample_uniform
+from Crypto.Hash import SHAKE128
+
+for level, k in (('kyber512', 2), ('kyber768', 3), ('kyber1024', 4)):
+    for transposed in (False, True):
+        expected = [[sample_uniform(SHAKE128.new(bytes(x & 0xff for x in generate_matrix_in2) +
+                                                 bytes([i, j] if transposed else [j, i]))).tolist()
+                     for j in range(k)] for i in range(k)]
+        assert(IDCPA(level).expand_matrix(generate_matrix_in2, transposed).coeffs.tolist() == expected)
@@ -0,0 +1,185 @@
+from kuantum.kyber.Kyber import Kyber
+from kuantum.kyber.PreparedKeys import PreparedPublicKey, PreparedSecretKey
+from Crypto.Random import get_random_bytes
+
+msg = [10, 85, -92, 67, 61, -70, -84, 59, 97, 109, 108, 67, 56, -4, -82, -60, -87, 104, 94, -118, -93, 12, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+
+for level in ('kyber512', 'kyber768', 'kyber1024'):
+    kyber = Kyber(level)
+    keys = kyber.gen_keypair()
+    enc = kyber.encrypt(keys['public_key'])
+    assert(kyber.decrypt(enc['ciphertext'], keys['secret_key']) == enc['shared_secret'])
+
+    # a prepared public key gives the same ciphertext as the raw key
+    prepared = kyber.prepare_public_key(keys['public_key'])
+    assert(isinstance(prepared, PreparedPublicKey))
+    assert(kyber.encrypt(prepared, msg) == kyber.encrypt(keys['public_key'], msg))
+    enc = kyber.encrypt(prepared)
+    assert(kyber.decrypt(enc['ciphertext'], keys['secret_key']) == enc['shared_secret'])
+
+    try:
+        prepared.h_pk = None
+        assert(False)
+    except AttributeError:
+        pass
+    try:
+        prepared.at.coeffs[0, 0, 0] = 1
+        assert(False)
+    except ValueError:
+        pass
+
+kyber = Kyber('kyber768')
+try:
+    kyber.prepare_public_key(keys['public_key'][:-1])
+    assert(False)
+except ValueError:
+    pass
+try:
+    Kyber('kyber512').encrypt(kyber.prepare_public_key(keys['public_key']))
+    assert(False)
+except ValueError:
+    pass
+
+for level in ('kyber512', 'kyber768', 'kyber1024'):
+    kyber = Kyber(level)
+    keys = kyber.gen_keypair()
+    prepared_sk = kyber.prepare_secret_key(keys['secret_key'])
+    assert(isinstance(prepared_sk, PreparedSecretKey))
+    enc = kyber.encrypt(keys['public_key'])
+    assert(kyber.decrypt(enc['ciphertext'], prepared_sk) == enc['shared_secret'])
+    assert(kyber.decrypt(enc['ciphertext'], prepared_sk) == kyber.decrypt(enc['ciphertext'], keys['secret_key']))
+
+    # implicit rejection gives the same (wrong) secret for both key forms
+    tampered = enc['ciphertext'][:]
+    tampered[0] ^= 1
+    assert(kyber.decrypt(tampered, prepared_sk) == kyber.decrypt(tampered, keys['secret_key']))
+    assert(kyber.decrypt(tampered, prepared_sk) != enc['shared_secret'])
+
+    try:
+        prepared_sk.s.coeffs[0, 0] = 1
+        assert(False)
+    except ValueError:
+        pass
+
+# bytes mode: any buffer in, bytes out, same results as the list API
+import numpy as np
+
+for level in ('kyber512', 'kyber768', 'kyber1024'):
+    kyber = Kyber(level)
+    kyber_bytes = Kyber(level, bytes_mode=True)
+    keys = kyber_bytes.gen_keypair()
+    assert(type(keys['public_key']) is bytes and len(keys['public_key']) == kyber.public_key_bytes)
+    assert(type(keys['secret_key']) is bytes and len(keys['secret_key']) == kyber.secret_key_bytes)
+    signed_pk = [x - 256 if x > 127 else x for x in keys['public_key']]
+    signed_sk = [x - 256 if x > 127 else x for x in keys['secret_key']]
+    msg_bytes = bytes(x & 0xff for x in msg)
+
+    enc = kyber_bytes.encrypt(keys['public_key'], msg_bytes)
+    assert(type(enc['ciphertext']) is bytes and type(enc['shared_secret']) is bytes)
+    enc_list = kyber.encrypt(signed_pk, msg)
+    assert(bytes(x & 0xff for x in enc_list['ciphertext']) == enc['ciphertext'])
+    assert(bytes(x & 0xff for x in enc_list['shared_secret']) == enc['shared_secret'])
+    for ct in (enc['ciphertext'], bytearray(enc['ciphertext']), memoryview(enc['ciphertext']),
+               np.frombuffer(enc['ciphertext'], dtype=np.uint8)):
+        assert(kyber_bytes.decrypt(ct, keys['secret_key']) == enc['shared_secret'])
+    assert(kyber_bytes.decrypt(enc['ciphertext'], bytearray(keys['secret_key'])) == enc['shared_secret'])
+    assert(kyber.decrypt(enc_list['ciphertext'], signed_sk) == enc_list['shared_secret'])
+    assert(kyber_bytes.encrypt(memoryview(keys['public_key']), bytearray(msg_bytes)) == enc)
+
+    prepared_pk = kyber_bytes.prepare_public_key(np.frombuffer(keys['public_key'], dtype=np.uint8))
+    prepared_sk = kyber_bytes.prepare_secret_key(keys['secret_key'])
+    assert(kyber_bytes.encrypt(prepared_pk, msg_bytes) == enc)
+    assert(kyber_bytes.decrypt(enc['ciphertext'], prepared_sk) == enc['shared_secret'])
+    tampered = bytearray(enc['ciphertext'])
+    tampered[0] ^= 1
+    assert(kyber_bytes.decrypt(tampered, prepared_sk) == kyber_bytes.decrypt(tampered, keys['secret_key']))
+    assert(kyber_bytes.decrypt(tampered, prepared_sk) != enc['shared_secret'])
+
+try:
+    Kyber('kyber512', bytes_mode=True).encrypt(np.zeros(800, dtype=np.int16))
+    assert(False)
+except TypeError:
+    pass
+
+# batched encapsulation equals one encrypt call per message
+for level in ('kyber512', 'kyber768', 'kyber1024'):
+    for bytes_mode in (False, True):
+        kyber = Kyber(level, bytes_mode=bytes_mode)
+        keys = kyber.gen_keypair()
+        msgs = [bytes([i] * 32) for i in range(5)]
+        if not bytes_mode:
+            msgs = [[x - 256 if x > 127 else x for x in m] for m in msgs]
+        batch = kyber.encrypt_batch(keys['public_key'], msgs)
+        assert(batch == [kyber.encrypt(keys['public_key'], m) for m in msgs])
+        assert(kyber.encrypt_batch(kyber.prepare_public_key(keys['public_key']), msgs) == batch)
+        many = kyber.encrypt_many(keys['public_key'], 3)
+        assert(len(many) == 3)
+        for enc in many:
+            assert(kyber.decrypt(enc['ciphertext'], keys['secret_key']) == enc['shared_secret'])
+        assert(kyber.encrypt_many(keys['public_key'], 0) == [])
+
+try:
+    kyber.encrypt_batch(keys['public_key'], [bytes(32), bytes(31)])
+    assert(False)
+except ValueError:
+    pass
+
+# batched decapsulation equals one decrypt call per ciphertext, including
+# implicit rejection of tampered ciphertexts
+for level in ('kyber512', 'kyber768', 'kyber1024'):
+    for bytes_mode in (False, True):
+        kyber = Kyber(level, bytes_mode=bytes_mode)
+        keys = kyber.gen_keypair()
+        encs = kyber.encrypt_many(keys['public_key'], 4)
+        cts = [enc['ciphertext'] for enc in encs]
+        tampered = list(cts[2])
+        tampered[-1] ^= 0x40
+        cts[2] = bytes(tampered) if bytes_mode else tampered
+        expected = [kyber.decrypt(ct, keys['secret_key']) for ct in cts]
+        assert(expected[2] != encs[2]['shared_secret'])
+        assert([expected[i] for i in (0, 1, 3)] == [encs[i]['shared_secret'] for i in (0, 1, 3)])
+        assert(kyber.decrypt_many(cts, keys['secret_key']) == expected)
+        stacked = np.array([[x & 0xff for x in ct] for ct in cts], dtype=np.uint8)
+        assert(kyber.decrypt_many(stacked, kyber.prepare_secret_key(keys['secret_key'])) == expected)
+        assert(kyber.decrypt_many([], keys['secret_key']) == [])
+
+try:
+    kyber.decrypt_many(stacked[:, :-1], keys['secret_key'])
+    assert(False)
+except ValueError:
+    pass
+
+# bulk key generation: row i is the keypair gen_keypair derives from the
+# same randomness, and the keys work
+import kuantum.kyber.IDCPA as idcpa_module
+import kuantum.kyber.Kyber as kyber_module
+from Crypto.Hash import SHAKE256
+
+
+def fixed_random(tag):
+    stream = SHAKE256.new(tag)
+    return lambda n: stream.read(n)
+
+
+for level in ('kyber512', 'kyber768', 'kyber1024'):
+    kyber = Kyber(level, bytes_mode=True)
+    try:
+        idcpa_module.get_random_bytes = fixed_random(b'idcpa')
+        kyber_module.get_random_bytes = fixed_random(b'kyber')
+        bulk = kyber.gen_keypairs(3, batch_size=2)
+        idcpa_module.get_random_bytes = fixed_random(b'idcpa')
+        kyber_module.get_random_bytes = fixed_random(b'kyber')
+        single = [kyber.gen_keypair() for _ in range(3)]
+    finally:
+        idcpa_module.get_random_bytes = get_random_bytes
+        kyber_module.get_random_bytes = get_random_bytes
+    assert(bulk['public_keys'].shape == (3, kyber.public_key_bytes) and bulk['public_keys'].dtype == np.uint8)
+    assert(bulk['secret_keys'].shape == (3, kyber.secret_key_bytes) and bulk['secret_keys'].flags['C_CONTIGUOUS'])
+    assert([pk.tobytes() for pk in bulk['public_keys']] == [keys['public_key'] for keys in single])
+    assert([sk.tobytes() for sk in bulk['secret_keys']] == [keys['secret_key'] for keys in single])
+
+    bulk = kyber.gen_keypairs(5)
+    assert(len(set(pk.tobytes() for pk in bulk['public_keys'])) == 5)
+    enc = kyber.encrypt(bulk['public_keys'][4])
+    assert(kyber.decrypt(enc['ciphertext'], bulk['secret_keys'][4]) == enc['shared_secret'])
+    assert(Kyber(level).gen_keypairs(0)['secret_keys'].shape == (0, kyber.secret_key_bytes))
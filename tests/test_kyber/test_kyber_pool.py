@@ -0,0 +1,43 @@
+from kuantum.kyber.Kyber import Kyber
+from kuantum.kyber.KyberPool import KyberPool
+from Crypto.Random import get_random_bytes
+
+kyber = Kyber('kyber512', bytes_mode=True)
+
+with KyberPool('kyber512', workers=2, key_cache_size=2) as pool:
+    assert(len(pool.warm()) == 2)
+
+    # single operations through futures interoperate with Kyber
+    keys = pool.submit_gen_keypair().result()
+    assert(len(keys['public_key']) == kyber.public_key_bytes and len(keys['secret_key']) == kyber.secret_key_bytes)
+    enc = pool.submit_encrypt(keys['public_key']).result()
+    assert(kyber.decrypt(enc['ciphertext'], keys['secret_key']) == enc['shared_secret'])
+    enc = kyber.encrypt(keys['public_key'])
+    assert(pool.submit_decrypt(enc['ciphertext'], keys['secret_key']).result() == enc['shared_secret'])
+
+    # list-mode keys and messages are accepted too
+    msg = get_random_bytes(32)
+    list_keys = Kyber('kyber512').gen_keypair()
+    enc = pool.submit_encrypt(list_keys['public_key'], list(msg)).result()
+    assert(enc == Kyber('kyber512', bytes_mode=True).encrypt(list_keys['public_key'], msg))
+
+    # chunked batches equal the per-message results, in order
+    msgs = [get_random_bytes(32) for _ in range(7)]
+    results = pool.encrypt_batch(keys['public_key'], msgs, chunk_size=3)
+    assert(results == [kyber.encrypt(keys['public_key'], msg) for msg in msgs])
+    cts = [r['ciphertext'] for r in results]
+    cts[4] = bytes([cts[4][0] ^ 1]) + cts[4][1:]
+    assert(pool.decrypt_many(cts, keys['secret_key']) == [kyber.decrypt(ct, keys['secret_key']) for ct in cts])
+    assert(pool.decrypt_many([], keys['secret_key']) == [])
+
+    bulk = pool.gen_keypairs(5, chunk_size=2)
+    assert(bulk['public_keys'].shape == (5, kyber.public_key_bytes))
+    assert(len(set(sk.tobytes() for sk in bulk['secret_keys'])) == 5)
+    enc = kyber.encrypt(bulk['public_keys'][3])
+    assert(kyber.decrypt(enc['ciphertext'], bulk['secret_keys'][3]) == enc['shared_secret'])
+
+    try:
+        pool.encrypt_batch(keys['public_key'], [bytes(31)])
+        assert(False)
+    except ValueError:
+        pass
@@ -0,0 +1,69 @@
+from kuantum.kyber.IDCPA import IDCPA
+from kuantum.kyber.utils.matrix_cache import MatrixCache
+from kuantum.kyber.utils.poly import poly_montgomery_reduce
+
+seed1 = [101, -22, -3, 70, 95, -58, 74, 12, 95, -113, 63, -112, 3, 72, -108, 21, -119, -99, 89, -91, 67, -40, 32, -116, 84, -93, 22, 101, 41, -75, 57, 34]
+seed2 = [-125, -26, 78, 120, 43, -87, -50, 16, 83, 62, 97, -115, 103, -16, -126, 61, 96, 14, 66, -122, -42, -8, -102, -64, -52, 88, 71, 25, 38, 9, -48, 60]
+seed3 = [x & 0xff for x in seed1[::-1]]
+
+uncached = IDCPA(level='kyber512')
+cache = MatrixCache(max_entries=2)
+idcpa = IDCPA(level='kyber512', matrix_cache=cache)
+
+# cached expansion equals the uncached one, and the second lookup is a hit
+a1 = idcpa.gen_matrix(seed1, True)
+assert(a1 == uncached.gen_matrix(seed1, True))
+assert(idcpa.gen_matrix(seed1, True) is a1)
+assert(cache.hits == 1 and cache.misses == 1)
+
+# the transposed flag is part of the key; signed and unsigned seeds are the same key
+assert(idcpa.gen_matrix(seed1, False) == uncached.gen_matrix(seed1, False))
+assert(idcpa.gen_matrix([x & 0xff for x in seed1], True) is a1)
+assert(cache.stats() == {'entries': 2, 'bytes': 2 * a1.coeffs.nbytes, 'hits': 2, 'misses': 2, 'evictions': 0})
+
+# least recently used entry (seed1, False) goes first
+idcpa.gen_matrix(seed2, True)
+assert(cache.evictions == 1 and len(cache) == 2)
+assert(cache.get(seed1, True, 2) is a1)
+assert(cache.get(seed1, False, 2) is None)
+
+# cached matrices cannot be modified in place
+try:
+    poly_montgomery_reduce(a1[0, 0])
+    assert(False)
+except ValueError:
+    pass
+assert(a1 == uncached.gen_matrix(seed1, True))
+
+# byte budget: room for a single 2x2 matrix
+cache = MatrixCache(max_bytes=a1.coeffs.nbytes)
+idcpa = IDCPA(level='kyber512', matrix_cache=cache)
+idcpa.gen_matrix(seed1, True)
+idcpa.gen_matrix(seed3, True)
+assert(len(cache) == 1 and cache.nbytes == a1.coeffs.nbytes and cache.evictions == 1)
+
+# one cache shared by two levels: the same seed gives a separate entry per
+# dimension, so a kyber512 lookup cannot hand a 2x2 matrix to kyber768
+from kuantum.kyber.Kyber import Kyber
+
+cache = MatrixCache()
+kyber512 = Kyber('kyber512', matrix_cache=cache)
+kyber768 = Kyber('kyber768', matrix_cache=cache)
+keys768 = kyber768.gen_keypair()
+seed = keys768['public_key'][-32:]
+kyber512.encrypt(kyber512.gen_keypair()['public_key'][:-32] + seed)
+enc = kyber768.encrypt(keys768['public_key'])
+assert(kyber768.decrypt(enc['ciphertext'], keys768['secret_key']) == enc['shared_secret'])
+assert(cache.get(seed, True, 2).coeffs.shape == (2, 2, 256))
+assert(cache.get(seed, True, 3).coeffs.shape == (3, 3, 256))
+
+# key generation does not go through the cache, so it cannot evict the
+# matrices of peer keys
+cache = MatrixCache(max_entries=4)
+kyber = Kyber('kyber512', matrix_cache=cache)
+peer = kyber.gen_keypair()['public_key']
+kyber.encrypt(peer)
+for _ in range(4):
+    kyber.gen_keypair()
+kyber.encrypt(peer)
+assert(cache.stats()['entries'] == 1 and cache.hits == 1 and cache.misses == 1 and cache.evictions == 0)
@@ -0,0 +1,75 @@
+from kuantum.kyber.Kyber import Kyber
+from kuantum.kyber.utils.metrics import MetricsRegistry, LATENCY_BUCKETS
+import os
+import tempfile
+
+metrics = MetricsRegistry()
+kyber512 = Kyber('kyber512', bytes_mode=True, metrics=metrics)
+kyber768 = Kyber('kyber768', bytes_mode=True, metrics=metrics)
+
+keys = kyber512.gen_keypair()
+enc = kyber512.encrypt(keys['public_key'])
+tampered = bytes([enc['ciphertext'][0] ^ 1]) + enc['ciphertext'][1:]
+kyber512.decrypt(enc['ciphertext'], keys['secret_key'])
+kyber512.decrypt(tampered, keys['secret_key'])
+kyber512.decrypt_many([tampered, enc['ciphertext'], tampered], keys['secret_key'])
+try:
+    kyber512.encrypt(keys['public_key'], bytes(31))
+    assert(False)
+except ValueError:
+    pass
+kyber768.gen_keypair()
+
+snapshot = metrics.snapshot()
+assert(snapshot['operations'] == {'gen_keypair/kyber512': 1, 'encrypt/kyber512': 1, 'decrypt/kyber512': 2,
+                                  'decrypt_many/kyber512': 1, 'gen_keypair/kyber768': 1})
+assert(snapshot['errors'] == {'encrypt/kyber512': 1})
+assert(snapshot['implicit_rejections'] == {'kyber512': 3})
+assert(sum(snapshot['histograms']['decrypt/kyber512']['counts']) == 2)
+assert(len(snapshot['histograms']['decrypt/kyber512']['counts']) == len(LATENCY_BUCKETS) + 1)
+
+# Prometheus text format: cumulative buckets ending in +Inf, sum and count
+text = metrics.render()
+assert('# TYPE kuantum_kyber_operation_seconds histogram' in text)
+assert('kuantum_kyber_operation_seconds_bucket{operation="decrypt",level="kyber512",le="+Inf"} 2\n' in text)
+assert('kuantum_kyber_operation_seconds_count{operation="decrypt",level="kyber512"} 2\n' in text)
+assert('kuantum_kyber_errors_total{operation="encrypt",level="kyber512"} 1\n' in text)
+assert('kuantum_kyber_implicit_rejections_total{level="kyber512"} 3\n' in text)
+bucket_lines = [line for line in text.splitlines() if line.startswith('kuantum_kyber_operation_seconds_bucket{operation="decrypt",level="kyber512"')]
+counts = [int(line.split()[-1]) for line in bucket_lines]
+assert(counts == sorted(counts) and len(counts) == len(LATENCY_BUCKETS) + 1)
+
+exported = []
+metrics.export(exported.append)
+assert(exported == [text])
+with tempfile.TemporaryDirectory() as directory:
+    path = os.path.join(directory, 'kuantum.prom')
+    metrics.export(path)
+    with open(path) as f:
+        assert(f.read() == text)
+    assert(os.listdir(directory) == ['kuantum.prom'])
+
+# quantiles interpolate inside the bucket
+registry = MetricsRegistry(buckets=(0.001, 0.002, 0.004))
+for _ in range(98):
+    registry.observe('decrypt', 'kyber768', 0.0015)
+registry.observe('decrypt', 'kyber768', 0.003)
+registry.observe('decrypt', 'kyber768', 10.0)
+assert(0.001 < registry.quantile('decrypt', 'kyber768', 0.5) <= 0.002)
+assert(0.002 < registry.quantile('decrypt', 'kyber768', 0.99) <= 0.004)
+assert(registry.quantile('decrypt', 'kyber768', 1.0) == 0.004)
+assert(registry.quantile('encrypt', 'kyber768', 0.5) is None)
+registry.observe('decrypt', 'kyber768', 0.002)
+assert(registry.snapshot()['histograms']['decrypt/kyber768']['counts'] == [0, 99, 1, 1])
+
+registry.reset()
+assert(registry.render().count('\n') == 8)
+
+try:
+    MetricsRegistry(buckets=(0.002, 0.001))
+    assert(False)
+except ValueError:
+    pass
+
+# no registry, no recording
+assert(Kyber('kyber512').metrics is None)
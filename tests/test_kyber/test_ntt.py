@@ -1,4 +1,4 @@
-from kuantum.kyber.utils.ntt import ntt, inv_ntt, base_multiplier
+from kuantum.kyber.utils.ntt import ntt, inv_ntt, base_multiplier, ntt_array, inv_ntt_array
 tests = [[2435, 403, 273, 2968, 2689, 2767, 332, 2493, 2090, 1079, 777, 29, 657, 2848, 3283, 774, 1112, 2708, 510, 140, 68, 1411, 2367, 813, 1521, 1359, 1990, 1990, 3238, 2841, 254, 692, 2533, 1196, 3248, 497, 2984, 2490, 1973, 676, 1876, 2741, 962, 23, 783, 1018, 536, 741, 364, 1183, 3241, 777, 36, 2272, 2559, 3241, 1564, 640, 3001, 3170, 2136, 1248, 1404, 367, 3153, 936, 1460, 2598, 2981, 182, 2120, 3261, 2159, 816, 546, 1336, 962, 55, 2103, 2133, 2341, 751, 1586, 1112, 1899, 3199, 611, 1599, 796, 2585, 536, 1691, 2178, 1564, 1057, 1580, 1889, 2702, 1798, 1118, 1921, 2438, 98, 2337, 1401, 2747, 2965, 1109, 1925, 1359, 1255, 2194, 764, 2357, 595, 345, 143, 2692, 530, 348, 2220, 2663, 2724, 1964, 2887, 878, 1944, 2422, 1700, 2168, 595, 2194, 940, 228, 1889, 2263, 2445, 543, 176, 1697, 1356, 1034, 211, 767, 1583, 2919, 1112, 579, 3108, 894, 2480, 3088, 62, 78, 341, 224, 1235, 3121, 1200, 855, 774, 2529, 176, 1554, 72, 117, 2441, 2360, 42, 1586, 979, 1730, 1356, 514, 1128, 2575, 842, 2376, 2958, 198, 1915, 1265, 1635, 1489, 2386, 2721, 2389, 2243, 2038, 2233, 1453, 3111, 2942, 1925, 3280, 888, 1473, 1993, 1482, 2077, 2734, 3004, 1083, 1040, 1437, 2520, 2601, 1873, 1528, 1391, 198, 3153, 2978, 2058, 484, 1102, 556, 1645, 1385, 1193, 52, 2773, 2389, 432, 2659, 3036, 2679, 2747, 2045, 2789, 1713, 2867, 575, 2493, 1118, 1691, 1512, 2698, 2601, 1531, 2188, 2289, 345, 2246, 1174, 127, 309, 1765, 46, 273, 2997, 1791, 2406, 1018, 1411, 1248, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
  [7044, 1504, 7072, 1418, 3454, 924, 3994, 2270, 3064, 2068, 5266, -200, 4927, 2547, 6547, 4533, 6727, 3907, 4079, 849, 4800, 1774, 2218, -1586, 3420, -1434, 2628, -3318, 6660, -1387, 3892, 179, 1376, -870, 3356, 910, 1743, 1079, 1465, 3637, 5971, -17, 3737, 1703, 2884, 4253, 180, 3185, 439, 4797, 1719, 1819, 978, 1567, 356, 3685, -50, -639, -282, 991, -112, 2486, -1760, 342, 5252, 2219, 4806, -2067, 3231, 690, 4827, 1374, 2727, 341, 5029, 641, 187, -830, 549, -3096, 1946, 1160, 450, -2486, 1595, 1494, 2933, 2192, 1028, -404, -606, -1434, -4085, -3699, -1677, -4287, 3800, 553, 922, 2053, 606, 1748, 2356, -1118, -3500, 1034, -672, 816, -945, 1455, 1849, -437, 2107, -3515, -313, -1015, 2961, -1291, 777, -2339, 4694, -767, 1636, -1943, 768, 296, -438, -3370, 6142, -1004, 6858, 490, 6592, -2613, 7100, -2073, 5744, 2707, 5584, -33, 2987, 342, 2881, 776, 2868, 1491, 2206, 4423, 1564, -626, -1158, -836, 4400, 1876, 4774, 1246, 3026, 3684, 5552, 2454, -1947, -3320, -657, -5718, 905, -4720, 563, -4686, 2764, -1284, 1512, -2550, 2565, -1697, 599, -3361, 4879, -775, 5195, -3799, 5329, -3370, 5229, -1548, 5090, 1356, 3208, -244, 2051, 528, 43, -2844, 1287, 1227, 3749, 4409, 3013, -47, 275, -513, 158, -716, -1996, 470, 1478, -640, 332, -798, 2759, -65, 1209, -1351, 4173, -1258, 4843, -1838, 816, 2709, 3556, 2069, 5083, -159, 3889, 85, 4249, 3077, 3475, -101, 3545, 1501, 2647, -1829, 5645, 2146, 2549, 4048, 398, 1246, 3396, 4056, -730, 4080, -278, 5664, 1843, 2313, 1885, 4791, -1096, 5242, -416, 4654, 2994, 2910, -90, 2986, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
  [2217, 2627, 3010, 3027, 2402, 3170, 3121, 3183, 49, 397, 2090, 3300, 631, 2477, 946, 2630, 2061, 2019, 3319, 260, 1187, 2529, 1967, 787, 1239, 2419, 562, 2552, 3283, 2048, 2194, 244, 42, 2198, 1713, 3176, 3186, 1291, 871, 192, 3290, 2601, 1076, 2126, 75, 2155, 1187, 819, 2292, 572, 598, 2971, 2376, 796, 273, 91, 588, 2396, 920, 1551, 1564, 1756, 1544, 2207, 1365, 2529, 2611, 0, 133, 75, 3043, 1743, 1135, 296, 1983, 3202, 1180, 133, 1625, 2380, 520, 813, 1161, 1743, 1665, 962, 237, 722, 2393, 666, 3322, 332, 3228, 660, 2643, 2116, 3095, 767, 2874, 1726, 1782, 2819, 2107, 1226, 3069, 3053, 1863, 276, 2663, 107, 2038, 2103, 0, 1479, 1255, 2741, 3040, 1336, 1541, 280, 1232, 2627, 3049, 2773, 1187, 1798, 397, 205, 1573, 1811, 1232, 1752, 3212, 88, 1183, 1395, 1378, 1847, 88, 1294, 2666, 2250, 3283, 2302, 1502, 2806, 1573, 992, 1830, 1489, 2546, 46, 1508, 949, 1375, 793, 1964, 536, 953, 488, 2799, 3118, 962, 2441, 1616, 410, 2240, 2981, 2536, 1681, 1960, 946, 2042, 943, 2643, 3036, 2780, 358, 1135, 683, 2087, 338, 2594, 1824, 2432, 2786, 2328, 1678, 2461, 1131, 979, 2383, 78, 1138, 2003, 2402, 1313, 881, 2568, 845, 1027, 2360, 2906, 2919, 176, 836, 858, 2477, 1099, 1983, 1450, 419, 2211, 2415, 1118, 2068, 1148, 2009, 449, 1437, 897, 1759, 2724, 2624, 2503, 1271, 2454, 26, 2003, 2607, 627, 774, 2237, 169, 325, 1775, 878, 1317, 2376, 2350, 2702, 1083, 949, 2520, 332, 2676, 2864, 878, 3144, 1336, 3270, 1073, 1021, 2607, 374, 1310, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
@@ -201,8 +201,13 @@ tests = [[2435, 403, 273, 2968, 2689, 2767, 332, 2493, 2090, 1079, 777, 29, 657,
  [3427, 6879, 4739, 6081, 1635, 3864, 4335, 5000, 1181, 5327, -891, 4203, 1972, 2347, -494, 683, -231, 1112, 2969, 3446, 3724, 3298, 3006, 5472, 994, -653, -372, 1735, -117, 358, -1141, 112, 1447, 722, 2851, -2430, 3396, -1444, 5650, 576, 5466, 492, 2496, 792, 3328, 2886, 1070, 3110, 1787, 559, -1093, -2479, 4280, -3752, 1786, -3792, 2641, 746, -495, -404, 107, -836, -1725, -522, -4837, 171, -1415, -2027, -4543, 1931, -5261, 1921, -4275, -1487, -5281, -1721, -1193, -3793, -2059, -3195, -4408, 1000, -2116, -1734, 154, 1922, -238, 3620, -2821, 3084, -1007, 568, 311, 2012, -307, 5312, 2533, 1846, -33, 1580, -1441, -1232, -963, 970, -2448, -101, -1788, -3507, -2005, 223, -2383, 1037, 2345, 2419, 4475, 2429, 1210, 5898, 262, 5106, 1896, -662, 2152, 932, -1080, 518, -748, 2768, 1599, -708, -1489, -2450, 4443, -850, 1871, -172, 6108, 4029, 4724, 2235, 5501, -180, 3211, 896, 1034, 1171, 3270, -517, -2210, -1225, 702, -669, 3952, -903, 1296, -2575, 311, -2857, 1789, -1977, 304, 228, 1494, -3042, 1906, 2346, 3268, 700, 3450, -514, 4094, 42, 3142, -3567, 2214, -2673, 2202, 1191, 5176, -627, 1985, 1769, 3773, 2355, 4722, -1268, 2220, -2608, 6059, -1266, 5495, -1034, -1915, 779, -695, 2597, -3654, 614, -820, 2182, -2965, 2112, -459, -884, 1484, 2250, 40, 4926, -49, 3846, 2355, 6174, 3470, 7114, 1844, 6850, -289, 2305, -2939, 3127, 1310, 4827, 354, 1773, 2319, 434, 4113, 2866, 774, 1493, 250, 2887, 1888, -453, 3800, 2413, 782, 4718, 2322, 1562, 913, 3702, 3921, 234, 2541, 2977, 1361, 4583, 2448, 2138, 2450, 1258, 2744, -1007, 3326, -1677, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
 ]
 
+ntt_batch_in = [tests[i][:256] for i in range(0, len(tests), 2)]
+ntt_batch_out = [tests[i + 1][:256] for i in range(0, len(tests), 2)]
+assert(ntt_array(ntt_batch_in).tolist() == ntt_batch_out)
+
 for i in range(0, len(tests), 2):
     ntt_in = tests[i]
+    assert(ntt_array(ntt_in[:256]).tolist() == tests[i+1][:256])
     assert(ntt(ntt_in) == tests[i+1])
 
 tests = [ [154, 399, 1339, 1733, 2344, 10, 2413, 813, 2831, 3072, 1061, 2455, 1834, 2017, 1797, 1116, 2451, 843, 599, 187, 2147, 1879, 2500, 71, 882, 1865, 2710, 1515, 2301, 3020, 2344, 1918, 385, 3120, 1606, 1938, 1073, 2476, 2005, 1167, 2457, 3087, 933, 2705, 2745, 810, 1200, 2412, 1806, 3187, 2359, 1374, 1827, 2281, 1812, 184, 2803, 1727, 3186, 2270, 223, 3063, 1261, 2800, 1576, 1077, 1938, 220, 2816, 1866, 1131, 257, 2156, 1510, 1464, 943, 2732, 1344, 3190, 638, 3172, 3157, 598, 1813, 2550, 1583, 2980, 3328, 1297, 248, 2834, 478, 3005, 1257, 1166, 1156, 329, 339, 1281, 2227, 1859, 2621, 145, 605, 312, 99, 329, 2926, 987, 485, 230, 1198, 1239, 2557, 2610, 632, 3186, 1523, 2747, 1682, 1354, 1281, 1274, 2016, 1252, 2034, 2983, 389, 2180, 1430, 3165, 2056, 1049, 1973, 1367, 1700, 1564, 2265, 99, 2886, 1179, 904, 3065, 2529, 2061, 1091, 1267, 3013, 254, 3188, 849, 2275, 1652, 2385, 2038, 1625, 1933, 355, 336, 969, 2780, 1342, 1402, 2710, 1251, 181, 2617, 1800, 1390, 2799, 1345, 959, 2855, 1581, 3307, 1764, 2517, 276, 1163, 2758, 2816, 728, 2153, 1219, 1118, 1532, 1298, 1896, 517, 2004, 1333, 496, 2210, 1737, 2276, 2804, 585, 2336, 1072, 1968, 1652, 1012, 1142, 3318, 1299, 587, 2947, 1524, 1595, 967, 1128, 118, 375, 2131, 1987, 108, 1766, 283, 1869, 2690, 3024, 231, 806, 879, 105, 1019, 1542, 3018, 2216, 579, 3315, 1110, 1289, 347, 544, 1038, 3122, 2173, 2838, 1463, 2314, 3254, 590, 2173, 2310, 1888, 3139, 3048, 1664, 834, 302, 3277, 3192, 28, 188, 1706, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
@@ -767,8 +772,13 @@ tests = [ [154, 399, 1339, 1733, 2344, 10, 2413, 813, 2831, 3072, 1061, 2455, 18
           [-1162, -156, 699, 866, 1451, 26, 263, 1128, -645, 295, -942, 1326, 868, -182, 1541, 254, 260, -1555, 748, 889, 794, 1420, -433, 1141, 882, 627, 1628, -789, -1028, -1222, 611, -1454, -1552, -485, 1295, 170, -92, -1308, 452, -1273, 539, 1006, 123, -850, -1, 758, 1561, 297, 862, 571, -1365, 1610, -1472, 73, -489, 35, 626, 919, 483, -364, 1073, 1501, 350, -717, -1428, 76, -193, 192, -547, 1611, -431, -789, -340, -244, 379, -576, 1324, -814, -227, -1208, -395, 1395, 334, -1221, -1567, 748, 716, -1556, 1400, 896, -351, 1217, -554, -752, -527, -1628, 28, 1494, 751, 940, -645, 140, 1172, 1596, 173, 1614, 1622, -278, 783, -615, -631, 677, -1013, 1181, -930, -1563, -658, 1251, 1328, 117, 1387, 525, 46, 18, -1316, -337, -1038, -1232, 1135, 1358, -1460, 396, -856, -955, 810, -235, -190, -1581, 136, -1140, 1008, 930, 937, -1379, 1537, 1404, -1368, 742, -1485, -199, -36, 1637, -388, 1409, 487, 583, -1608, -518, -1450, -699, -850, -1449, -1515, 294, -1248, 755, 750, 216, 1255, -255, -339, -386, -253, 652, 1490, 480, 1475, 246, 199, 496, -1081, -1531, -142, -526, 1402, -299, -124, -436, -1035, 1204, 1232, -1377, -1312, -1447, -1483, 603, 395, -949, 1310, 404, 1452, -588, -568, -1625, -636, -659, -1498, -487, -332, -244, -669, 1050, 299, 917, 1559, -1609, -732, -392, 549, -5, -1278, -157, -258, 730, 1362, 172, -1121, 281, 271, 413, 649, -1155, 60, -67, 182, -895, 1303, -1, -789, 1056, 1338, 259, -1037, -120, -1216, -425, 225, 906, -1061, 825, -862, -1554, -1199, -1034, -1305, 882, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
           ]
 
+inv_ntt_batch_in = [tests[i][:256] for i in range(0, len(tests), 2)]
+inv_ntt_batch_out = [tests[i + 1][:256] for i in range(0, len(tests), 2)]
+assert(inv_ntt_array(inv_ntt_batch_in).tolist() == inv_ntt_batch_out)
+
 for i in range(0, len(tests), 2):
     ntt_in = tests[i]
+    assert(inv_ntt_array(ntt_in[:256]).tolist() == tests[i + 1][:256])
     assert(inv_ntt(ntt_in) == tests[i + 1])
 
 
@@ -1,40 +1,41 @@
+import numpy as np
 from kuantum.kyber.utils.poly import *
 
 subq_in = [1399, 3329, 1014, 2566, 129, 338, 2897, 121, 2554, 3236, 2841, 836, 512, 1599, 1380, 2467, 2734, 3224, 1389, 692, 859, 289, 213, 2261, 3054, 586, 2393, 1023, 2649, 1061, 3316, 2263, 482, 3233, 3020, 2746, 404, 2058, 2723, 1494, 361, 2685, 2729, 2564, 385, 2237, 2665, 489, 2967, 2018, 3205, 2318, 2468, 2449, 1215, 2619, 1712, 1318, 2154, 3105, 1177, 3114, 706, 2515, 1530, 2664, 1852, 1191, 1571, 373, 1004, 2672, 1562, 754, 3295, 2478, 2133, 1301, 560, 1701, 3326, 67, 2738, 2021, 728, 581, 1349, 1451, 2680, 3080, 2570, 1780, 251, 2276, 112, 1081, 3169, 2378, 1483, 1235, 2657, 3303, 2725, 1501, 162, 1882, 3151, 1353, 2391, 1729, 926, 527, 1481, 278, 2926, 725, 2481, 1827, 2811, 1737, 1361, 2226, 2539, 2428, 3008, 1821, 635, 729, 3313, 647, 1859, 1069, 731, 3106, 953, 1243, 2328, 2357, 553, 2633, 2689, 2080, 267, 504, 2465, 2092, 2593, 1843, 3311, 96, 877, 1365, 1957, 958, 1137, 2946, 2648, 1475, 1394, 2392, 1044, 987, 1439, 901, 326, 2116, 2318, 1971, 1116, 807, 2479, 268, 2584, 1040, 1994, 1149, 691, 450, 1743, 1973, 2967, 670, 438, 33, 1495, 2968, 295, 2640, 2245, 1411, 2876, 1267, 757, 682, 1379, 1046, 1523, 84, 1459, 590, 1451, 2891, 1440, 1032, 1804, 3175, 953, 1127, 2907, 2433, 2476, 199, 2036, 731, 934, 2084, 1745, 734, 2119, 158, 2973, 1262, 3080, 2647, 2511, 2805, 2839, 1135, 143, 2414, 1234, 2241, 2674, 1286, 1861, 49, 625, 15, 467, 2039, 1101, 1978, 526, 1080, 663, 1619, 1653, 1359, 3257, 1663, 186, 2922, 2260, 2040, 2943, 2153, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
 subq_out = [1399, 0, 1014, 2566, 129, 338, 2897, 121, 2554, 3236, 2841, 836, 512, 1599, 1380, 2467, 2734, 3224, 1389, 692, 859, 289, 213, 2261, 3054, 586, 2393, 1023, 2649, 1061, 3316, 2263, 482, 3233, 3020, 2746, 404, 2058, 2723, 1494, 361, 2685, 2729, 2564, 385, 2237, 2665, 489, 2967, 2018, 3205, 2318, 2468, 2449, 1215, 2619, 1712, 1318, 2154, 3105, 1177, 3114, 706, 2515, 1530, 2664, 1852, 1191, 1571, 373, 1004, 2672, 1562, 754, 3295, 2478, 2133, 1301, 560, 1701, 3326, 67, 2738, 2021, 728, 581, 1349, 1451, 2680, 3080, 2570, 1780, 251, 2276, 112, 1081, 3169, 2378, 1483, 1235, 2657, 3303, 2725, 1501, 162, 1882, 3151, 1353, 2391, 1729, 926, 527, 1481, 278, 2926, 725, 2481, 1827, 2811, 1737, 1361, 2226, 2539, 2428, 3008, 1821, 635, 729, 3313, 647, 1859, 1069, 731, 3106, 953, 1243, 2328, 2357, 553, 2633, 2689, 2080, 267, 504, 2465, 2092, 2593, 1843, 3311, 96, 877, 1365, 1957, 958, 1137, 2946, 2648, 1475, 1394, 2392, 1044, 987, 1439, 901, 326, 2116, 2318, 1971, 1116, 807, 2479, 268, 2584, 1040, 1994, 1149, 691, 450, 1743, 1973, 2967, 670, 438, 33, 1495, 2968, 295, 2640, 2245, 1411, 2876, 1267, 757, 682, 1379, 1046, 1523, 84, 1459, 590, 1451, 2891, 1440, 1032, 1804, 3175, 953, 1127, 2907, 2433, 2476, 199, 2036, 731, 934, 2084, 1745, 734, 2119, 158, 2973, 1262, 3080, 2647, 2511, 2805, 2839, 1135, 143, 2414, 1234, 2241, 2674, 1286, 1861, 49, 625, 15, 467, 2039, 1101, 1978, 526, 1080, 663, 1619, 1653, 1359, 3257, 1663, 186, 2922, 2260, 2040, 2943, 2153, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
-assert(poly_conditional_sub_q(subq_in) == subq_out)
+assert(poly_conditional_sub_q(subq_in[:256]) == subq_out[:256])
 
 comprin1= [238, 2797, 892, 1265, 1091, 701, 586, 2422, 1618, 1531, 239, 1135, 938, 413, 2043, 434, 234, 1704, 459, 2967, 3069, 3145, 2016, 2308, 3090, 70, 1634, 305, 1441, 1807, 2182, 179, 2671, 554, 2921, 2837, 1416, 714, 869, 2762, 1540, 1634, 2402, 1440, 1868, 2221, 1698, 438, 646, 2858, 2995, 1264, 350, 1031, 1014, 681, 630, 45, 2019, 1470, 2211, 1309, 48, 488, 1550, 1002, 1889, 1722, 2660, 1420, 296, 1054, 2060, 1758, 3186, 964, 2998, 67, 811, 571, 2992, 1753, 2082, 675, 1265, 2289, 1133, 2627, 1005, 2253, 2669, 500, 2489, 3032, 32, 1192, 1133, 1426, 3191, 1486, 2388, 572, 284, 847, 863, 2175, 2827, 3108, 1467, 2418, 461, 1744, 3127, 1600, 2653, 111, 2894, 2816, 3164, 1978, 1058, 855, 1493, 1699, 2498, 2568, 1616, 2533, 2110, 2853, 3060, 2781, 860, 1346, 3106, 1468, 2679, 912, 3312, 357, 2220, 525, 3209, 404, 1984, 2042, 1026, 3325, 1189, 1982, 1812, 820, 977, 2187, 485, 1572, 891, 669, 2523, 3269, 895, 2345, 2015, 2455, 2915, 2439, 1365, 1014, 721, 2115, 1481, 3303, 162, 274, 2881, 2350, 964, 1415, 3082, 366, 2599, 2082, 3254, 3154, 381, 424, 2622, 1418, 2041, 3295, 38, 1721, 865, 2546, 419, 108, 866, 1578, 469, 778, 2676, 2805, 946, 2497, 839, 801, 2892, 2338, 3, 1713, 2305, 1121, 2591, 1841, 2867, 3052, 3183, 1725, 1854, 2939, 114, 2265, 527, 388, 2543, 1504, 3312, 1615, 1902, 3113, 1412, 1329, 1488, 1621, 2750, 2526, 403, 1889, 216, 1612, 2584, 2564, 362, 3019, 47, 1517, 146, 2457, 3138, 2179, 3296, 2518, 1484, 1273, 2742, 3225, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
 comprout1 = [-47, 100, 53, -61, 120, 81, 37, 42, -127, -30, -1, -70, 15, 24, -105, 26, 61, -18, 55, -44, -121, 124, -71, 40, -29, 110, 82, 53, 3, 122, 107, 32, 87, -119, 125, 81, -118, 95, 14, 52, -114, 58, -74, -43, -75, 45, -4, 96, 117, 127, 59, 65, -92, -2, -57, -126, -113, 29, -18, -81, 69, -121, -52, -56, -22, -33, 100, 127, 77, 32, 59, 47, -86, 5, -90, 73, -75, -126, 52, 12, -76, -54, -50, 87, -93, 7, 17, -66, 117, 47, -84, -16, 34, 125, 10, -128, -60, 18, -124, 66, -35, -59, 68, -66, -128, 91, -100, -2, -113, -23, -79, 35, 124, -128, -7, 103, -121, -51, -110, -127, -52, -14, 112, -63, -81, -64, 103, 13]
 comprin2 = [2361, 2489, 643, 2773, 1660, 996, 2708, 1636, 2439, 1047, 3019, 1695, 2806, 1381, 436, 1788, 2686, 221, 1210, 252, 780, 3269, 2965, 1800, 3131, 923, 2060, 2097, 2276, 2907, 2622, 3313, 2847, 374, 3127, 1749, 3237, 683, 455, 1387, 140, 2913, 2597, 998, 2309, 3239, 3196, 536, 3027, 725, 1755, 514, 3222, 1961, 2248, 2498, 1339, 1448, 1321, 981, 1662, 2878, 772, 2165, 2769, 2587, 1167, 1816, 567, 1887, 307, 3095, 284, 1624, 2283, 988, 1243, 3235, 2489, 2806, 2223, 1066, 2923, 2940, 3272, 2140, 952, 2603, 1761, 1440, 1591, 2977, 1979, 1672, 102, 1777, 2585, 1080, 2969, 348, 2191, 2337, 209, 2976, 1706, 1992, 1578, 1408, 1828, 1383, 2124, 981, 2245, 487, 3193, 1413, 1688, 692, 2072, 166, 3126, 334, 373, 2426, 2010, 3089, 2905, 651, 536, 817, 1182, 1202, 1495, 1852, 2564, 2419, 3017, 2801, 3301, 3218, 1119, 2936, 3226, 279, 413, 2863, 1028, 339, 432, 947, 1643, 2648, 2520, 2017, 1083, 1187, 1038, 1077, 2889, 901, 1185, 1634, 2180, 1453, 319, 2171, 1720, 551, 102, 3023, 1895, 243, 1239, 2286, 2750, 962, 1434, 1106, 1524, 2198, 391, 155, 720, 787, 3091, 625, 1426, 1375, 1640, 817, 164, 2778, 3317, 784, 927, 77, 662, 1083, 2544, 2485, 1283, 152, 1399, 1829, 208, 1090, 155, 1675, 2469, 655, 1576, 873, 1805, 946, 164, 113, 3288, 2460, 3167, 2418, 1327, 553, 2699, 235, 1708, 1131, 1928, 1407, 2081, 2824, 70, 1857, 2727, 1982, 1192, 1411, 474, 3102, 3294, 758, 417, 49, 2916, 2914, 1574, 2048, 1658, 1259, 707, 980, 140, 2028, 1601, 1458, 1386, 136, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
 comprout2 = [-53, -45, 88, -115, 92, -113, 125, -110, 29, 22, 4, -98, 79, -86, -21, 13, 46, -113, 48, 114, -31, 92, 11, 63, 63, 40, -97, -53, 118, 86, -24, -92, -51, -106, -109, -15, -127, 91, 6, -36, 91, -18, -96, -43, 120, -24, -118, -112, 92, 46, -69, -31, -88, 120, 121, 90, 43, 127, 56, 26, 47, -62, -6, 62, 67, 102, -105, -52, -33, -16, -27, 16, -30, 37, 82, -40, -84, 101, 85, 78, -122, 122, -94, 56, -16, 25, -74, 93, 87, -73, 18, 67, 63, 119, 72, -47, 64, 4, 83, -52, 22, -105, 81, -127, 60, 72, 89, 17, -64, -49, 54, 29, 88, 121, -22, -112, -83, 118, -14, 64, 2, -18, -88, 104, 83, -95, 120, 23]
 
-assert(poly_compress(comprin1,2) == comprout1)
-assert(poly_compress(comprin2,2) == comprout2)
+assert(poly_compress(comprin1[:256],2) == comprout1)
+assert(poly_compress(comprin2[:256],2) == comprout2)
 
 dc_in1 = [-47, 100, 53, -61, 120, 81, 37, 42, -127, -30, -1, -70, 15, 24, -105, 26, 61, -18, 55, -44, -121, 124, -71, 40, -29, 110, 82, 53, 3, 122, 107, 32, 87, -119, 125, 81, -118, 95, 14, 52, -114, 58, -74, -43, -75, 45, -4, 96, 117, 127, 59, 65, -92, -2, -57, -126, -113, 29, -18, -81, 69, -121, -52, -56, -22, -33, 100, 127, 77, 32, 59, 47, -86, 5, -90, 73, -75, -126, 52, 12, -76, -54, -50, 87, -93, 7, 17, -66, 117, 47, -84, -16, 34, 125, 10, -128, -60, 18, -124, 66, -35, -59, 68, -66, -128, 91, -100, -2, -113, -23, -79, 35, 124, -128, -7, 103, -121, -51, -110, -127, -52, -14, 112, -63, -81, -64, 103, 13]
 dc_out1 = [208, 2705, 832, 1248, 1040, 624, 624, 2497, 1665, 1456, 208, 1040, 1040, 416, 2081, 416, 208, 1665, 416, 2913, 3121, 3121, 2081, 2289, 3121, 0, 1665, 208, 1456, 1873, 2081, 208, 2705, 624, 2913, 2913, 1456, 624, 832, 2705, 1456, 1665, 2497, 1456, 1873, 2289, 1665, 416, 624, 2913, 2913, 1248, 416, 1040, 1040, 624, 624, 0, 2081, 1456, 2289, 1248, 0, 416, 1456, 1040, 1873, 1665, 2705, 1456, 208, 1040, 2081, 1665, 3121, 1040, 2913, 0, 832, 624, 2913, 1665, 2081, 624, 1248, 2289, 1040, 2705, 1040, 2289, 2705, 416, 2497, 3121, 0, 1248, 1040, 1456, 3121, 1456, 2289, 624, 208, 832, 832, 2081, 2913, 3121, 1456, 2497, 416, 1665, 3121, 1665, 2705, 208, 2913, 2913, 3121, 2081, 1040, 832, 1456, 1665, 2497, 2497, 1665, 2497, 2081, 2913, 3121, 2705, 832, 1248, 3121, 1456, 2705, 832, 0, 416, 2289, 624, 3121, 416, 2081, 2081, 1040, 0, 1248, 2081, 1873, 832, 1040, 2289, 416, 1665, 832, 624, 2497, 0, 832, 2289, 2081, 2497, 2913, 2497, 1456, 1040, 624, 2081, 1456, 0, 208, 208, 2913, 2289, 1040, 1456, 3121, 416, 2497, 2081, 0, 3121, 416, 416, 2705, 1456, 2081, 0, 0, 1665, 832, 2497, 416, 208, 832, 1665, 416, 832, 2705, 2705, 1040, 2497, 832, 832, 2913, 2289, 0, 1665, 2289, 1040, 2497, 1873, 2913, 3121, 3121, 1665, 1873, 2913, 208, 2289, 624, 416, 2497, 1456, 0, 1665, 1873, 3121, 1456, 1248, 1456, 1665, 2705, 2497, 416, 1873, 208, 1665, 2497, 2497, 416, 3121, 0, 1456, 208, 2497, 3121, 2081, 0, 2497, 1456, 1248, 2705, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
 dc_in2 = [-72, 109, 19, 22, -43, -75, -75, -22, 59, -39, 15, -127, 101, 42, 64, 33, -95, -23, -119, 2, 70, 66, 86, -89, -115, -53, -97, 37, 7, -42, -122, -102, -81, -118, -41, 14, 39, 30, 52, 125, -122, -89, -13, -84, 64, -57, -13, 111, -86, 22, -23, 39, 49, 100, 101, 19, -20, -34, -81, -84, -22, -82, 12, -100, 120, 1, -58, -47, -116, 52, -11, 1, 6, -55, 97, 106, -74, 38, -74, -85, 109, 22, 41, 62, -25, 57, -70, -15, -104, 5, -113, -28, -18, -101, 43, -121, -77, 31, 28, 58, -40, 14, -4, -60, 7, 48, 104, 115, -71, -8, 64, -85, -75, -8, 113, 42, -55, 70, -27, 21, -18, 93, -77, -113, -61, -121, -50, 91]
 dc_out2 = [1665, 2289, 2705, 1248, 624, 208, 1248, 208, 1040, 2705, 1040, 2289, 1040, 2289, 2081, 2913, 2289, 624, 1873, 2705, 3121, 0, 208, 1665, 1040, 1248, 2081, 416, 0, 832, 208, 416, 208, 2081, 1873, 2913, 1873, 1665, 416, 0, 1248, 832, 416, 832, 1248, 1040, 1456, 2081, 2705, 1665, 2289, 2497, 3121, 1873, 1040, 416, 1456, 0, 1248, 2705, 1248, 1665, 2081, 1873, 3121, 2081, 2081, 1665, 1456, 2705, 2913, 0, 1456, 416, 2913, 208, 832, 624, 2705, 1456, 1248, 1665, 1456, 2081, 624, 3121, 2497, 2081, 0, 832, 1456, 2497, 624, 3121, 3121, 1248, 2081, 2081, 1248, 208, 1873, 2913, 1456, 416, 208, 624, 832, 1248, 1040, 1248, 624, 208, 2497, 2913, 2913, 2705, 3121, 2081, 2497, 2081, 2081, 2913, 2913, 2081, 2497, 0, 2497, 1873, 1665, 1456, 208, 0, 1248, 2497, 208, 2705, 2497, 1665, 832, 624, 1040, 3121, 208, 0, 1248, 0, 1873, 2497, 208, 1248, 2081, 1248, 1248, 2289, 1248, 416, 1248, 2289, 2289, 2081, 2705, 1248, 1248, 208, 1873, 416, 2913, 624, 1456, 2913, 1873, 624, 2081, 2289, 208, 3121, 1665, 1873, 1040, 0, 3121, 1665, 832, 2913, 2913, 2913, 2289, 1873, 2289, 416, 1456, 1665, 624, 2289, 3121, 208, 2497, 208, 2081, 624, 1665, 2705, 2913, 0, 2497, 3121, 832, 2497, 1456, 0, 0, 624, 1665, 1248, 624, 1456, 1873, 2289, 1665, 3121, 0, 832, 2289, 2081, 1040, 2289, 1665, 3121, 208, 1456, 2081, 416, 1873, 2497, 1248, 832, 1040, 2913, 1040, 208, 2913, 2913, 2705, 1040, 624, 2289, 3121, 1665, 624, 2497, 1456, 1665, 2913, 2497, 2289, 1040, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
 
-assert(poly_decompress(dc_in1,2) == dc_out1)
-assert(poly_decompress(dc_in2,2) == dc_out2)
+assert(poly_decompress(dc_in1,2) == dc_out1[:256])
+assert(poly_decompress(dc_in2,2) == dc_out2[:256])
 
 poly_to_byte_in1 = [1355, 831, 321, 3181, 1432, 2999, 660, 2621, 2346, 1939, 2183, 966, 2311, 330, 797, 417, 2369, 1300, 658, 865, 2188, 2029, 2892, 466, 1472, 323, 3103, 462, 362, 1170, 465, 646, 1965, 392, 738, 1789, 1171, 171, 3051, 732, 1895, 482, 1650, 318, 876, 2491, 2746, 3283, 1597, 1919, 1257, 246, 199, 1484, 2488, 1334, 1515, 2993, 1834, 1065, 3018, 411, 1479, 1062, 1753, 192, 387, 653, 1757, 2300, 2792, 950, 3251, 2196, 671, 1474, 1395, 2222, 2309, 2867, 651, 1008, 3161, 555, 3323, 1074, 772, 1432, 538, 1410, 945, 2358, 511, 1432, 217, 2888, 1778, 2939, 1726, 179, 2790, 1754, 3306, 3103, 335, 888, 821, 1915, 2459, 3126, 2273, 1769, 2164, 2056, 1514, 519, 3048, 950, 1287, 3219, 2614, 2704, 2178, 1079, 2115, 1977, 1089, 2636, 1466, 2966, 1380, 829, 2389, 1757, 851, 754, 1453, 1854, 1697, 1243, 927, 641, 1671, 1825, 1818, 36, 1077, 2422, 1233, 2004, 2575, 3197, 2751, 1107, 488, 2706, 1205, 2548, 1651, 2280, 1221, 1612, 1748, 301, 692, 3320, 2111, 2532, 2079, 1301, 2418, 2973, 2852, 1029, 1275, 1331, 396, 304, 2195, 2026, 1647, 852, 720, 1477, 3168, 1208, 1401, 3032, 1783, 1619, 3038, 2177, 2973, 134, 1444, 2098, 2249, 555, 734, 2252, 849, 2730, 912, 379, 1863, 712, 2908, 940, 1263, 693, 1713, 1021, 2302, 1667, 945, 1735, 1550, 2458, 1209, 2977, 2069, 2840, 590, 1669, 448, 1626, 49, 1860, 1577, 2576, 864, 2571, 3181, 1022, 284, 2942, 2684, 1484, 365, 43, 2992, 238, 2823, 2948, 2171, 2732, 1232, 1014, 443, 1176, 2983, 2685, 1912, 2214, 1904, 2603, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
 poly_to_byte_out1 = [75, -11, 51, 65, -47, -58, -104, 117, -69, -108, -46, -93, 42, 57, 121, -121, 104, 60, 7, -87, 20, 29, 19, 26, 65, 73, 81, -110, 18, 54, -116, -40, 126, 76, 43, 29, -64, 53, 20, 31, -20, 28, 106, 33, 73, -47, 97, 40, -83, -121, 24, -30, -46, 111, -109, -76, 10, -21, -53, 45, 103, 39, 30, 114, -26, 19, 108, -77, -101, -70, 58, -51, 61, -10, 119, -23, 100, 15, -57, -64, 92, -72, 105, 83, -21, 21, -69, 42, -105, 66, -54, -69, 25, -57, 101, 66, -39, 6, 12, -125, -47, 40, -35, -58, -113, -24, 106, 59, -77, 76, -119, -97, 34, 92, 115, -27, -118, 5, 57, -77, -117, 2, 63, 89, -68, 34, -5, 44, 67, 4, -125, 89, 26, 34, 88, -79, 99, -109, -1, -127, 89, -39, -128, -76, -14, -74, -73, -66, 54, 11, -26, -86, 109, -22, -4, -63, 79, -127, 55, 53, -77, 119, -101, 105, -61, -31, -104, 110, 116, -120, -128, -22, 117, 32, -24, 107, 59, 7, 53, -55, 54, 10, -87, -126, 120, 67, 67, -104, 123, 65, -60, -92, -70, 101, -71, 100, -43, 51, 85, -39, 109, 83, 35, 47, -83, -27, 115, -95, -74, 77, -97, 19, 40, -121, 22, 114, 26, 71, 2, 53, 100, -105, -47, 68, 125, 15, -38, -57, -65, 58, 69, -24, 33, -87, -75, 68, -97, 115, -122, -114, -59, -60, 100, -44, -42, 18, -76, -126, -49, 63, 72, -98, 31, 88, 81, 114, -39, -71, 36, 91, 64, -5, 52, 83, -116, 1, 19, -109, -88, 126, 111, 70, 53, -48, 82, 92, 96, -116, 75, 121, -123, -67, -9, 54, 101, -34, 27, -120, -99, 107, 8, -92, 37, -125, -55, -72, 34, -34, -62, -116, 81, -93, -86, -112, -77, 23, 71, -121, 44, 92, -53, 58, -17, 84, 43, -79, -42, 63, -2, 56, 104, -79, 115, 108, 14, -90, -103, -71, 20, -70, 21, -120, -79, 78, 82, 104, -64, -95, 101, 49, 64, 116, 41, 6, -95, 96, -77, -96, 109, -20, 63, 28, -31, -73, 124, -54, 92, 109, -79, 2, -80, -21, 14, 7, 75, -72, 123, -56, -86, -48, 100, 63, -69, -127, 73, -89, -37, -89, 120, 103, -118, 112, -73, -94]
 poly_to_byte_in2 = [899, 785, 342, 2899, 1329, 2246, 3144, 2678, 1205, 1165, 1387, 249, 210, 1183, 680, 2965, 2127, 1997, 1672, 2148, 951, 2610, 2189, 2848, 2015, 833, 1672, 2675, 431, 1150, 1195, 1488, 921, 2708, 125, 834, 1797, 1451, 1756, 1246, 1159, 1926, 51, 2617, 860, 2196, 2405, 3302, 982, 243, 2275, 609, 710, 2396, 3252, 2901, 2938, 527, 1377, 350, 735, 1315, 349, 54, 444, 2352, 2284, 165, 2344, 1734, 1899, 1068, 2861, 3256, 1584, 2330, 924, 1585, 453, 2066, 1479, 208, 2093, 3189, 1825, 1177, 2571, 2987, 2719, 1424, 2336, 2569, 906, 1463, 1955, 559, 1058, 601, 917, 1874, 1039, 905, 2045, 881, 2306, 2785, 1534, 2829, 2081, 1227, 2689, 3121, 2488, 3297, 3303, 2468, 1593, 2958, 1104, 1002, 805, 2453, 2957, 501, 2275, 812, 2453, 2746, 2331, 3067, 95, 887, 2459, 2658, 3048, 1694, 1958, 2867, 1318, 449, 488, 1305, 257, 2096, 1564, 370, 2270, 407, 1924, 1929, 2955, 1227, 2564, 2258, 2654, 1719, 193, 1691, 2714, 1607, 122, 2465, 2035, 1728, 2006, 1813, 1295, 2727, 763, 3203, 379, 1611, 2258, 2342, 448, 1599, 1489, 235, 2993, 1393, 499, 2244, 3161, 757, 2511, 1869, 969, 2296, 1351, 2777, 1010, 534, 2566, 1697, 2473, 554, 2480, 568, 3121, 1314, 2212, 2059, 490, 801, 3097, 506, 2141, 1717, 2513, 408, 902, 1516, 214, 1487, 1021, 2003, 693, 3178, 3299, 373, 609, 1295, 0, 2501, 2408, 2807, 1226, 1233, 2784, 2246, 337, 1759, 2444, 3194, 869, 2736, 92, 1726, 3306, 2155, 1669, 328, 1858, 1369, 225, 788, 2796, 61, 3079, 1067, 572, 2445, 1368, 870, 2446, 614, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
 poly_to_byte_out2 = [-125, 19, 49, 86, 49, -75, 49, 101, -116, 72, 108, -89, -75, -44, 72, 107, -107, 15, -46, -16, 73, -88, 82, -71, 79, -40, 124, -120, 70, -122, -73, 35, -93, -115, 8, -78, -33, 23, 52, -120, 54, -89, -81, -31, 71, -85, 4, 93, -103, 67, -87, 125, 32, 52, 5, -73, 90, -36, -26, 77, -121, 100, 120, 51, -112, -93, 92, 67, -119, 101, 105, -50, -42, 51, 15, -29, 24, 38, -58, -62, -107, -76, 92, -75, 122, -5, 32, 97, -27, 21, -33, 50, 82, 93, 97, 3, -68, 1, -109, -20, 88, 10, 40, 105, 108, 107, -57, 66, 45, -117, -53, 48, -90, -111, -100, 19, 99, -59, 33, -127, -57, 5, 13, 45, 88, -57, 33, -105, 73, 11, -70, -70, -97, 10, 89, 32, -103, -96, -118, 115, 91, -93, -9, 34, 34, -108, 37, -107, 35, 117, 15, -108, 56, -3, 23, 55, 2, 25, -82, -2, -43, -80, 33, -72, 76, -127, 26, -61, -72, 25, -50, -25, 76, -102, 57, -26, -72, 80, -92, 62, 37, 83, -103, -115, 91, 31, -29, -56, 50, -107, -87, -85, 27, -71, -65, 95, 112, 55, -101, 41, -90, -24, -21, 105, -90, 55, -77, 38, 21, 28, -24, -111, 81, 1, 1, -125, 28, 38, 23, -34, 120, 25, -124, -105, 120, -117, -69, 76, 4, 42, -115, 94, 122, 107, -63, -80, 105, -102, 122, 100, 122, 16, -102, -13, 7, 108, -42, 87, 113, 15, 117, -86, -5, 50, -56, 123, -79, 100, -46, 104, -110, -64, -15, 99, -47, -75, 14, -79, 27, 87, -13, 65, -116, 89, 92, 47, -49, -39, 116, -55, -125, -113, 71, -107, -83, -14, 99, 33, 6, 26, 106, -87, -87, 34, -80, -119, 35, 49, 44, 82, -92, -72, -128, -22, 17, 50, 25, -84, 31, 93, 88, 107, -47, -119, 25, -122, -61, 94, -42, -16, 92, -3, 51, 125, -75, -94, -58, -29, 92, 23, 97, -14, 80, 0, 80, -100, 104, 121, -81, -54, 20, 77, -32, 106, -116, 81, -15, 109, -116, -87, -57, 101, 3, -85, 92, -32, 107, -22, -68, -122, -123, -122, 20, 66, -105, 85, -31, 64, 49, -20, -38, 3, 7, -68, 66, 60, -46, -104, 88, 101, 54, -114, 105, 38]
 
-assert(poly_to_bytes(poly_to_byte_in1) == poly_to_byte_out1)
-assert(poly_to_bytes(poly_to_byte_in2) == poly_to_byte_out2)
+assert(poly_to_bytes(poly_to_byte_in1[:256]) == poly_to_byte_out1)
+assert(poly_to_bytes(poly_to_byte_in2[:256]) == poly_to_byte_out2)
 
 poly_from_byte_in1 = [108, -119, 43, 2, -105, -87, -57, 100, 20, -109, -8, 125, -81, 53, 51, -18, -42, 31, 7, -12, 101, 32, 102, 51, 126, -41, 64, 70, -36, -57, 27, -96, 63, 48, -106, 1, 3, 22, 31, 125, -21, 83, -89, 27, 17, 97, 114, 99, -2, 42, -128, -105, 105, -50, 109, 112, -88, 95, -26, 0, -20, -30, -99, 127, 54, -95, 109, 51, 27, -117, 42, -98, 29, -72, -64, -112, 116, 45, -16, 115, -97, -16, 96, -50, -76, -20, -59, -85, 28, 94, 85, -84, -105, -69, 102, -89, -8, -107, 16, 93, 87, 120, 43, 34, -107, 56, -29, 66, 21, 68, -93, 66, 20, 8, -37, -12, 73, 16, -109, 76, -60, 35, 119, 79, 22, 118, -1, 28, 48, 111, -105, 85, 95, 87, -76, -82, -41, -90, -70, -71, 80, -88, 22, 60, -115, 49, -115, -22, 98, 117, 27, -42, -85, -59, 6, -100, 6, -56, -113, 51, 0, 38, -95, -104, 6, -96, 59, -105, -89, 105, 107, 86, -38, 33, -126, 123, -76, -24, -36, 3, 17, 82, -76, 27, -119, 42, -98, -103, -83, -10, -31, -106, 62, -106, 87, -120, 40, 21, 79, 70, 112, 51, -124, 105, 32, -5, -76, -72, 5, 68, -25, -24, -88, 26, -23, 99, -49, 54, -116, -101, -96, 55, -88, -62, -83, 98, -29, 43, 110, 97, -55, 29, 117, -50, 0, 90, -77, 15, -128, -103, -95, -14, -99, 123, 99, 5, -76, -36, 6, -30, 86, -128, -69, 0, -103, 47, 113, 127, -26, -63, 21, -88, 8, 66, 49, -52, 121, -35, 112, 14, -90, -111, 42, -57, -6, 13, -109, 123, -74, -89, 86, 102, 34, 48, 71, 12, 24, -101, 90, -95, 101, 61, -21, -109, 125, 90, -100, 37, -94, 29, -109, -79, -112, 116, -4, 35, -99, -127, 83, 83, -105, -105, -57, -44, -85, 98, 100, -99, 118, -86, 85, 55, 54, -87, 73, 2, 44, 34, -59, 43, -82, -20, 96, 91, 50, -50, -98, 91, -109, -124, -112, 53, 88, -54, -99, 106, 58, -70, -112, 66, 62, -19, -96, 28, -108, 25, -117, 25, 42, -117, -87, 6, 52, -105, -96, -59, 1, 51, 7, -35, -40, 99, 82, 100, 113, -92, -39, -107, 35, -21, 65, 127, 41, 26]
 poly_from_byte_out1 = [2412, 696, 1794, 2713, 1223, 326, 2195, 2015, 1455, 819, 1774, 509, 1031, 1631, 1568, 822, 1918, 1037, 3142, 3197, 27, 1018, 1584, 25, 1539, 497, 2941, 1342, 2983, 273, 609, 1591, 2814, 2050, 2455, 3302, 109, 2695, 1631, 14, 748, 2526, 1663, 2579, 877, 435, 2699, 2530, 2077, 3083, 1168, 727, 1008, 2551, 240, 3302, 3252, 3166, 3243, 1505, 3157, 2426, 1723, 2678, 1528, 265, 1885, 1925, 555, 2386, 824, 1070, 1045, 2612, 1090, 129, 1243, 1183, 784, 1225, 964, 1906, 1615, 1889, 3327, 769, 1903, 1369, 1887, 2885, 1966, 2669, 2490, 1291, 1704, 961, 397, 2259, 746, 1878, 1563, 2749, 1733, 2496, 2054, 2300, 51, 608, 2209, 105, 2976, 2419, 2471, 1718, 2646, 541, 2946, 2887, 3304, 61, 529, 2885, 2331, 680, 2462, 2777, 502, 2414, 1598, 1401, 2184, 338, 1615, 1796, 1075, 1688, 2848, 2895, 1464, 1088, 2279, 2702, 2330, 1598, 1743, 2243, 155, 890, 680, 2780, 866, 702, 366, 3222, 1309, 3303, 2560, 2869, 15, 2456, 673, 2527, 891, 86, 3252, 109, 1762, 2053, 187, 2448, 303, 2039, 486, 348, 2216, 1056, 3121, 1948, 221, 231, 422, 681, 2759, 223, 2963, 2919, 1703, 1637, 34, 1139, 2060, 2481, 346, 1626, 2877, 2366, 2685, 2501, 549, 474, 403, 2315, 3188, 575, 413, 1336, 1875, 2425, 1223, 2749, 1122, 2518, 2678, 1370, 1591, 2707, 585, 704, 1314, 700, 3246, 1550, 603, 3299, 2974, 2357, 132, 857, 2648, 2524, 2666, 2979, 656, 996, 237, 458, 2452, 2225, 2585, 2226, 1705, 832, 151, 3162, 769, 115, 2269, 1597, 1106, 1814, 2468, 2397, 2851, 1054, 2431, 418, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
 poly_from_byte_in2 = [-84, 12, 58, 88, 27, 109, -96, 7, 50, -27, -24, 27, 31, 124, -121, -101, 22, -109, -63, 59, 111, -97, 121, 49, 98, 36, 41, -27, 66, -81, 64, 105, 34, 47, 4, 85, 68, -32, -52, 79, -78, 77, 68, 72, -49, 44, 101, -106, -11, -53, 8, 98, 75, 17, -123, 1, 59, 107, 2, 8, -110, -7, 107, -33, -44, -83, -87, 23, -99, -25, 39, -72, -39, 66, 110, 9, -106, -75, -45, 73, 72, -50, 2, -48, -61, 105, -77, 124, -69, 84, -45, 71, -98, -40, -75, -126, -23, -25, 40, -110, -101, 76, 113, -55, -66, 17, -44, 91, 32, -60, -67, -61, -57, 67, 19, 34, 63, 88, 39, 78, -117, -91, 36, 68, 71, -60, -107, -107, 11, -124, -53, 12, 60, 39, 54, 64, 16, -118, 51, -105, -108, 69, 115, 39, -109, 40, -103, 108, -36, 12, -111, 60, -107, -118, -42, 32, -70, -117, 94, 94, -53, -69, 126, 19, -53, -100, 112, -67, 90, -77, 14, -73, 72, -116, -105, 0, 28, 32, 73, -113, 29, 124, -64, 109, -89, 107, -11, 32, -58, 88, -52, -83, -6, 41, 86, 66, 69, 87, -85, -22, -118, -72, -110, 57, -63, 120, 51, -36, 58, 73, -77, 106, -102, -23, -92, -122, -108, 5, 64, -21, 68, 79, -105, 21, 35, 87, -32, 32, 53, -109, -99, 117, -93, -64, 37, -12, 26, 64, 8, 35, -126, -96, 115, 60, 57, -80, 98, 43, 116, 14, 64, 117, -110, -58, 46, -54, -21, 20, 50, -60, 69, -77, 112, 58, -122, -10, -104, 26, 39, -127, 87, -22, -107, -90, -23, 45, 85, -28, -71, 114, -7, 54, -62, -16, -90, 88, 40, 14, -94, -80, 122, 72, -103, 45, -8, -109, 126, 10, 42, -63, -36, -55, 116, -2, 0, -86, -31, -11, 97, -6, 37, -114, 45, 37, -100, 62, -122, 29, -50, 35, 96, 57, 18, 118, 6, -4, 28, -32, 9, 0, 58, 123, -84, -108, 33, 1, -36, -72, 34, -79, -13, -63, 43, -9, 50, 56, -11, 70, -32, 28, 54, -75, -90, -109, 97, -110, -103, 92, -58, -100, 99, 35, 116, 9, -53, 83, -62, -29, 93, 116, -119, 13, 24, -120, 83, 118, -6, 85, 3, -79, 7, -94, -93, -110]
 poly_from_byte_out2 = [3244, 928, 2904, 1745, 1952, 800, 2277, 446, 3103, 2167, 1691, 2353, 3009, 1779, 2463, 791, 1122, 658, 741, 2804, 2368, 550, 1071, 1360, 68, 3278, 591, 1243, 2116, 3316, 1324, 2406, 3061, 140, 2914, 276, 389, 944, 619, 128, 2450, 1727, 1247, 2781, 1961, 2513, 2023, 2946, 729, 1764, 1545, 2905, 2515, 1156, 718, 3328, 2499, 2870, 2940, 1355, 2003, 2532, 1496, 2091, 2025, 654, 2962, 1225, 2417, 3052, 1041, 1469, 1056, 3036, 1987, 1084, 531, 1010, 1880, 1250, 1419, 586, 1860, 3140, 1429, 185, 2948, 204, 1852, 866, 64, 2209, 1843, 2377, 837, 631, 2195, 2450, 3180, 205, 3217, 2387, 1674, 525, 3002, 1512, 2910, 3004, 894, 3249, 156, 3031, 858, 235, 2231, 2244, 151, 448, 2336, 2292, 3101, 3079, 1901, 1722, 245, 3170, 3160, 2780, 2554, 1378, 1346, 1396, 2731, 2222, 696, 921, 2241, 823, 2780, 1171, 2739, 2470, 1257, 2154, 1428, 1024, 1259, 1268, 1431, 561, 87, 526, 821, 2521, 885, 3082, 1061, 431, 2112, 560, 130, 1850, 2364, 2819, 2914, 1858, 14, 1876, 1682, 748, 3018, 334, 1074, 1116, 179, 935, 1670, 2447, 1818, 2066, 2647, 2398, 2470, 734, 1109, 2974, 2418, 879, 194, 2671, 2136, 226, 162, 1963, 2376, 729, 1016, 2025, 2570, 3090, 2524, 1868, 254, 2720, 1505, 1567, 1530, 2274, 1325, 2498, 1598, 472, 974, 1538, 569, 1889, 3078, 463, 2528, 0, 2874, 2759, 404, 18, 2268, 555, 945, 3103, 1835, 815, 1336, 1135, 3296, 865, 1717, 2362, 609, 2457, 1628, 2508, 867, 1858, 2825, 1340, 962, 1502, 2420, 216, 2072, 1336, 2678, 1375, 259, 123, 930, 2346, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
 
-assert(poly_from_bytes(poly_from_byte_in1) == poly_from_byte_out1)
-assert(poly_from_bytes(poly_from_byte_in2) == poly_from_byte_out2)
+assert(poly_from_bytes(poly_from_byte_in1) == poly_from_byte_out1[:256])
+assert(poly_from_bytes(poly_from_byte_in2) == poly_from_byte_out2[:256])
 
 poly_from_data_in1 = [10, 85, -92, 67, 61, -70, -84, 59, 97, 109, 108, 67, 56, -4, -82, -60, -87, 104, 94, -118, -93, 125, 106, 91, -41, 77, 97, -108, -107, -51, 63, -19]
 poly_from_data_out1 = [0, 1665, 0, 1665, 0, 0, 0, 0, 1665, 0, 1665, 0, 1665, 0, 1665, 0, 0, 0, 1665, 0, 0, 1665, 0, 1665, 1665, 1665, 0, 0, 0, 0, 1665, 0, 1665, 0, 1665, 1665, 1665, 1665, 0, 0, 0, 1665, 0, 1665, 1665, 1665, 0, 1665, 0, 0, 1665, 1665, 0, 1665, 0, 1665, 1665, 1665, 0, 1665, 1665, 1665, 0, 0, 1665, 0, 0, 0, 0, 1665, 1665, 0, 1665, 0, 1665, 1665, 0, 1665, 1665, 0, 0, 0, 1665, 1665, 0, 1665, 1665, 0, 1665, 1665, 0, 0, 0, 0, 1665, 0, 0, 0, 0, 1665, 1665, 1665, 0, 0, 0, 0, 1665, 1665, 1665, 1665, 1665, 1665, 0, 1665, 1665, 1665, 0, 1665, 0, 1665, 0, 0, 1665, 0, 0, 0, 1665, 1665, 1665, 0, 0, 1665, 0, 1665, 0, 1665, 0, 0, 0, 1665, 0, 1665, 1665, 0, 0, 1665, 1665, 1665, 1665, 0, 1665, 0, 0, 1665, 0, 1665, 0, 0, 0, 1665, 1665, 1665, 0, 0, 0, 1665, 0, 1665, 1665, 0, 1665, 1665, 1665, 1665, 1665, 0, 0, 1665, 0, 1665, 0, 1665, 1665, 0, 1665, 1665, 0, 1665, 1665, 0, 1665, 0, 1665, 1665, 1665, 0, 1665, 0, 1665, 1665, 1665, 0, 1665, 1665, 0, 0, 1665, 0, 1665, 0, 0, 0, 0, 1665, 1665, 0, 0, 0, 1665, 0, 1665, 0, 0, 1665, 1665, 0, 1665, 0, 1665, 0, 0, 1665, 1665, 0, 1665, 1665, 0, 0, 1665, 1665, 1665, 1665, 1665, 1665, 1665, 1665, 0, 0, 1665, 0, 1665, 1665, 0, 1665, 1665, 1665]
@@ -49,8 +50,8 @@ poly_to_msg_out1 = [10, 85, -92, 67, 61, -70, -84, 59, 97, 109, 108, 67, 56, -4,
 poly_to_msg_in2 = [1637, 3159, 3281, 1577, 114, 3244, 1772, 9, 1689, 87, 49, 47, 3230, 3226, 1624, 1704, 104, 1, 1668, 3204, 3266, 1658, 1617, 1726, 3251, 100, 1749, 1583, 1711, 1553, 95, 3231, 1632, 1669, 3328, 3135, 54, 1587, 3236, 1550, 1646, 3270, 1821, 1653, 3248, 1731, 3204, 1677, 6, 67, 3202, 3294, 3324, 3290, 3309, 1705, 1736, 1612, 3279, 1672, 1729, 17, 3313, 78, 1669, 42, 131, 1634, 57, 3307, 1670, 1603, 77, 52, 1683, 3282, 3, 31, 3327, 1812, 21, 85, 1707, 1650, 1746, 1835, 30, 1735, 34, 32, 1718, 11, 1641, 1552, 1764, 28, 27, 82, 3252, 3307, 3269, 1588, 1600, 62, 1602, 3317, 1747, 1589, 6, 32, 1735, 1650, 194, 1635, 1750, 1754, 1758, 3318, 1629, 3308, 3280, 6, 1681, 1592, 1, 1621, 1612, 1686, 1582, 103, 1682, 3291, 3288, 173, 3267, 1790, 1719, 1741, 3315, 1604, 1624, 1579, 3243, 3179, 3304, 6, 3317, 64, 3245, 1667, 1646, 1745, 1608, 3289, 1768, 1797, 35, 1727, 94, 1736, 1683, 1556, 3230, 23, 3302, 3242, 1669, 72, 3324, 44, 1874, 1665, 3222, 3294, 41, 1571, 1702, 1747, 3141, 92, 1566, 3286, 3276, 1807, 3244, 3276, 102, 139, 38, 1639, 1627, 1759, 1575, 1606, 1604, 1667, 34, 3214, 1676, 122, 1672, 1799, 1683, 3243, 3305, 1749, 1726, 1604, 16, 1789, 1637, 11, 3235, 86, 1558, 1534, 1533, 1699, 1677, 1640, 1688, 3274, 1562, 1715, 1604, 1586, 1705, 1740, 48, 1612, 1714, 6, 138, 1639, 55, 1590, 3318, 161, 1776, 3230, 3257, 1613, 1717, 1617, 99, 1712, 3279, 1609, 1750, 3322, 1452, 1688, 3211, 3288, 3241, 1708, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
 poly_to_msg_out2 = [73, -63, -28, 60, -93, -83, -128, 27, -55, -124, -68, 116, 96, -51, 94, -20, -123, 59, -32, -83, 67, -116, -109, -32, 79, -25, -58, -33, 111, 74, -82, -115]
 
-assert(poly_to_msg(poly_to_msg_in1) == poly_to_msg_out1)
-assert(poly_to_msg(poly_to_msg_in2) == poly_to_msg_out2)
+assert(poly_to_msg(poly_to_msg_in1[:256]) == poly_to_msg_out1)
+assert(poly_to_msg(poly_to_msg_in2[:256]) == poly_to_msg_out2)
 
 get_np_seed1 = [-128, 53, 8, -15, -92, -21, -89, 117, -36, 93, 90, -21, 102, 29, -69, -108, -42, -120, -7, 78, -58, 19, 127, -62, 65, 72, 70, 45, 35, 37, 39, -8]
 get_np_nonce1 = 0
@@ -75,8 +76,8 @@ gen_prf_hash2 = [100, 70, -84, -86, 66, -46, -105, 3, 24, 13, 87, 17, 121, -43,
 
 assert(gen_prf_byte_array(gen_prf_key2, gen_prf_nonce2, gen_prf_l2) == gen_prf_hash2)
 
-assert(get_noise_poly(get_np_seed1, get_np_nonce1, get_np_paramsk1) == get_np_out1)
-assert(get_noise_poly(get_np_seed2, get_np_nonce2, get_np_paramsk2) == get_np_out2)
+assert(get_noise_poly(get_np_seed1, get_np_nonce1, get_np_paramsk1) == get_np_out1[:256])
+assert(get_noise_poly(get_np_seed2, get_np_nonce2, get_np_paramsk2) == get_np_out2[:256])
 
 poly_mul_inA1 = [2412, 696, 1794, 2713, 1223, 326, 2195, 2015, 1455, 819, 1774, 509, 1031, 1631, 1568, 822, 1918, 1037, 3142, 3197, 27, 1018, 1584, 25, 1539, 497, 2941, 1342, 2983, 273, 609, 1591, 2814, 2050, 2455, 3302, 109, 2695, 1631, 14, 748, 2526, 1663, 2579, 877, 435, 2699, 2530, 2077, 3083, 1168, 727, 1008, 2551, 240, 3302, 3252, 3166, 3243, 1505, 3157, 2426, 1723, 2678, 1528, 265, 1885, 1925, 555, 2386, 824, 1070, 1045, 2612, 1090, 129, 1243, 1183, 784, 1225, 964, 1906, 1615, 1889, 3327, 769, 1903, 1369, 1887, 2885, 1966, 2669, 2490, 1291, 1704, 961, 397, 2259, 746, 1878, 1563, 2749, 1733, 2496, 2054, 2300, 51, 608, 2209, 105, 2976, 2419, 2471, 1718, 2646, 541, 2946, 2887, 3304, 61, 529, 2885, 2331, 680, 2462, 2777, 502, 2414, 1598, 1401, 2184, 338, 1615, 1796, 1075, 1688, 2848, 2895, 1464, 1088, 2279, 2702, 2330, 1598, 1743, 2243, 155, 890, 680, 2780, 866, 702, 366, 3222, 1309, 3303, 2560, 2869, 15, 2456, 673, 2527, 891, 86, 3252, 109, 1762, 2053, 187, 2448, 303, 2039, 486, 348, 2216, 1056, 3121, 1948, 221, 231, 422, 681, 2759, 223, 2963, 2919, 1703, 1637, 34, 1139, 2060, 2481, 346, 1626, 2877, 2366, 2685, 2501, 549, 474, 403, 2315, 3188, 575, 413, 1336, 1875, 2425, 1223, 2749, 1122, 2518, 2678, 1370, 1591, 2707, 585, 704, 1314, 700, 3246, 1550, 603, 3299, 2974, 2357, 132, 857, 2648, 2524, 2666, 2979, 656, 996, 237, 458, 2452, 2225, 2585, 2226, 1705, 832, 151, 3162, 769, 115, 2269, 1597, 1106, 1814, 2468, 2397, 2851, 1054, 2431, 418, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
 poly_mul_inB1 = [7044, 1504, 7072, 1418, 3454, 924, 3994, 2270, 3064, 2068, 5266, -200, 4927, 2547, 6547, 4533, 6727, 3907, 4079, 849, 4800, 1774, 2218, -1586, 3420, -1434, 2628, -3318, 6660, -1387, 3892, 179, 1376, -870, 3356, 910, 1743, 1079, 1465, 3637, 5971, -17, 3737, 1703, 2884, 4253, 180, 3185, 439, 4797, 1719, 1819, 978, 1567, 356, 3685, -50, -639, -282, 991, -112, 2486, -1760, 342, 5252, 2219, 4806, -2067, 3231, 690, 4827, 1374, 2727, 341, 5029, 641, 187, -830, 549, -3096, 1946, 1160, 450, -2486, 1595, 1494, 2933, 2192, 1028, -404, -606, -1434, -4085, -3699, -1677, -4287, 3800, 553, 922, 2053, 606, 1748, 2356, -1118, -3500, 1034, -672, 816, -945, 1455, 1849, -437, 2107, -3515, -313, -1015, 2961, -1291, 777, -2339, 4694, -767, 1636, -1943, 768, 296, -438, -3370, 6142, -1004, 6858, 490, 6592, -2613, 7100, -2073, 5744, 2707, 5584, -33, 2987, 342, 2881, 776, 2868, 1491, 2206, 4423, 1564, -626, -1158, -836, 4400, 1876, 4774, 1246, 3026, 3684, 5552, 2454, -1947, -3320, -657, -5718, 905, -4720, 563, -4686, 2764, -1284, 1512, -2550, 2565, -1697, 599, -3361, 4879, -775, 5195, -3799, 5329, -3370, 5229, -1548, 5090, 1356, 3208, -244, 2051, 528, 43, -2844, 1287, 1227, 3749, 4409, 3013, -47, 275, -513, 158, -716, -1996, 470, 1478, -640, 332, -798, 2759, -65, 1209, -1351, 4173, -1258, 4843, -1838, 816, 2709, 3556, 2069, 5083, -159, 3889, 85, 4249, 3077, 3475, -101, 3545, 1501, 2647, -1829, 5645, 2146, 2549, 4048, 398, 1246, 3396, 4056, -730, 4080, -278, 5664, 1843, 2313, 1885, 4791, -1096, 5242, -416, 4654, 2994, 2910, -90, 2986, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
@@ -85,23 +86,23 @@ poly_mul_inA2 = [3244, 928, 2904, 1745, 1952, 800, 2277, 446, 3103, 2167, 1691,
 poly_mul_inB2 = [5575, 3028, 4199, 2404, 7096, -503, 4342, 843, 1832, 1779, 340, 2529, 3817, 2328, 2767, 3096, 3135, 5096, -611, 7088, 2405, 5766, 883, 2362, 2287, 4236, 29, 6558, 2593, 4646, 5791, 2040, 1165, 2035, 2707, 771, 538, 3330, -22, 1552, -1189, 3022, -1013, 438, -3705, 1664, -1753, 3940, 469, 859, -647, 1349, 1170, 3325, 3872, 479, 6763, -650, 4023, -1812, 2776, -565, 1342, 1303, 4579, -749, 7711, -2083, 4597, -1273, 2845, 1685, 857, 2516, 1703, 4692, 2678, 2706, 3198, 10, 7834, 1518, 5236, -1180, 3932, 2597, 3730, 1737, 4480, 640, 1736, 2538, 4082, 1337, 4018, 2765, -3509, -2032, -927, 388, -1333, -2481, 1101, -2183, 1257, -3265, -751, -407, 2080, -2092, 3170, -2928, 215, 469, 2087, 3677, -482, -1984, 1844, 714, 519, 572, 2555, -670, 1816, 655, 1190, -1777, 5365, 634, 4799, 440, 2115, -262, 4709, 484, 7087, 4408, 7891, 2732, 5918, 1069, 4076, 3767, 2360, 3830, 2476, 5032, -649, 4327, 1737, 4655, 2977, 2271, 387, 1543, 2730, 4350, 3094, 5792, 224, 2744, 2762, 414, 23, 727, -1189, -1549, 5063, 1556, 1657, 2286, 4150, -90, 1158, 8, 4246, 4395, 968, 4207, -1993, 5085, 811, 7133, 3325, 2824, 85, 3180, -308, 3684, 570, 532, 1681, 5214, 177, 2420, -301, 1114, 1835, -216, 687, 5948, 2677, 3344, -1921, 3979, 725, 6333, 2220, 5721, 2420, 5039, 3009, 1224, 4771, 3112, 1033, 3337, 2557, 4375, 3069, 5315, 1953, 4989, -701, 4154, 783, 5884, -659, 7269, 2241, 5121, 1727, 9663, 1771, 7899, 71, 6450, 2855, 9584, 6757, 7468, 3369, 5066, 3043, 4181, 3959, 5425, 5149, 8906, 6275, 11656, 2982, 8065, 1914, 5561, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
 poly_mul_out2 = [248, -653, 1809, 2592, 526, 1689, -950, -457, 1575, 1627, 711, -1422, 1515, -118, 614, 2809, -762, -125, -10, 105, 2522, -194, 587, -965, 604, -499, 189, -1027, 603, -51, -37, -149, 44, 583, -528, -1471, 2335, -2078, -1890, 1085, 1991, 1026, 272, 329, 1406, -1519, -75, 2331, 658, -847, -1517, -2409, 2681, 1061, 2011, -77, -659, 1956, 643, 484, -388, 107, -50, -2916, 3022, 488, 1130, -163, 937, 857, -641, -1825, -1364, -1402, 1694, -2497, -127, -670, 2562, 1561, 2100, -791, -1356, -1465, 1143, 1823, -1204, 259, 1416, -872, 2139, -1061, 501, 415, 562, -95, 1108, 2233, 705, -665, 1133, 1994, 1483, -985, -353, -1303, 2639, -40, -151, -1544, -1672, 373, -1627, 966, 333, -523, 635, 379, 578, -1169, -881, 1378, -298, -1553, 59, -2342, 779, -813, 1091, 2037, -2371, -1436, 192, 444, -2241, -660, -218, -148, -1986, -549, 272, 971, -823, 1490, 2670, 1834, -1222, 1664, -1384, -1641, -2067, 1425, 1637, -1985, 345, 295, -3, -1224, 44, 1980, -255, 2246, 1194, 1598, 1337, 264, 13, 952, 1904, 1595, 479, -168, 334, -1359, -1554, -1453, -1275, -1970, 1203, 637, -55, 1637, 907, -393, 99, -514, 1109, -310, -286, 2310, 206, -944, -1435, 657, -556, 3007, -174, 96, -984, -1360, -360, 398, -214, -97, 1740, -1067, 705, -108, 1734, -1256, -408, 319, 819, 31, -295, 650, 2013, 1237, 900, -288, 99, 2809, 840, -2213, -378, 1632, -1492, -737, 2138, 1392, 1609, 1887, 859, -577, -2312, 1232, -1370, 1150, 1783, 109, 60, 1447, -797, 226, -2715, 1259, -590, 2039, -1640, -2556, -939, 461, -3130, 151, 755, -894, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
 
-assert(poly_base_mul(poly_mul_inA1, poly_mul_inB1)==poly_mul_out1)
-assert(poly_base_mul(poly_mul_inA2, poly_mul_inB2)==poly_mul_out2)
+assert(poly_base_mul(poly_mul_inA1[:256], poly_mul_inB1[:256])==poly_mul_out1[:256])
+assert(poly_base_mul(poly_mul_inA2[:256], poly_mul_inB2[:256])==poly_mul_out2[:256])
 
 poly_to_mont_in1 = [651, 1637, 1802, 81, 859, 2511, 1047, 1099, 1974, 90, 2184, 2256, 1947, 2828, 451, 2404, 1563, 2268, 3178, 2049, 185, 2359, 2139, 2391, 506, 3083, 2606, 2833, 188, 1468, 3151, 925, 3010, 57, 1511, 2874, 480, 974, 2746, 871, 2477, 977, 406, 1119, 1964, 1483, 3076, 2971, 3218, 891, 1807, 2601, 2460, 3251, 335, 1086, 2951, 797, 2501, 356, 586, 1107, 2476, 1291, 1940, 1980, 1727, 2786, 2909, 3103, 2455, 2416, 3297, 1229, 67, 292, 139, 1913, 690, 1848, 274, 42, 1367, 1080, 2022, 1453, 1477, 1504, 3314, 2655, 2053, 1661, 1617, 1937, 1572, 2814, 2068, 47, 2611, 2213, 97, 3237, 323, 2239, 1047, 150, 2812, 1135, 243, 2154, 2481, 1616, 2859, 1898, 896, 2723, 668, 1918, 31, 923, 2359, 2126, 2202, 1955, 2202, 2053, 2148, 204, 2811, 3276, 2251, 1277, 1201, 1747, 347, 380, 1026, 1286, 1999, 2747, 3310, 65, 2788, 896, 100, 2186, 1835, 541, 2163, 1026, 774, 2048, 2319, 399, 2253, 2058, 2882, 420, 897, 329, 1141, 904, 1944, 1335, 1298, 762, 2820, 2693, 3220, 673, 217, 379, 1631, 2957, 3302, 861, 1119, 18, 2904, 1528, 293, 2744, 1940, 2638, 1152, 670, 2147, 2298, 406, 2141, 278, 2960, 1083, 1456, 1540, 357, 1145, 624, 1692, 692, 2597, 3189, 3188, 2618, 1161, 2026, 787, 2025, 1625, 2447, 2788, 1267, 1319, 2852, 344, 1879, 2827, 2385, 2820, 619, 2781, 3283, 1687, 2418, 363, 1006, 2215, 1697, 258, 626, 2580, 391, 2943, 2625, 3217, 132, 3179, 927, 1034, 2361, 3070, 960, 378, 1151, 1301, 3280, 1445, 1656, 370, 1671, 2392, 692, 934, 1648, 371, 1242, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
 poly_to_mont_out1 = [-528, -1251, -403, -1339, -1295, -1561, -1156, 1149, -205, -748, 269, 1668, 1351, 391, -1455, 290, -562, -873, 1181, 1391, -58, 664, 643, 546, 1047, 491, -871, -1500, 139, -1252, -592, -290, 136, 414, 462, -1027, 1559, -1511, -555, -507, 645, -1314, -1081, 243, 248, -267, 1141, 904, -631, -1413, 1035, 1020, -1581, 1536, -195, 1405, -1519, 182, -1108, 1184, 752, -545, 1689, 441, -1328, 189, 1330, 962, -948, -415, 310, 1078, 118, -1411, -39, 1420, 1360, 228, -1296, 1508, 238, -571, 993, 1011, -382, 1092, -661, 1112, -985, 1237, 544, 325, -345, -1525, 29, 1691, 1529, 867, 567, -46, -1398, -493, -983, -558, -1156, -137, 450, 184, -688, 1628, -202, 699, 1317, -757, 25, 154, -1631, 1666, 926, -1531, 664, 899, 1451, -343, 1451, 544, 1234, 80, 1494, -1261, 230, -1588, 1189, 424, 593, -569, 794, -997, 327, -1599, -138, -1280, -1126, 25, -1201, 1510, -1565, 1126, -1110, 794, 891, -894, -853, -431, 1471, -1347, 608, 948, -1019, -589, 578, 1660, 1154, 1111, -209, 103, -1244, 1513, 610, -193, -176, 475, 1684, -1125, 1556, -54, 243, 1182, 943, -641, 376, 1533, -1328, -989, -919, -390, -1051, 1097, -1081, -1445, -609, -928, 1208, 1289, 147, 140, -269, 1028, 1251, -55, -1462, -316, 728, -83, -328, -1229, 635, -185, 1290, -1325, -1126, -1135, 1170, -1362, 396, -895, 1435, 152, -1244, -410, -476, 1418, -187, -1010, 534, -1629, 1195, -640, 297, -1060, -359, 1263, 175, -733, 413, -1319, 137, 951, -900, -1424, 747, -211, 1519, 125, -12, 1221, -543, -1113, -116, -128, -498, -55, 301, 581, -1160, 1662, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
 poly_to_mont_in2 = [2399, 3252, 1763, 3052, 2842, 908, 2874, 191, 941, 2538, 1161, 463, 2234, 307, 2887, 3093, 825, 2555, 1517, 1585, 1595, 1258, 2425, 2437, 3314, 2374, 2342, 1285, 251, 1357, 1132, 1421, 1257, 925, 3039, 2626, 1159, 677, 734, 991, 538, 1369, 2360, 5, 2189, 1674, 2198, 1982, 96, 2243, 4, 690, 1788, 2723, 1494, 2850, 3208, 694, 606, 469, 2861, 1498, 1329, 401, 62, 2349, 968, 2564, 2897, 1653, 2469, 1307, 1542, 2678, 768, 801, 623, 2326, 2663, 3224, 2656, 1877, 2746, 2828, 1796, 2443, 2959, 1413, 1519, 683, 2191, 2060, 271, 2337, 540, 2561, 315, 2823, 1639, 2218, 1094, 1337, 2570, 59, 1767, 1781, 1017, 1563, 2684, 3303, 889, 666, 1149, 1376, 2890, 2092, 2150, 2842, 1580, 297, 2364, 2211, 739, 1970, 1333, 2570, 2614, 1780, 1507, 3280, 1533, 501, 2580, 2018, 1972, 2191, 1533, 169, 1524, 2016, 51, 918, 422, 3164, 2750, 262, 625, 869, 2847, 1970, 1083, 2837, 803, 969, 2258, 2284, 2382, 969, 2380, 3053, 2338, 1734, 50, 2817, 1150, 2413, 1338, 1064, 616, 443, 683, 861, 2827, 1752, 2016, 584, 1727, 2464, 1201, 1752, 2410, 2214, 1287, 1217, 3139, 300, 59, 299, 1563, 979, 2581, 3189, 1235, 1178, 2666, 1925, 3213, 1367, 2096, 420, 2788, 1785, 1900, 2982, 74, 2926, 1964, 2869, 1463, 2516, 3218, 2695, 1702, 1569, 2552, 2519, 4, 3204, 2126, 1819, 184, 213, 603, 1918, 2339, 826, 1216, 13, 1333, 728, 2312, 1069, 758, 787, 1840, 2311, 2848, 1606, 1918, 568, 2974, 2783, 52, 362, 438, 2378, 1280, 2153, 460, 2798, 1671, 1536, 1827, 1919, 103, 2317, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
 poly_to_mont_out2 = [-1148, 492, 365, -435, -909, 813, -1027, 336, -349, 212, -328, -667, 1333, -924, -1283, 38, 911, -891, 856, -227, -680, 1603, 1669, -872, -985, 1649, -1562, 47, 947, 1446, -13, 1210, -682, -290, -179, 1552, -1569, -1040, -626, 715, 929, -1095, -380, 1438, 1707, 69, -1031, 1430, -354, -1405, -847, -1296, 897, 154, 1565, 726, -178, 1186, -154, -273, -771, 718, 717, 810, -1477, 1117, 1424, -300, 1593, -1310, -990, 382, 1388, 528, 497, -665, -1257, -1503, -457, -237, 193, 1193, -555, 391, -797, -478, 116, -425, -1232, -646, -381, -106, 41, 329, -1159, -497, 711, -1047, -10, 1392, -289, -977, 94, 1655, -482, 1547, 203, -562, 922, 512, 675, 457, -1116, 1584, -1086, -224, -854, -909, 1664, -471, -1227, -1287, 812, 642, -130, 94, 764, -738, 1309, 1221, 797, -391, -359, 465, -1446, -381, 797, 1, 206, -776, 20, 360, -1140, -848, -1402, -550, -16, 1581, 529, 642, 1208, 982, 576, 380, -420, -932, -45, 380, -1286, -1479, -715, 680, 1064, -1441, 1169, 881, 1308, 1070, -607, 239, -646, -54, 1435, -1467, -776, -489, 1330, 901, 1189, -1467, 684, -1090, 1288, 1130, -1380, -274, 1655, 770, -562, -73, -1403, -316, -1017, -1431, -260, 1016, 1260, 993, -1071, 948, -1126, 700, 484, -593, -689, 1278, 248, 864, 639, -123, -631, -575, 798, -168, -1088, 74, -847, 669, 899, -1506, 986, 671, -351, 1666, 1570, -133, -1155, -256, -130, -1020, -203, -821, 950, 635, -127, 841, -515, 1152, 1666, -430, 1101, 765, -1024, 1578, -1199, 802, -1391, -657, -864, -1579, -128, 994, 129, 622, -1004, 1235, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
 
-assert(poly_montgomery_reduce(poly_to_mont_in1) == poly_to_mont_out1)
+assert(poly_montgomery_reduce(poly_to_mont_in1[:256]) == poly_to_mont_out1[:256])
 
 poly_red_in1 = [-2039, -1477, 1861, 4800, 604, 1454, -300, 722, 2023, 1086, 2158, -1105, -187, 2099, 1064, 1847, 1657, 2689, -444, 1452, 3289, -1687, 738, 438, 1164, 159, 470, 1058, 1565, -1978, 265, -716, -276, -1330, -1753, -2255, 1162, -1856, -840, 2440, -486, 1291, 1141, -1590, 947, -1201, -461, 3415, -823, -1094, -3894, -2564, 2276, 9, 2474, 1534, 767, 565, 2074, 3217, -372, 560, -776, -5171, 1288, 180, -282, -653, -298, 1945, -1785, -2404, -2018, 391, 3959, -3574, 1402, -1555, 3878, 1319, 4169, -2443, -683, -2311, 2782, 3811, -604, -1100, 582, -2804, 1471, 1065, 2167, 13, -1504, -1302, 440, 4492, 785, -47, 1637, 1206, 223, 627, 2001, -3356, 4162, -339, -1989, -3284, -1555, -105, -3154, 18, -489, -808, 2841, 3018, 1539, -2176, 1110, 756, 252, -860, 1874, -1384, 902, 1259, 1193, 5006, -3513, -3036, -421, 955, -1316, 1184, 273, -400, -3954, 1841, 1015, 593, -749, 2829, 5133, 2242, -831, 2663, -3256, -245, -1799, -1414, -241, -1605, 20, -466, -1564, -1552, -2102, 2627, -1054, 3203, 1163, -1159, 4053, 947, 1095, 1271, 3585, -1021, 248, -1520, 2596, -1711, -2354, -2093, -11, -884, 2085, 2020, 400, 1414, 728, -2269, -621, 1093, 1713, 1448, 596, 3094, -1890, -361, -1984, 1881, -1243, 3862, -1343, -1880, 1293, 1186, -359, -2093, 2124, -1415, 2896, -2820, 139, 165, -1202, 726, 417, -418, 1609, -222, -1030, 1936, 2138, 2603, 2187, -1941, 2106, 4379, -1571, -1739, -2625, 3436, 570, -302, 5428, 634, 881, 2088, -1143, -908, 488, 1344, -1643, 124, 2539, 2187, 1815, -757, -2493, 861, -4192, 1004, 1406, 2314, -3829, -4330, 1139, -1308, -3270, 1981, 1912, -1491, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
 poly_red_out1 = [1290, 1852, 1861, 1471, 604, 1454, 3029, 722, 2023, 1086, 2158, 2224, 3142, 2099, 1064, 1847, 1657, 2689, 2885, 1452, 3289, 1642, 738, 438, 1164, 159, 470, 1058, 1565, 1351, 265, 2613, 3053, 1999, 1576, 1074, 1162, 1473, 2489, 2440, 2843, 1291, 1141, 1739, 947, 2128, 2868, 86, 2506, 2235, 2764, 765, 2276, 9, 2474, 1534, 767, 565, 2074, 3217, 2957, 560, 2553, 1487, 1288, 180, 3047, 2676, 3031, 1945, 1544, 925, 1311, 391, 630, 3084, 1402, 1774, 549, 1319, 840, 886, 2646, 1018, 2782, 482, 2725, 2229, 582, 525, 1471, 1065, 2167, 13, 1825, 2027, 440, 1163, 785, 3282, 1637, 1206, 223, 627, 2001, 3302, 833, 2990, 1340, 45, 1774, 3224, 175, 18, 2840, 2521, 2841, 3018, 1539, 1153, 1110, 756, 252, 2469, 1874, 1945, 902, 1259, 1193, 1677, 3145, 293, 2908, 955, 2013, 1184, 273, 2929, 2704, 1841, 1015, 593, 2580, 2829, 1804, 2242, 2498, 2663, 73, 3084, 1530, 1915, 3088, 1724, 20, 2863, 1765, 1777, 1227, 2627, 2275, 3203, 1163, 2170, 724, 947, 1095, 1271, 256, 2308, 248, 1809, 2596, 1618, 975, 1236, 3318, 2445, 2085, 2020, 400, 1414, 728, 1060, 2708, 1093, 1713, 1448, 596, 3094, 1439, 2968, 1345, 1881, 2086, 533, 1986, 1449, 1293, 1186, 2970, 1236, 2124, 1914, 2896, 509, 139, 165, 2127, 726, 417, 2911, 1609, 3107, 2299, 1936, 2138, 2603, 2187, 1388, 2106, 1050, 1758, 1590, 704, 107, 570, 3027, 2099, 634, 881, 2088, 2186, 2421, 488, 1344, 1686, 124, 2539, 2187, 1815, 2572, 836, 861, 2466, 1004, 1406, 2314, 2829, 2328, 1139, 2021, 59, 1981, 1912, 1838, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
 poly_red_in2 = [-9, 1509, -52, 1673, 10, -115, -29, 3463, 1727, -96, 1652, -70, 1705, 82, 1655, -4, 39, -25, 1616, 3278, 3329, 1593, 3408, 1603, 1778, -1660, 49, -118, 63, 3337, 1515, -43, 1701, -22, 1656, 1839, 1662, 1632, -12, 3315, -49, 1742, 3436, 1593, 1609, 1689, 52, 1697, -40, 3409, 1614, 1709, 66, 1678, 25, 1673, 1757, 1646, 3485, 1700, 1788, 1617, -84, -63, 1561, -31, 3309, 3222, 3430, 1686, 1633, -70, 1744, 3132, 1536, 1691, 3202, 1495, 1605, -39, 3284, -8, 1697, 1724, -1, 1727, 1581, 3410, 1653, 1735, 3350, 20, 3333, 3393, -1658, -13, -41, 20, 3244, 1608, 1584, 1713, -41, 0, -34, 3172, 1719, 1635, 1683, 1810, 1594, 1589, 3333, 1770, 1652, 1781, 3303, 1773, 3287, 1720, -12, -73, 1616, 3219, 3446, 3265, 1705, 1720, 1597, 3500, 3363, 1508, 12, 1642, 3248, 1681, 3355, -101, 36, 1800, 3388, 1807, 1556, 15, 3480, 1609, 1689, 1610, 1757, 3475, 1780, 43, 162, 1708, -95, 1752, -81, 19, 3289, -1602, 1610, 1565, 3399, 3431, 3260, 1717, 109, 1585, 1588, 3312, 1628, -1671, 1724, 1604, 1746, 3254, 106, 1630, 3359, 1785, 3223, 1692, -1661, 3293, 1725, 1640, 3415, 1674, 1605, -97, 1646, 3167, 1536, 1632, 1579, 207, 1695, 3302, 1559, 1701, 1640, 3188, 1873, 1616, -87, 31, 1641, 3382, 1675, 3294, 3369, -47, 3274, 1709, 1742, 3346, 3287, 3289, 1745, 3427, 1789, 3319, 133, 1663, 1611, -54, -1611, 25, 1644, 3301, -2, 1583, 1586, 85, 1658, 1630, 52, 3387, 1705, 1708, 1641, 1641, 1776, 1787, -1661, 1634, 120, 3404, 1715, 3152, 1645, 1667, 3, 1652, 1695, -1622, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
 poly_red_out2 = [3320, 1509, 3277, 1673, 10, 3214, 3300, 134, 1727, 3233, 1652, 3259, 1705, 82, 1655, 3325, 39, 3304, 1616, 3278, 0, 1593, 79, 1603, 1778, 1669, 49, 3211, 63, 8, 1515, 3286, 1701, 3307, 1656, 1839, 1662, 1632, 3317, 3315, 3280, 1742, 107, 1593, 1609, 1689, 52, 1697, 3289, 80, 1614, 1709, 66, 1678, 25, 1673, 1757, 1646, 156, 1700, 1788, 1617, 3245, 3266, 1561, 3298, 3309, 3222, 101, 1686, 1633, 3259, 1744, 3132, 1536, 1691, 3202, 1495, 1605, 3290, 3284, 3321, 1697, 1724, 3328, 1727, 1581, 81, 1653, 1735, 21, 20, 4, 64, 1671, 3316, 3288, 20, 3244, 1608, 1584, 1713, 3288, 0, 3295, 3172, 1719, 1635, 1683, 1810, 1594, 1589, 4, 1770, 1652, 1781, 3303, 1773, 3287, 1720, 3317, 3256, 1616, 3219, 117, 3265, 1705, 1720, 1597, 171, 34, 1508, 12, 1642, 3248, 1681, 26, 3228, 36, 1800, 59, 1807, 1556, 15, 151, 1609, 1689, 1610, 1757, 146, 1780, 43, 162, 1708, 3234, 1752, 3248, 19, 3289, 1727, 1610, 1565, 70, 102, 3260, 1717, 109, 1585, 1588, 3312, 1628, 1658, 1724, 1604, 1746, 3254, 106, 1630, 30, 1785, 3223, 1692, 1668, 3293, 1725, 1640, 86, 1674, 1605, 3232, 1646, 3167, 1536, 1632, 1579, 207, 1695, 3302, 1559, 1701, 1640, 3188, 1873, 1616, 3242, 31, 1641, 53, 1675, 3294, 40, 3282, 3274, 1709, 1742, 17, 3287, 3289, 1745, 98, 1789, 3319, 133, 1663, 1611, 3275, 1718, 25, 1644, 3301, 3327, 1583, 1586, 85, 1658, 1630, 52, 58, 1705, 1708, 1641, 1641, 1776, 1787, 1668, 1634, 120, 75, 1715, 3152, 1645, 1667, 3, 1652, 1695, 1707, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
 
-assert(poly_barret_reduce(poly_red_in1) == poly_red_out1)
-assert(poly_barret_reduce(poly_red_in2) == poly_red_out2)
+assert(poly_barret_reduce(poly_red_in1[:256]) == poly_red_out1[:256])
+assert(poly_barret_reduce(poly_red_in2[:256]) == poly_red_out2[:256])
 
 comp_in1 = [
     [2435, 404, 273, 2969, 2687, 2766, 331, 2493, 2090, 1078, 777, 30, 658, 2848, 3284, 773, 1113, 2707, 509, 140, 68, 1411, 2366, 812, 1521, 1358, 1989, 1989, 3238, 2842, 255, 693, 2532, 1195, 3247, 496, 2986, 2490, 1974, 677, 1877, 2739, 963, 24, 784, 1018, 535, 742, 364, 1183, 3242, 776, 37, 2273, 2557, 3240, 1565, 641, 3001, 3169, 2135, 1250, 1405, 367, 3154, 936, 1460, 2599, 2980, 183, 2120, 3261, 2159, 817, 546, 1336, 963, 54, 2102, 2133, 2340, 750, 1585, 1111, 1899, 3198, 610, 1600, 795, 2585, 535, 1692, 2179, 1564, 1056, 1580, 1890, 2703, 1798, 1119, 1922, 2438, 96, 2336, 1402, 2747, 2965, 1109, 1926, 1359, 1254, 2193, 765, 2356, 596, 345, 144, 2691, 529, 347, 2221, 2663, 2723, 1963, 2887, 879, 1943, 2421, 1701, 2167, 594, 2196, 940, 229, 1889, 2264, 2445, 542, 175, 1696, 1355, 1034, 212, 768, 1584, 2921, 1112, 579, 3108, 893, 2480, 3087, 62, 78, 341, 224, 1235, 3122, 1199, 854, 773, 2529, 176, 1555, 70, 117, 2443, 2360, 42, 1585, 977, 1728, 1356, 515, 1128, 2576, 841, 2378, 2958, 199, 1916, 1265, 1635, 1488, 2385, 2720, 2390, 2244, 2038, 2235, 1453, 3110, 2943, 1924, 3279, 886, 1472, 1994, 1481, 2077, 2735, 3003, 1084, 1041, 1437, 2518, 2600, 1871, 1529, 1391, 199, 3155, 2977, 2059, 484, 1101, 556, 1646, 1384, 1192, 52, 2773, 2388, 433, 2658, 3038, 2678, 2747, 2046, 2788, 1712, 2867, 577, 2493, 1118, 1692, 1512, 2699, 2600, 1530, 2188, 2290, 345, 2245, 1175, 126, 309, 1766, 44, 274, 2998, 1790, 2405, 1018, 1410, 1250, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
@@ -116,3 +117,15 @@ comp_in2 = [
 ]
 comp_in_k2 = 2
 comp_out2 = [90, -92, -51, -93, -106, -105, 58, -124, -33, 96, 8, -97, -21, -62, 82, -55, 81, -77, 55, -67, -92, 81, -108, 28, -8, 47, 66, 76, -128, -40, -15, -36, -58, -66, 57, 72, -78, 111, -68, -24, 31, -122, -38, 2, -111, 47, 123, -7, 8, -118, 54, 44, -25, 0, 70, -110, 115, 40, -100, 15, -28, 93, 22, 33, 75, 72, -62, -46, 106, -81, 3, -10, -28, -104, -48, 47, 80, 19, -110, 5, 78, 65, -4, -19, -25, 97, 41, -73, 23, 29, -75, -128, -54, -13, 44, 40, -114, 52, 23, -90, 35, -2, -77, -58, -101, -60, 44, -41, -120, 8, 44, -115, 97, -16, 5, 15, -48, 91, -70, 96, 87, 99, -93, -103, -122, 115, -25, 11, 40, -102, -89, 40, -44, 21, -106, 96, 77, -76, 18, 18, -122, 58, 97, -67, -46, -48, 19, -119, -4, -94, -45, 77, -104, -24, 13, 27, 107, -71, 15, 47, 120, -111, -40, 34, 100, 90, -58, -54, 48, 114, -25, 29, 120, 106, 97, 47, 52, 54, -81, -114, 111, 76, -53, -21, -54, -22, 50, -114, -27, -43, -4, -116, -76, -67, 90, 23, -6, 0, 10, 117, -76, -55, -45, 27, -63, 20, -97, 85, 53, -108, 26, -104, -78, 54, 2, 54, -36, -101, -124, 62, -61, 122, -18, 100, 105, 52, 30, -23, -50, 104, 65, 110, -105, 85, 67, 4, 123, -53, -95, 38, 72, -101, 98, -95, 81, 101, 3, -118, 125, 73, 25, -3, 11, -43, -113, 119, 65, 90, 23, 12, 13, 68, -92, 121, 54, -98, 19, 80, 47, 124, -31, -22, 19, 29, 36, 9, -14, 95, -126, 64, 82, -126, -106, 59, 81, -70, 75, -99, -35, 11, 24, -78, 89, -49, -6, -67, 90, 35, -62, 106, -58, -123, 77, -64, 12, 97, -119, 1, -7, 126, -66, 114, -46, 82, 45, 38, 107, 79, -34, -43, -43, -68, -84, -115, -52, -106, -85, 21, -22, -77, 125, 116, -110, -108, 63, -9, -62, 70, -49, 37, -58, -40, -73, -8, -116, 42, -51, -111, 94, 126, 66, 72, 118, -15, -110, -13, -125, 20, 70, 94, 75, 52, 77, -100, -2, -84, -92, 105, 91, 108, 52, -108, -121, -95, 34, 111, -52, -79, 89, 111, -125, -20, -84, -53, -60, 117, 20, 30, -78, -45, 27, -108, 106, -108, 3, 78, -42, -37, -34, -5, -25, -33, -124, -91, 73, -100, -115, 20, -126, 48, 97, -96, -109, 90, 125, -90, -3, 76, -45, 4, 55, -35, 108, 117, 39, -103, -78, 126, 89, 47, 19, -94, -46, -38, 20, -26, 70, 122, 81, -86, -10, 74, -23, -110, -113, -13, -118, -48, -53, -70, 48, 36, -93, -90, -5, -45, 70, -92, 9, 54, -24, 79, 90, -121, 52, 46, -109, 24, 1, 74, -26, 63, 96, -46, -61, 70, -65, -62, 57, 21, 53, 61, 42, -123, 93, 57, -15, -8, 67, -105, 116, 17, 36, -96, 36, 32, 79, 88, 54, -99, -3, -62, 101, 54, 37, 18, 69, -8, -54, -66, -71, 82, 127, -9, -76, -32, 50, 61, 114, 1, 47, -33, -45, -78, 28, -3, 77, -122, 81, -104, -29, -12, -84, -71, -125, 32, 4, -59, 5, 106, -16, -120, 86, -74, 39, -49, -84, 3, 103, -19, -120, 119, -42, -2, 54, -50, 7, 108, -16, -59, 1, 126, 103, -104, -116, -76, -122, -120, 78, 19, -32, -85, -38, 102, -95, 75, 100, 108, 95, 88, -52, -128, 35, 111, 86, 5, -95, 103, 84, -117, 69, -50, -35, -51, -22, 50, -73, 63, 53, -59, -43, -122, 117, 35, 32, 19, -37, -84, 33, 55, 95, 93, 100, 20, -97, 17, 85, 110, 117, -27, -64, -111, 118, -14, 40, 114, -113, -88, 66, 6, -100, 79, -86, -27, -128, 6, -69, -22, -33, 7]
+
+
+poly_in = Poly(poly_red_out1[:256])
+assert(poly_in.coeffs.dtype == np.int16 and poly_in.coeffs.nbytes == 512)
+assert(poly_in == poly_red_out1[:256])
+assert(poly_add(poly_in, poly_in) == [2 * x for x in poly_red_out1[:256]])
+for bad_len in (0, 255, 257, 384):
+    try:
+        Poly([0] * bad_len)
+        assert(False)
+    except ValueError:
+        pass
@@ -33,8 +33,8 @@ poly_decomp_out2 = [
 ]
 poly_decomp_in_k2 = 2
 
-assert(polyvec_decompress(poly_decomp_in1, poly_decomp_in_k1) == poly_decomp_out1)
-assert(polyvec_decompress(poly_decomp_in2, poly_decomp_in_k2) == poly_decomp_out2)
+assert(polyvec_decompress(poly_decomp_in1, poly_decomp_in_k1) == [p[:256] for p in poly_decomp_out1])
+assert(polyvec_decompress(poly_decomp_in2, poly_decomp_in_k2) == [p[:256] for p in poly_decomp_out2])
 
 polyvec_from_bytes_in1 = [108, -119, 43, 2, -105, -87, -57, 100, 20, -109, -8, 125, -81, 53, 51, -18, -42, 31, 7, -12, 101, 32, 102, 51, 126, -41, 64, 70, -36, -57, 27, -96, 63, 48, -106, 1, 3, 22, 31, 125, -21, 83, -89, 27, 17, 97, 114, 99, -2, 42, -128, -105, 105, -50, 109, 112, -88, 95, -26, 0, -20, -30, -99, 127, 54, -95, 109, 51, 27, -117, 42, -98, 29, -72, -64, -112, 116, 45, -16, 115, -97, -16, 96, -50, -76, -20, -59, -85, 28, 94, 85, -84, -105, -69, 102, -89, -8, -107, 16, 93, 87, 120, 43, 34, -107, 56, -29, 66, 21, 68, -93, 66, 20, 8, -37, -12, 73, 16, -109, 76, -60, 35, 119, 79, 22, 118, -1, 28, 48, 111, -105, 85, 95, 87, -76, -82, -41, -90, -70, -71, 80, -88, 22, 60, -115, 49, -115, -22, 98, 117, 27, -42, -85, -59, 6, -100, 6, -56, -113, 51, 0, 38, -95, -104, 6, -96, 59, -105, -89, 105, 107, 86, -38, 33, -126, 123, -76, -24, -36, 3, 17, 82, -76, 27, -119, 42, -98, -103, -83, -10, -31, -106, 62, -106, 87, -120, 40, 21, 79, 70, 112, 51, -124, 105, 32, -5, -76, -72, 5, 68, -25, -24, -88, 26, -23, 99, -49, 54, -116, -101, -96, 55, -88, -62, -83, 98, -29, 43, 110, 97, -55, 29, 117, -50, 0, 90, -77, 15, -128, -103, -95, -14, -99, 123, 99, 5, -76, -36, 6, -30, 86, -128, -69, 0, -103, 47, 113, 127, -26, -63, 21, -88, 8, 66, 49, -52, 121, -35, 112, 14, -90, -111, 42, -57, -6, 13, -109, 123, -74, -89, 86, 102, 34, 48, 71, 12, 24, -101, 90, -95, 101, 61, -21, -109, 125, 90, -100, 37, -94, 29, -109, -79, -112, 116, -4, 35, -99, -127, 83, 83, -105, -105, -57, -44, -85, 98, 100, -99, 118, -86, 85, 55, 54, -87, 73, 2, 44, 34, -59, 43, -82, -20, 96, 91, 50, -50, -98, 91, -109, -124, -112, 53, 88, -54, -99, 106, 58, -70, -112, 66, 62, -19, -96, 28, -108, 25, -117, 25, 42, -117, -87, 6, 52, -105, -96, -59, 1, 51, 7, -35, -40, 99, 82, 100, 113, -92, -39, -107, 35, -21, 65, 127, 41, 26, -84, 12, 58, 88, 27, 109, -96, 7, 50, -27, -24, 27, 31, 124, -121, -101, 22, -109, -63, 59, 111, -97, 121, 49, 98, 36, 41, -27, 66, -81, 64, 105, 34, 47, 4, 85, 68, -32, -52, 79, -78, 77, 68, 72, -49, 44, 101, -106, -11, -53, 8, 98, 75, 17, -123, 1, 59, 107, 2, 8, -110, -7, 107, -33, -44, -83, -87, 23, -99, -25, 39, -72, -39, 66, 110, 9, -106, -75, -45, 73, 72, -50, 2, -48, -61, 105, -77, 124, -69, 84, -45, 71, -98, -40, -75, -126, -23, -25, 40, -110, -101, 76, 113, -55, -66, 17, -44, 91, 32, -60, -67, -61, -57, 67, 19, 34, 63, 88, 39, 78, -117, -91, 36, 68, 71, -60, -107, -107, 11, -124, -53, 12, 60, 39, 54, 64, 16, -118, 51, -105, -108, 69, 115, 39, -109, 40, -103, 108, -36, 12, -111, 60, -107, -118, -42, 32, -70, -117, 94, 94, -53, -69, 126, 19, -53, -100, 112, -67, 90, -77, 14, -73, 72, -116, -105, 0, 28, 32, 73, -113, 29, 124, -64, 109, -89, 107, -11, 32, -58, 88, -52, -83, -6, 41, 86, 66, 69, 87, -85, -22, -118, -72, -110, 57, -63, 120, 51, -36, 58, 73, -77, 106, -102, -23, -92, -122, -108, 5, 64, -21, 68, 79, -105, 21, 35, 87, -32, 32, 53, -109, -99, 117, -93, -64, 37, -12, 26, 64, 8, 35, -126, -96, 115, 60, 57, -80, 98, 43, 116, 14, 64, 117, -110, -58, 46, -54, -21, 20, 50, -60, 69, -77, 112, 58, -122, -10, -104, 26, 39, -127, 87, -22, -107, -90, -23, 45, 85, -28, -71, 114, -7, 54, -62, -16, -90, 88, 40, 14, -94, -80, 122, 72, -103, 45, -8, -109, 126, 10, 42, -63, -36, -55, 116, -2, 0, -86, -31, -11, 97, -6, 37, -114, 45, 37, -100, 62, -122, 29, -50, 35, 96, 57, 18, 118, 6, -4, 28, -32, 9, 0, 58, 123, -84, -108, 33, 1, -36, -72, 34, -79, -13, -63, 43, -9, 50, 56, -11, 70, -32, 28, 54, -75, -90, -109, 97, -110, -103, 92, -58, -100, 99, 35, 116, 9, -53, 83, -62, -29, 93, 116, -119, 13, 24, -120, 83, 118, -6, 85, 3, -79, 7, -94, -93, -110]
 polyvec_from_bytes_in_k1 = 2
@@ -49,5 +49,51 @@ polyvec_from_bytes_out2 = [
     [792, 3091, 2309, 241, 916, 47, 3013, 1337, 25, 2992, 1736, 865, 2591, 1466, 51, 3240, 2362, 792, 2564, 1852, 392, 2139, 2919, 993, 863, 1950, 2574, 1577, 1134, 1756, 2971, 816, 1223, 410, 2991, 807, 1462, 2440, 1428, 1887, 2776, 3154, 2885, 1350, 1936, 2810, 1679, 270, 1606, 83, 3209, 2990, 1138, 564, 367, 564, 2833, 1558, 2676, 378, 2450, 2628, 1425, 2873, 1878, 764, 1222, 502, 258, 2069, 2606, 2442, 2903, 64, 2406, 121, 2062, 400, 2012, 306, 2548, 310, 3197, 1711, 2877, 2343, 2226, 2457, 1886, 2062, 310, 1337, 1708, 1715, 1798, 589, 156, 2541, 795, 1923, 1275, 912, 3228, 2958, 1381, 2064, 2006, 3187, 1690, 2014, 3183, 2802, 2666, 3323, 345, 1432, 2471, 711, 2483, 1820, 2513, 2516, 803, 2775, 1568, 1023, 2819, 1435, 1005, 1841, 3204, 1562, 1447, 1297, 2115, 3243, 585, 1555, 2350, 348, 2788, 844, 2922, 3305, 1629, 77, 1559, 2860, 2984, 457, 1476, 1603, 1855, 1464, 2780, 2021, 1115, 2067, 463, 2537, 416, 1833, 3326, 1131, 3284, 1023, 2992, 2396, 145, 1255, 3042, 2925, 1048, 2852, 499, 1187, 2822, 1739, 1133, 3, 2142, 1476, 2022, 3030, 199, 2445, 2392, 646, 2514, 317, 64, 79, 2585, 1038, 275, 2597, 64, 2826, 1345, 2224, 239, 3115, 765, 1603, 2651, 727, 1528, 3263, 2045, 824, 2343, 1932, 983, 1307, 162, 2184, 2115, 888, 3074, 1316, 697, 2396, 461, 871, 2886, 1503, 3180, 3312, 180, 1847, 586, 2860, 444, 568, 450, 988, 1014, 2281, 1426, 1444, 1670, 914, 2302, 2667, 1355, 360, 574, 1795, 894, 1968, 2104, 2765, 569, 2882, 1873, 3000, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
 ]
 
-assert(polyvec_from_bytes(polyvec_from_bytes_in1, polyvec_from_bytes_in_k1)==polyvec_from_bytes_out1)
-assert(polyvec_from_bytes(polyvec_from_bytes_in2, polyvec_from_bytes_in_k2)==polyvec_from_bytes_out2)
+assert(polyvec_from_bytes(polyvec_from_bytes_in1, polyvec_from_bytes_in_k1)==[p[:256] for p in polyvec_from_bytes_out1])
+assert(polyvec_from_bytes(polyvec_from_bytes_in2, polyvec_from_bytes_in_k2)==[p[:256] for p in polyvec_from_bytes_out2])
+
+
+import numpy as np
+from kuantum.kyber.utils.poly import Poly, poly_base_mul, poly_add, poly_barret_reduce
+
+polyvec_in = polyvec_from_bytes(polyvec_from_bytes_in1, polyvec_from_bytes_in_k1)
+assert(isinstance(polyvec_in, PolyVec) and polyvec_in.coeffs.shape == (2, 256))
+assert(np.asarray(polyvec_in) is polyvec_in.coeffs)
+assert(polyvec_in[1:].coeffs.base is polyvec_in.coeffs)
+polyvec_in[1][0] = 7
+assert(polyvec_in.coeffs[1, 0] == 7)
+
+polymatrix_in = PolyMatrix([[polyvec_from_bytes_out1[0][:256], polyvec_from_bytes_out2[1][:256]],
+                            [polyvec_from_bytes_out2[0][:256], polyvec_from_bytes_out1[1][:256]]])
+assert(polymatrix_in.coeffs.shape == (2, 2, 256) and polymatrix_in.coeffs.flags['C_CONTIGUOUS'])
+assert(isinstance(polymatrix_in[0], PolyVec) and isinstance(polymatrix_in[0, 1], Poly))
+assert(polymatrix_in[0, 1] == polyvec_from_bytes_out2[1][:256])
+
+matvec_expected = []
+for row in polymatrix_in:
+    acc = poly_add(poly_base_mul(row[0], polyvec_in[0]), poly_base_mul(row[1], polyvec_in[1]))
+    matvec_expected.append(poly_barret_reduce(acc).tolist())
+    assert(polyvec_pointwise_mul(row, polyvec_in, 2) == matvec_expected[-1])
+assert(polymatrix_pointwise_mul(polymatrix_in, polyvec_in, 2) == matvec_expected)
+
+try:
+    PolyVec([[0] * 384, [0] * 384])
+    assert(False)
+except ValueError:
+    pass
+
+# batched noise sampling matches get_noise_poly nonce by nonce
+from kuantum.kyber.utils.poly import get_noise_poly
+from kuantum.kyber.utils.poly_vect import sample_noise_vector
+
+noise_seed = [(7 * i) - 100 for i in range(32)]
+for k, eta in ((2, 3), (3, 2)):
+    nonces = [0, 1, 2, 5, 9]
+    noise = sample_noise_vector(noise_seed, nonces, eta)
+    assert(isinstance(noise, PolyVec) and noise.coeffs.shape == (5, 256))
+    assert(noise == [get_noise_poly(noise_seed, n, k) for n in nonces])
+    assert(sample_noise_vector(bytes(x & 0xff for x in noise_seed), nonces, eta) == noise)
+    block = np.zeros((2, 5, 256), dtype=np.int16)
+    filled = sample_noise_vector(noise_seed, nonces, eta, out=block[1])
+    assert(np.shares_memory(filled.coeffs, block))
+    assert(block[1].tolist() == noise.tolist() and not block[0].any())
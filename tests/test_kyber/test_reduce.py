@@ -34,3 +34,28 @@ for a, t in pairs:
         print("OK ✅")
     except AssertionError:
         print(f"Failed for {a} -> {res} != {t}")
+
+# array versions must agree with the scalar ones over the whole int32 domain:
+# both ends of the range, everything around zero and a stride across the rest
+import numpy as np
+from kuantum.kyber.utils.reduce import barrett_reduce_array, montgomery_reduce_array
+from kuantum.kyber.utils.num_type import byte, int16, int32, long64
+from kuantum.kyber.utils.num_type import byte_array, int16_array, int32_array, long64_array
+
+int32_domain = np.concatenate([
+    np.arange(-2 ** 31, -2 ** 31 + 4096),
+    np.arange(-2 ** 17, 2 ** 17),
+    np.arange(-2 ** 31, 2 ** 31, 65521),
+    np.arange(2 ** 31 - 4096, 2 ** 31),
+])
+int32_domain_list = int32_domain.tolist()
+
+assert(montgomery_reduce_array(int32_domain).tolist() == [montgomery_reduce(a) for a in int32_domain_list])
+assert(barrett_reduce_array(int32_domain).tolist() == [barrett_reduce(a) for a in int32_domain_list])
+assert(montgomery_reduce_array(int32_domain).dtype == np.int32)
+assert(barrett_reduce_array(int32_domain).dtype == np.int16)
+
+assert(byte_array(int32_domain).tolist() == [byte(a) for a in int32_domain_list])
+assert(int16_array(int32_domain).tolist() == [int16(a) for a in int32_domain_list])
+assert(int32_array(int32_domain * 3).tolist() == [int32(a * 3) for a in int32_domain_list])
+assert(long64_array(int32_domain).tolist() == [long64(a) for a in int32_domain_list])
@@ -0,0 +1,76 @@
+from kuantum.kyber.utils.sampling import rej_uniform_array, sample_uniform
+from kuantum.kyber.utils.constants import XOF_BLOCK_BYTES, GEN_MATRIX_NBLOCKS
+from Crypto.Hash import SHAKE128
+from tests.test_kyber.xof_fixtures import FakeXof
+
+# 0xff bytes decode to 4095 and are always rejected
+assert(len(rej_uniform_array(b'\xff' * 504, 256)) == 0)
+assert(rej_uniform_array([1, 0x20, 3], 256).tolist() == [1, 0x032])
+assert(rej_uniform_array(bytes([1, 0x20, 3]), 1).tolist() == [1])
+assert(rej_uniform_array(bytes([1, 0x20, 3, 7]), 256).tolist() == [1, 0x032])
+# signed and unsigned byte lists decode the same
+assert(rej_uniform_array([-1, -1, 5, 10, 20, 30], 256).tolist() == rej_uniform_array([255, 255, 5, 10, 20, 30], 256).tolist())
+
+# fresh blocks are squeezed when the first ones are all rejected, and the
+# coefficients come from the new bytes in order
+first = b'\xff' * (GEN_MATRIX_NBLOCKS * XOF_BLOCK_BYTES + XOF_BLOCK_BYTES)
+tail = bytes(range(XOF_BLOCK_BYTES)) * 8
+xof = FakeXof(first + tail)
+r = sample_uniform(xof)
+assert(xof.reads[0] == GEN_MATRIX_NBLOCKS * XOF_BLOCK_BYTES)
+assert(all(length == XOF_BLOCK_BYTES for length in xof.reads[1:]))
+assert(r.tolist() == rej_uniform_array(tail, 256).tolist())
+
+# streaming from SHAKE-128 equals sampling one long squeeze
+seed = bytes(range(34))
+expected = rej_uniform_array(SHAKE128.new(seed).read(10 * XOF_BLOCK_BYTES), 256)
+assert(sample_uniform(SHAKE128.new(seed)).tolist() == expected.tolist())
+
+# the vectorized CBD sampler matches the scalar gen_cbd_pol for both etas,
+# row by row when given a stack of PRF outputs
+from kuantum.kyber.utils.sampling import cbd_array
+from kuantum.kyber.utils.byte_ops import gen_cbd_pol
+from kuantum.kyber.utils.num_type import byte
+import numpy as np
+
+prf = SHAKE128.new(b'cbd').read(8 * 192)
+for k, eta in ((2, 3), (3, 2)):
+    nbytes = 64 * eta
+    rows = [[byte(x) for x in prf[r * 192:r * 192 + nbytes]] for r in range(8)]
+    expected = [gen_cbd_pol(row, k) for row in rows]
+    assert(cbd_array(rows[0], eta).tolist() == expected[0])
+    assert(cbd_array(bytes(x & 0xff for x in rows[1]), eta).tolist() == expected[1])
+    stack = cbd_array(np.array(rows).astype(np.int8).view(np.uint8), eta)
+    assert(stack.shape == (8, 256) and stack.dtype == np.int16)
+    assert(stack.tolist() == expected)
+    assert(cbd_array([bytes(x & 0xff for x in row) for row in rows], eta).tolist() == expected)
+    assert(cbd_array(rows, eta).tolist() == expected)
+
+for bad in ((bytes(127), 2), (bytes(256), 4)):
+    try:
+        cbd_array(*bad)
+        assert(False)
+    except ValueError:
+        pass
+
+# batched uniform sampling equals one sample_uniform call per XOF, also for
+# a stream whose first blocks are all rejected
+from kuantum.kyber.utils.sampling import sample_uniform_batch
+
+xofs = [SHAKE128.new(bytes([i]) * 34) for i in range(5)] + [FakeXof(first + tail)]
+expected = [sample_uniform(SHAKE128.new(bytes([i]) * 34)).tolist() for i in range(5)] + \
+           [rej_uniform_array(tail, 256).tolist()]
+assert(sample_uniform_batch(xofs).tolist() == expected)
+
+# the CBD lookup tables follow the centered binomial distribution, and
+# every chunk value decodes to its table entry at every bit offset
+from kuantum.kyber.utils.sampling import CBD_TABLES
+from math import comb
+
+for eta in (2, 3):
+    table = CBD_TABLES[eta]
+    assert(np.bincount(table + eta).tolist() == [comb(2 * eta, i) for i in range(2 * eta + 1)])
+    chunks = [i % (1 << (2 * eta)) for i in range(256)]
+    packed = sum(c << (2 * eta * i) for i, c in enumerate(chunks)).to_bytes(64 * eta, 'little')
+    assert(cbd_array(packed, eta).tolist() == table[chunks].tolist())
+    assert(cbd_array(b'\xff' * 64 * eta, eta).tolist() == [0] * 256)
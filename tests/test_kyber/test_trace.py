@@ -0,0 +1,56 @@
+from kuantum.kyber.Kyber import Kyber
+from kuantum.kyber.utils.trace import Tracer, stage, operation, count, current
+from kuantum.kyber.utils.sampling import sample_uniform
+from kuantum.kyber.utils.constants import XOF_BLOCK_BYTES, GEN_MATRIX_NBLOCKS
+from tests.test_kyber.xof_fixtures import FakeXof
+import json
+
+kyber = Kyber('kyber512')
+keys = kyber.gen_keypair()
+enc = kyber.encrypt(keys['public_key'])
+
+# nothing is recorded outside a Tracer, and the no-op paths do nothing
+assert(current.get() is None)
+with stage('ntt'):
+    count('xof_bytes', 10)
+
+hooked = []
+with Tracer(hook=hooked.append) as tracer:
+    kyber.gen_keypair()
+    kyber.encrypt(keys['public_key'])
+    kyber.decrypt(enc['ciphertext'], keys['secret_key'])
+assert(current.get() is None)
+
+# one plain record per top-level operation, nested IDCPA calls as stages
+assert([r['operation'] for r in tracer.operations] == ['gen_keypair', 'encrypt', 'decrypt'])
+assert(hooked == tracer.operations)
+assert(json.loads(json.dumps(tracer.operations)) == tracer.operations)
+gen, encrypt, decrypt = tracer.operations
+assert(all(r['level'] == 'kyber512' and r['error'] is None and r['time'] > 0 for r in tracer.operations))
+assert({'idcpa_gen_keypair', 'gen_matrix', 'sample_noise', 'ntt', 'pointwise_mul', 'encode', 'hash'} <= set(gen['stages']))
+assert({'idcpa_enc', 'idcpa_enc_unpacked', 'gen_matrix', 'inv_ntt', 'compress', 'kdf'} <= set(encrypt['stages']))
+assert({'idcpa_dec', 'decompress', 'idcpa_enc', 'compare', 'kdf'} <= set(decrypt['stages']))
+assert(decrypt['stages']['ntt']['calls'] == 2 and decrypt['stages']['idcpa_dec']['calls'] == 1)
+assert(decrypt['stages']['idcpa_enc']['time'] <= decrypt['time'])
+
+# matrix A of kyber512 is 4 streams of at least 3 blocks; encryption noise
+# is 2 PRF outputs for eta1 = 3 and 3 for eta2 = 2
+assert(gen['counters']['xof_bytes'] >= 4 * GEN_MATRIX_NBLOCKS * XOF_BLOCK_BYTES)
+assert(encrypt['counters']['prf_bytes'] == 2 * 192 + 3 * 128)
+
+# a stream whose first blocks are all rejected counts its extra blocks
+# as retries
+with Tracer() as tracer:
+    with operation('sample', 'kyber512'):
+        sample_uniform(FakeXof(b'\xff' * (GEN_MATRIX_NBLOCKS + 1) * XOF_BLOCK_BYTES + bytes(range(168)) * 8))
+counters = tracer.operations[0]['counters']
+assert(counters['rejection_retries'] >= 2)
+assert(counters['xof_bytes'] == (GEN_MATRIX_NBLOCKS + counters['rejection_retries']) * XOF_BLOCK_BYTES)
+
+# failed operations are recorded with their error
+with Tracer() as tracer:
+    try:
+        Kyber('kyber512', bytes_mode=True).encrypt(bytes(800), bytes(31))
+    except ValueError:
+        pass
+assert(tracer.operations[0]['error'] == 'ValueError')
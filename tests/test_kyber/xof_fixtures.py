@@ -0,0 +1,15 @@
+class FakeXof:
+    """
+    XOF stand-in returning a fixed byte stream and recording reads
+    """
+
+    def __init__(self, stream):
+        self.stream = bytes(stream)
+        self.pos = 0
+        self.reads = []
+
+    def read(self, length):
+        self.reads.append(length)
+        out = self.stream[self.pos:self.pos + length]
+        self.pos += length
+        return out